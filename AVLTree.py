@@ -0,0 +1,135 @@
+# !Python 3.10
+# -------------
+# This is an implementation of a self-balancing (AVL) binary search tree in Python with the following functionality:
+# - Insert
+# - Find
+# - Delete
+# - Traverse (In/Pre/Postorder)
+# It has the same interface as the binary search tree, but keeps the height at O(log n) for any insertion order
+# Note: Tree does not handle duplicate values
+# ------------------------------- AVL tree implementation ------------------------------------ #
+from BinarySearchTree import BinaryNode, BinarySearchTree
+
+
+class AVLNode(BinaryNode):
+    # On top of the value and the two pointers every node remembers the height of its subtree
+    # A leaf has height 1, an empty subtree has height 0
+    __slots__ = ('height',)
+
+    def __init__(self, value):
+        super().__init__(value)
+        self.height = 1
+
+
+class AVLTree(BinarySearchTree):
+    # The AVL tree makes sure that for every node the heights of its left and right subtree differ by at most one.
+    # Whenever an insert or delete breaks that rule we repair it with one or two rotations on the way back up,
+    # so sorted input (increasing ids, timestamps) no longer turns the tree into a linked list.
+    # Insert and delete are inherited from the binary search tree, which hands us the path it walked down in _retrace
+    _node_class = AVLNode
+
+    @staticmethod
+    def _height(node):
+        return node.height if node is not None else 0
+
+    def height(self):
+        return self._height(self.root)
+
+    def _update(self, node):
+        # We recompute the height and size of a node from the heights and sizes of its children
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        node.size = 1 + self._size(node.left) + self._size(node.right)
+
+# ------------------- Rotations ------------------- #
+    # A right rotation lifts the left child above the node:
+    #       node            pivot
+    #      /     \         /     \
+    #   pivot     c  ->   a      node
+    #   /   \                   /    \
+    #  a     b                 b      c
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        # The node is now below the pivot, so we update it first
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    # The left rotation is the mirror image of the right rotation
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        # We update the height and size of the node and check its balance, returning the new root of this subtree.
+        # This runs for every node on the path of every write, so the children are read inline
+        left = node.left
+        right = node.right
+        left_height = left.height if left is not None else 0
+        right_height = right.height if right is not None else 0
+        node.height = 1 + (left_height if left_height > right_height else right_height)
+        node.size = 1 + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+        balance = left_height - right_height
+        # The left subtree is too high
+        if balance > 1:
+            # If the extra height sits in the right subtree of the left child (left-right case)
+            # we first rotate the child left, so a single right rotation fixes the node
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        # The right subtree is too high, mirror image of the above
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _retrace(self, path):
+        # We walk back up the path we came down, from the deepest node to the root, rebalancing every node.
+        # When a rotation gives a subtree a new root, we hang it in the place of the old one.
+        # Once a node keeps both its height and its place, nothing above it needs rebalancing,
+        # and for the rest of the path we only recount the sizes
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            height = node.height
+            subtree = self._rebalance(node)
+            if subtree is node:
+                if node.height == height:
+                    break
+            elif i == 0:
+                self.root = subtree
+            elif path[i - 1].left is node:
+                path[i - 1].left = subtree
+            else:
+                path[i - 1].right = subtree
+        else:
+            return
+        for i in range(i - 1, -1, -1):
+            node = path[i]
+            left = node.left
+            right = node.right
+            node.size = 1 + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+
+
+if __name__ == '__main__':
+    # We take the same random list of integers as the binary search tree
+    keys = [20, 10, 30, 15, 35, 25, 9, 32, 7]
+    avl = AVLTree()
+    for key in keys:
+        avl.insert(key)
+    print(avl.inorder())
+    avl.delete(30)
+    print(avl.inorder())
+    print(avl.find(33), avl.find(9))
+    print(avl.preorder())
+    print(avl.postorder())
+    # Sorted input is where the AVL tree shines, the height stays logarithmic
+    ordered = AVLTree()
+    for key in range(100_000):
+        ordered.insert(key)
+    print(f'Height after 100000 sorted inserts: {ordered.height()}')
@@ -0,0 +1,122 @@
+# !Python 3.10
+# -------------
+# This is an implementation of asyncio streaming helpers for our data structures with the following functionality:
+# - Batch the items of an async (or plain) iterable
+# - Fill a structure from an async source in batches (aextend / ainsert_many)
+# - Scan a structure as an async iterator that hands control back to the event loop every so many items
+# The structures stay synchronous: these helpers only decide when to give the event loop a turn, so filling or
+# scanning a big structure never blocks the other coroutines for longer than one batch takes
+# ------------------------------- Async streaming implementation ------------------------------------ #
+import asyncio
+
+# How many items we handle between two turns of the event loop
+DEFAULT_BATCH = 1024
+
+
+async def abatched(source, size=DEFAULT_BATCH):
+    """
+    We collect the items of source into lists of up to size items. source can be an async iterable (a socket reader,
+    an async generator...) or a plain iterable, whose batches we space out with a turn of the event loop each.
+    We only pull the next item when the previous batch has been taken, so a fast producer waits for us (back-pressure)
+    and no more than one batch is ever held in memory.
+    """
+    if size < 1:
+        raise ValueError('size must be at least 1')
+    batch = []
+    if hasattr(source, '__aiter__'):
+        async for item in source:
+            batch.append(item)
+            if len(batch) == size:
+                yield batch
+                batch = []
+    else:
+        for item in source:
+            batch.append(item)
+            if len(batch) == size:
+                yield batch
+                batch = []
+                await asyncio.sleep(0)
+    if batch:
+        yield batch
+
+
+def _add_batch(structure, batch):
+    # We hand the batch to the fastest way in the structure has. A hash map's insert_many only moves a bounded number
+    # of buckets of a running resize per batch, so a batch that lands during a resize stays as short as any other
+    if hasattr(structure, 'insert_many'):
+        structure.insert_many(batch)
+    elif hasattr(structure, 'extend'):
+        structure.extend(batch)
+    else:
+        add = structure.append if hasattr(structure, 'append') else structure.insert
+        for item in batch:
+            add(item)
+
+
+async def aconsume(structure, source, batch_size=DEFAULT_BATCH):
+    """
+    We fill structure from source one batch at a time: values for a list or a tree, key-value pairs for a hash map.
+    After every batch the event loop gets a turn. We return the number of items we took from source.
+    """
+    count = 0
+    async for batch in abatched(source, batch_size):
+        _add_batch(structure, batch)
+        count += len(batch)
+        await asyncio.sleep(0)
+    return count
+
+
+async def aiterate(iterable, every=DEFAULT_BATCH):
+    """
+    An async iterator over a plain iterable: we hand out the items one by one and give the event loop a turn
+    after every `every` items. Writes from other coroutines in between land in the structure we are scanning,
+    so a scan that has to see one consistent state should not run next to writers of the same structure.
+    """
+    if every < 1:
+        raise ValueError('every must be at least 1')
+    count = 0
+    for item in iterable:
+        yield item
+        count += 1
+        if count == every:
+            count = 0
+            await asyncio.sleep(0)
+
+
+if __name__ == '__main__':
+    from BinarySearchTree import BinarySearchTree
+    from HashMap_LinkedList import HashMap
+    from LinkedList import LinkedList
+
+    async def numbers(count):
+        # An async source, like values arriving over a socket
+        for number in range(count):
+            if number % 100 == 0:
+                await asyncio.sleep(0)
+            yield number
+
+    async def heartbeat(beats):
+        # A coroutine that only gets its turns because the filling and the scanning let go of the event loop
+        for _ in range(5):
+            beats.append(asyncio.get_running_loop().time())
+            await asyncio.sleep(0)
+
+    async def main():
+        beats = []
+        linked_list = LinkedList()
+        filling = asyncio.gather(linked_list.aextend(numbers(10_000)), heartbeat(beats))
+        print(await filling, len(beats))
+
+        hash_map = HashMap()
+        print(await hash_map.ainsert_many((f'key-{number}', number) async for number in numbers(10_000)))
+        tree = BinarySearchTree()
+        await tree.ainsert_many(numbers(1_000))
+
+        total = 0
+        async for value in linked_list.aiter_values():
+            total += value
+        pairs = [pair async for pair in hash_map.aiter_items(every=256)]
+        smallest = [value async for value in tree.aiter_inorder()][:5]
+        print(total, len(pairs), smallest)
+
+    asyncio.run(main())
@@ -0,0 +1,268 @@
+# !Python 3.10
+# -------------
+# This is an implementation of a B+ tree in Python with the following functionality:
+# - Insert
+# - Find
+# - Delete
+# - Traverse (Inorder), len, in and iteration
+# - Range/Floor/Ceiling
+# It holds the same kind of ordered values as the binary search tree, but every node stores a sorted list of up to
+# order values, so a lookup follows a handful of nodes instead of one node per comparison
+# Note: Tree does not handle duplicate values
+# ------------------------------- B+ tree implementation ------------------------------------ #
+from bisect import bisect_left, bisect_right
+
+
+class BTreeLeaf:
+    # Leaves hold the actual values in a sorted list, and point to the next leaf
+    # so we can walk over all values in order without going back up the tree
+    __slots__ = ('keys', 'next')
+
+    def __init__(self):
+        self.keys = []
+        self.next = None
+
+
+class BTreeInternal:
+    # Internal nodes hold separator keys and one more child than keys:
+    # children[i] holds the values smaller than keys[i], children[i + 1] the values from keys[i] up
+    __slots__ = ('keys', 'children')
+
+    def __init__(self):
+        self.keys = []
+        self.children = []
+
+
+class BTree:
+    # The tree is always initiated with a single empty leaf, which is both our root and our first leaf.
+    # order is the most values a node can hold, every node but the root holds at least half of that
+    def __init__(self, order=64):
+        if order < 3:
+            raise ValueError('order must be at least 3')
+        self.order = order
+        self.min_keys = order // 2
+        self.root = BTreeLeaf()
+        self.head = self.root
+        self.count = 0
+
+    def _find_leaf(self, value):
+        # We go down from the root, picking the child whose range holds our value with a binary search,
+        # and remember the path as (node, child index) pairs for the functions that have to fix nodes up afterwards
+        path = []
+        node = self.root
+        while isinstance(node, BTreeInternal):
+            index = bisect_right(node.keys, value)
+            path.append((node, index))
+            node = node.children[index]
+        return node, path
+
+# ------------------- Insert ------------------- #
+    def insert(self, value):
+        leaf, path = self._find_leaf(value)
+        index = bisect_left(leaf.keys, value)
+        # The tree does not handle duplicate values, so there is nothing to do. We return whether the value is new
+        if index < len(leaf.keys) and leaf.keys[index] == value:
+            return False
+        leaf.keys.insert(index, value)
+        self.count += 1
+        if len(leaf.keys) > self.order:
+            self._split(leaf, path)
+        return True
+
+    def _split(self, node, path):
+        # A node that overflows is split in two halves and the parent gets a new separator key for the right half.
+        # That may overflow the parent in turn, so we keep going up the path
+        while len(node.keys) > self.order:
+            middle = len(node.keys) // 2
+            if isinstance(node, BTreeLeaf):
+                # A leaf keeps all its values, the first value of the right half is copied up as the separator
+                right = BTreeLeaf()
+                right.keys = node.keys[middle:]
+                del node.keys[middle:]
+                right.next = node.next
+                node.next = right
+                separator = right.keys[0]
+            else:
+                # An internal node moves its middle key up, it does not stay in either half
+                right = BTreeInternal()
+                separator = node.keys[middle]
+                right.keys = node.keys[middle + 1:]
+                right.children = node.children[middle + 1:]
+                del node.keys[middle:]
+                del node.children[middle + 1:]
+            # If we split the root, the tree grows one level with a new root above the two halves
+            if not path:
+                self.root = BTreeInternal()
+                self.root.keys = [separator]
+                self.root.children = [node, right]
+                return
+            parent, index = path.pop()
+            parent.keys.insert(index, separator)
+            parent.children.insert(index + 1, right)
+            node = parent
+
+# ------------------- Find ------------------- #
+    # The find function returns the value stored in the tree, or None if it is not in the tree
+    def find(self, value):
+        leaf = self._find_leaf(value)[0]
+        index = bisect_left(leaf.keys, value)
+        if index < len(leaf.keys) and leaf.keys[index] == value:
+            return leaf.keys[index]
+        return None
+
+    def __contains__(self, value):
+        leaf = self._find_leaf(value)[0]
+        index = bisect_left(leaf.keys, value)
+        return index < len(leaf.keys) and leaf.keys[index] == value
+
+    def __len__(self):
+        return self.count
+
+# ------------------- Delete ------------------- #
+    def delete(self, value):
+        # We return whether the value was in the tree
+        if self.count == 0:
+            return False
+        leaf, path = self._find_leaf(value)
+        index = bisect_left(leaf.keys, value)
+        # The value is not in the tree
+        if index == len(leaf.keys) or leaf.keys[index] != value:
+            return False
+        del leaf.keys[index]
+        self.count -= 1
+        self._fix_underflow(leaf, path)
+        return True
+
+    def _fix_underflow(self, node, path):
+        # A node left with fewer than min_keys values first tries to borrow one from a sibling with values to spare,
+        # otherwise it merges with a sibling. A merge takes a key out of the parent, so we keep going up the path
+        while path and len(node.keys) < self.min_keys:
+            parent, index = path.pop()
+            left = parent.children[index - 1] if index > 0 else None
+            right = parent.children[index + 1] if index + 1 < len(parent.children) else None
+            if left is not None and len(left.keys) > self.min_keys:
+                self._borrow_from_left(node, left, parent, index)
+                return
+            if right is not None and len(right.keys) > self.min_keys:
+                self._borrow_from_right(node, right, parent, index)
+                return
+            # We always merge the right node of the pair into the left one, so the first leaf never goes away
+            if left is not None:
+                self._merge(left, node, parent, index - 1)
+            else:
+                self._merge(node, right, parent, index)
+            node = parent
+        # If the root is an internal node that lost its last key, its only child becomes the root
+        if isinstance(self.root, BTreeInternal) and not self.root.keys:
+            self.root = self.root.children[0]
+
+    @staticmethod
+    def _borrow_from_left(node, left, parent, index):
+        if isinstance(node, BTreeLeaf):
+            node.keys.insert(0, left.keys.pop())
+            parent.keys[index - 1] = node.keys[0]
+        else:
+            # For internal nodes the separator comes down from the parent and the left sibling's last key goes up
+            node.keys.insert(0, parent.keys[index - 1])
+            parent.keys[index - 1] = left.keys.pop()
+            node.children.insert(0, left.children.pop())
+
+    @staticmethod
+    def _borrow_from_right(node, right, parent, index):
+        if isinstance(node, BTreeLeaf):
+            node.keys.append(right.keys.pop(0))
+            parent.keys[index] = right.keys[0]
+        else:
+            node.keys.append(parent.keys[index])
+            parent.keys[index] = right.keys.pop(0)
+            node.children.append(right.children.pop(0))
+
+    @staticmethod
+    def _merge(left, right, parent, index):
+        # We move everything from the right node into the left node and drop the separator between them (keys[index])
+        separator = parent.keys.pop(index)
+        parent.children.pop(index + 1)
+        if isinstance(left, BTreeLeaf):
+            left.keys.extend(right.keys)
+            left.next = right.next
+        else:
+            left.keys.append(separator)
+            left.keys.extend(right.keys)
+            left.children.extend(right.children)
+
+# ------------------- Traverse ------------------- #
+    # All values sit in the leaves in order, so an inorder traversal is a walk along the chain of leaves
+    def iter_inorder(self):
+        leaf = self.head
+        while leaf is not None:
+            yield from leaf.keys
+            leaf = leaf.next
+
+    def __iter__(self):
+        return self.iter_inorder()
+
+    # The inorder function returns all values in a sorted list, Representation.print_traversal prints them
+    def inorder(self):
+        return list(self.iter_inorder())
+
+    # The range function returns the sorted values between lo and hi (both included):
+    # we go down to the leaf of lo once and then follow the chain of leaves until we pass hi
+    def range(self, lo, hi):
+        values = []
+        leaf = self._find_leaf(lo)[0]
+        index = bisect_left(leaf.keys, lo)
+        while leaf is not None:
+            keys = leaf.keys
+            end = bisect_right(keys, hi)
+            values.extend(keys[index:end])
+            if end < len(keys):
+                break
+            leaf = leaf.next
+            index = 0
+        return values
+
+    # The floor function returns the biggest value smaller than or equal to value, None if there is none
+    def floor(self, value):
+        # On the way down we remember the closest subtree left of our path, all of its values are smaller than value
+        left_subtree = None
+        node = self.root
+        while isinstance(node, BTreeInternal):
+            index = bisect_right(node.keys, value)
+            if index > 0:
+                left_subtree = node.children[index - 1]
+            node = node.children[index]
+        index = bisect_right(node.keys, value)
+        if index > 0:
+            return node.keys[index - 1]
+        # Every value of our leaf is bigger, so the floor is the biggest value of that subtree
+        if left_subtree is None:
+            return None
+        while isinstance(left_subtree, BTreeInternal):
+            left_subtree = left_subtree.children[-1]
+        return left_subtree.keys[-1]
+
+    # The ceiling function returns the smallest value bigger than or equal to value, None if there is none
+    def ceiling(self, value):
+        leaf = self._find_leaf(value)[0]
+        index = bisect_left(leaf.keys, value)
+        # If all values of our leaf are smaller, the ceiling is the first value of the following leaves
+        while index == len(leaf.keys):
+            leaf = leaf.next
+            if leaf is None:
+                return None
+            index = 0
+        return leaf.keys[index]
+
+
+if __name__ == '__main__':
+    # We take the same random list of integers as the binary search tree
+    keys = [20, 10, 30, 15, 35, 25, 9, 32, 7]
+    # A tiny order so even this short list splits into a few nodes
+    btree = BTree(order=3)
+    for key in keys:
+        btree.insert(key)
+    print(btree.inorder())
+    btree.delete(30)
+    print(btree.inorder())
+    print(btree.find(33), btree.find(9), 9 in btree, len(btree))
+    print(f'Values between 10 and 30: {btree.range(10, 30)}')
@@ -6,192 +6,433 @@
 # - Insert
 # - Find
 # - Delete
-# - Traverse (In/Pre/Postorder)
+# - Traverse (In/Pre/Postorder), len, in, iteration and indexing
+# - Order statistics (Range/Select/Rank/Floor/Ceiling)
+# - Height, and probe length and shape gauges for Instrumentation.py
+# - Bulk build from sorted values and merge
+# - Async insert and inorder scan (through AsyncStreaming.py)
+# - Dump to / load from a memory-mapped snapshot file
+# - Vectorized batch queries on a frozen NumPy view (Find many/Rank many/Range count)
 # Note: Tree does not handle duplicate values
 # ------------------------------- Binary search tree implementation ------------------------------------ #
+import heapq
 
 class BinaryNode:
     # The node class is initiated with a value and two pointers, left and right
+    # Every node also counts the nodes of the subtree it is the root of (itself included)
+    # The attributes live in __slots__ instead of a per-node __dict__, which makes every node a lot smaller
+    __slots__ = ('value', 'left', 'right', 'size')
+
     def __init__(self, value):
         self.value = value
         self.left = None # Left will point to the smaller node
         self.right = None # Right will point to the larger node
+        self.size = 1
 
 class BinarySearchTree:
     # The tree is always initiated with the root being None
     def __init__(self):
         self.root = None
+        # The frozen NumPy view of the tree for batch queries, built on demand and dropped by every write
+        self._frozen = None
 
-    @staticmethod # Find a successor for our node deletion
-    def find_successor(root):
-        # If our root.right is None - we traverse the left subtrees full height for the successor
-        if root.right is None:
-            pointer = root.left
-        # If our root.left is None - we start our traversal from the right node and then
-        # we traverse the left subtrees full height
-        else:
-            pointer = root.right
-        # The while loop is where we do the traversal
-        while pointer.left is not None:
-            pointer = root.left
-        return pointer
+    # New nodes are created from this class, so a subclass can store extra information on its nodes
+    _node_class = BinaryNode
+
+    @staticmethod
+    def _size(node):
+        return node.size if node is not None else 0
+
+    def _update(self, node):
+        # We recount the size of a node from the sizes of its children
+        node.size = 1 + self._size(node.left) + self._size(node.right)
+
+    def _retrace(self, path):
+        # After an insert or delete we get the path from the root down to the parent of the changed node.
+        # Those are exactly the nodes whose subtree gained or lost a node, so we recount their sizes from the bottom up,
+        # subclasses use this to fix up more of their nodes on the way back up
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            left = node.left
+            right = node.right
+            node.size = 1 + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+
+# ------------------- Bulk build ------------------- #
+    # Inserting n values one at a time costs O(n log n) at best, and O(n^2) for sorted values.
+    # When the values are already sorted we can build a perfectly balanced tree directly in O(n):
+    # the middle value becomes the root, the left half its left subtree and the right half its right subtree
+    @classmethod
+    def from_sorted(cls, values):
+        tree = cls()
+        ordered = []
+        for value in values:
+            if ordered and not ordered[-1] <= value:
+                raise ValueError('from_sorted needs the values in ascending order')
+            # The tree does not handle duplicate values, so we keep one of every run of equal values
+            if not ordered or ordered[-1] != value:
+                ordered.append(value)
+        tree.root = tree._build(ordered, 0, len(ordered))
+        return tree
+
+    def _build(self, values, lo, hi):
+        # We build the subtree holding values[lo:hi], the recursion is only as deep as the tree is high (log n)
+        if lo >= hi:
+            return None
+        middle = (lo + hi) // 2
+        node = self._node_class(values[middle])
+        node.left = self._build(values, lo, middle)
+        node.right = self._build(values, middle + 1, hi)
+        self._update(node)
+        return node
+
+    # For values in any order we sort them first, which is still O(n log n) but runs in C instead of n inserts
+    @classmethod
+    def from_iterable(cls, values):
+        return cls.from_sorted(sorted(values))
+
+    # The merge function returns a new tree with the values of both trees:
+    # both inorder traversals are already sorted, so we merge them in a single linear pass and build from that
+    def merge(self, other):
+        return type(self).from_sorted(heapq.merge(self.iter_inorder(), other.iter_inorder()))
+
+# ------------------- Async streaming ------------------- #
+    # For values arriving from an async source and consumers streaming the values out (see AsyncStreaming.py).
+    # await tree.ainsert_many(source) inserts everything source yields, giving the event loop a turn every batch
+    def ainsert_many(self, values, batch_size=1024):
+        from AsyncStreaming import aconsume
+        return aconsume(self, values, batch_size)
+
+    # async for value in tree.aiter_inorder(): ... hands us the values in sorted order,
+    # with a turn for the event loop every `every` values
+    def aiter_inorder(self, every=1024):
+        from AsyncStreaming import aiterate
+        return aiterate(self.iter_inorder(), every)
+
+# ------------------- Snapshots ------------------- #
+    # The dump function writes our values in sorted order to a snapshot file (see Snapshot.py for the format)
+    def dump(self, path):
+        from Snapshot import dump_tree
+        dump_tree(self.iter_inorder(), path)
+
+    # The load function maps a snapshot file and answers lookups from it without building any node,
+    # the first insert or delete builds a tree of our class from it with from_sorted
+    @classmethod
+    def load(cls, path):
+        from Snapshot import MappedBinarySearchTree
+        return MappedBinarySearchTree(path, tree_class=cls)
 
 # ------------------- Insert ------------------- #
-    # We start our tree by inserting our values using the insert function
+    # We start our tree by inserting our values using the insert function, which returns whether the value is new
     def insert(self, value):
+        self._frozen = None
         # If the root for the class is None, our current value will be set as the root
         if self.root is None:
-            self.root = BinaryNode(value)
-            return self.root
+            self.root = self._node_class(value)
+            return True
         # If the root is not None, we call the inner _insert function with our root and value
         else:
-            self._insert(self.root, value)
+            return self._insert(self.root, value)
 
     def _insert(self, root, value):
-        # We compare the root with the value we wish to insert
-        if value < root.value:
-            # If our value is smaller than the root and root.left/right already points to None
-            # we simply set our value to the pointer as a Node object
-            if root.left is None:
-                root.left = BinaryNode(value)
-            # Otherwise, we recursively call upon the left node until we find None
-            else:
-                root.left = self._insert(root.left, value)
-        # Vice versa as above for the right pointer if the value is bigger
-        if value > root.value:
-            if root.right is None:
-                root.right = BinaryNode(value)
+        # We walk down from the root with a loop instead of recursion, so deep trees never hit the recursion limit,
+        # and we only write to the one node that gets a new child. We remember the path for _retrace
+        path = []
+        while root is not None:
+            path.append(root)
+            # We compare the root with the value we wish to insert
+            # and continue with the left pointer if the value is smaller, with the right pointer if it is bigger
+            if value < root.value:
+                root = root.left
+            elif value > root.value:
+                root = root.right
+            # The tree does not handle duplicate values, so there is nothing to do
             else:
-                root.right = self._insert(root.right, value)
-        return root
+                return False
+        # Once we find None, we simply set our value to the pointer of the last node as a Node object
+        parent = path[-1]
+        if value < parent.value:
+            parent.left = self._node_class(value)
+        else:
+            parent.right = self._node_class(value)
+        self._retrace(path)
+        return True
 
 # ------------------- Find ------------------- #
-    # Our find function takes our value as the parameter
+    # Our find function takes our value as the parameter and returns the value stored in the tree,
+    # or None if the value is not in the tree
     def find(self, value):
-        # If self.root is None, our tree is empty
-        if self.root is None:
-            return 'This tree is empty'
-        else:
-        # Else we pass our root and value as arguments to the inner _find function
-            self._find(self.root, value)
+        node = self._find(self.root, value)
+        return node.value if node is not None else None
 
     def _find(self, root, value):
-        # If our root returns None
-        # this means that we have traversed the height of the tree
-        # without finding our value
-        if root is None:
-            print('\n')
-            print('Value not in tree')
-            return
-        # If value is smaller than root, we recursively call upon the left pointer
-        if value < root.value:
-            self._find(root.left, value)
-        # If value is bigger than root, we recursively call upon the right pointer
-        elif value > root.value:
-            self._find(root.right, value)
-        # If value matches the root, we return a confirmation
-        elif value == root.value:
-            print('Value in tree')
-            return
+        # If value is smaller than root, we continue with the left pointer
+        # If value is bigger than root, we continue with the right pointer
+        # If our root ends up None, we have traversed the height of the tree without finding our value
+        while root is not None and value != root.value:
+            root = root.left if value < root.value else root.right
+        return root
+
+    def __contains__(self, value):
+        return self._find(self.root, value) is not None
+
+    def __len__(self):
+        return self._size(self.root)
+
+    # Iterating over the tree hands us the values in sorted order
+    def __iter__(self):
+        return self.iter_inorder()
+
+    # Indexing a tree gives the k-th smallest value (see select), negative indexes count from the biggest value
+    def __getitem__(self, k):
+        return self.select(k + len(self) if k < 0 else k)
 
 # ------------------- Delete ------------------- #
-    # Delete a node in the tree
+    # Delete a node in the tree, we return whether the value was in the tree
     def delete(self, value):
+        self._frozen = None
         # If our root is None, the tree is empty with nothing to delete
         if self.root is None:
-            return 'Tree is empty'
+            return False
         else:
         # Otherwise we call our inner _delete function passing in our root and value as parameters
-            self._delete(self.root, value)
+            return self._delete(self.root, value)
 
     def _delete(self, root, value):
-        # If root is None, we will return None, effectively changing the Node value to none (deleting it)
-        if not root:
-            return None
-        # First we compare if our value is smaller or bigger than the root
-        # and recursively traverse the tree accordingly until we get a match or our root returns None
-        if value < root.value:
-            root.left = self._delete(root.left, value)
-        elif value > root.value:
-            root.right = self._delete(root.right, value)
-        # Once our value is found we have 4 different cases that we can encounter
-        elif value == root.value:
-            # If the node has neither a left nor right child, we set it to None
-            if not root.left and not root.right:
-                return None
-            # If it has a right child, but not a left child, we set its value to the right child
-            elif not root.left and root.right:
-                return root.right
-            # If it has a left child, but not a right child, we set its value to the left child
-            elif not root.left and root.right:
-                return root.left
-            # If however, it has both a left and a right child, we want to swap it with the
-            # successor - the logic for finding the successor is defined in the find_successor function
-            elif root.left and root.right:
-                get_successor = self.find_successor(root)
-                # Once we have our successor node, we set it as our root
-                root.value = get_successor.value
-                # Then we make sure to traverse both subtrees and remove our successor's duplicate
-                # We traverse both since our successor might have been from either of the subtrees
-                root.left = self._delete(root.left, get_successor.value)
-                root.right = self._delete(root.right, get_successor.value)
-        return root
+        # We walk down to our value with a loop, remembering the path we took
+        path = []
+        while root is not None and value != root.value:
+            path.append(root)
+            root = root.left if value < root.value else root.right
+        # If root is None, the value is not in the tree and there is nothing to delete
+        if root is None:
+            return False
+        # If the node has both a left and a right child, we want to swap it with the successor:
+        # the smallest value of its right subtree, which we find by going right once and then left all the way down.
+        # We copy the successor's value into our node and remove the successor node instead,
+        # which never has a left child
+        if root.left is not None and root.right is not None:
+            path.append(root)
+            successor = root.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            root.value = successor.value
+            root = successor
+        # The node now has at most one child (or none, in which case child is None)
+        # and that child takes its place below the parent, effectively deleting the node
+        child = root.left if root.left is not None else root.right
+        if not path:
+            self.root = child
+        elif path[-1].left is root:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self._retrace(path)
+        return True
+
+# ------------------- Order statistics ------------------- #
+    # Thanks to the subtree sizes we can answer ordered questions by walking a single path down the tree,
+    # instead of traversing the whole tree
+
+    # The range function returns the sorted values between lo and hi (both included)
+    def range(self, lo, hi):
+        values = []
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            if node is not None:
+                # Only subtrees that can hold values of at least lo are worth going left into
+                stack.append(node)
+                node = node.left if lo < node.value else None
+            else:
+                node = stack.pop()
+                if node.value > hi:
+                    break
+                if node.value >= lo:
+                    values.append(node.value)
+                node = node.right
+        return values
+
+    # The select function returns the k-th smallest value, counting from 0
+    def select(self, k):
+        if not 0 <= k < self._size(self.root):
+            raise IndexError('select index out of range')
+        node = self.root
+        while True:
+            left_size = self._size(node.left)
+            # If the left subtree holds more than k values our value is in there
+            if k < left_size:
+                node = node.left
+            # If it holds exactly k values, it is this node
+            elif k == left_size:
+                return node.value
+            # Otherwise we skip the left subtree and this node, and look in the right subtree
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    # The rank function returns how many values in the tree are smaller than value
+    def rank(self, value):
+        rank = 0
+        node = self.root
+        while node is not None:
+            if value <= node.value:
+                node = node.left
+            # Whenever we go right, the left subtree and the node itself are all smaller
+            else:
+                rank += self._size(node.left) + 1
+                node = node.right
+        return rank
+
+    # The floor function returns the biggest value smaller than or equal to value, None if there is none
+    def floor(self, value):
+        floor = None
+        node = self.root
+        while node is not None:
+            if value == node.value:
+                return node.value
+            if value < node.value:
+                node = node.left
+            # The node is smaller, so it is our best candidate so far, but a bigger one might be on its right
+            else:
+                floor = node.value
+                node = node.right
+        return floor
+
+    # The ceiling function is the mirror image of floor: the smallest value bigger than or equal to value
+    def ceiling(self, value):
+        ceiling = None
+        node = self.root
+        while node is not None:
+            if value == node.value:
+                return node.value
+            if value > node.value:
+                node = node.right
+            else:
+                ceiling = node.value
+                node = node.left
+        return ceiling
+
+# ------------------- Frozen batch queries ------------------- #
+    # For big batches of integer queries we flatten the tree into a NumPy array (see BinarySearchTree_Frozen.py)
+    # and answer the whole batch with vectorized searches. The frozen view is kept until the next insert or delete,
+    # the first batch query after a write freezes the tree again
+
+    def freeze(self, layout='sorted'):
+        if self._frozen is None or self._frozen.layout != layout:
+            from BinarySearchTree_Frozen import FrozenTree
+            self._frozen = FrozenTree(self.iter_inorder(), layout)
+        return self._frozen
+
+    # The find_many function returns a boolean array telling for every query whether it is in the tree
+    def find_many(self, values, layout='sorted'):
+        return self.freeze(layout).find_many(values)
+
+    # The rank_many function returns an array with the rank of every query
+    def rank_many(self, values, layout='sorted'):
+        return self.freeze(layout).rank_many(values)
+
+    # The range_count function counts the values between lo and hi (both included), for arrays of bounds too
+    def range_count(self, lo, hi, layout='sorted'):
+        return self.freeze(layout).range_count(lo, hi)
+
+# ------------------- Height and instrumentation hooks ------------------- #
+    # The height function counts the levels of the tree, one level at a time, so it costs O(n)
+    def height(self):
+        height = 0
+        level = [self.root] if self.root is not None else []
+        while level:
+            height += 1
+            level = [child for node in level for child in (node.left, node.right) if child is not None]
+        return height
+
+    # The _probe_length function counts the nodes a find of value visits on its way down (Instrumentation.py)
+    def _probe_length(self, value):
+        depth = 0
+        node = self.root
+        while node is not None:
+            depth += 1
+            if value == node.value:
+                break
+            node = node.left if value < node.value else node.right
+        return depth
+
+    # The _gauges function describes the shape of the tree: its height against the height of a perfectly balanced
+    # tree with as many nodes. A balance close to 1 is good, a degenerate tree has a balance close to size / log2(size)
+    def _gauges(self):
+        size = self._size(self.root)
+        height = self.height()
+        optimal = size.bit_length()
+        return {
+            'size': size,
+            'height': height,
+            'optimal_height': optimal,
+            'balance': height / optimal if optimal else 1.0,
+        }
 
 # ------------------- Traverse ------------------- #
-    # We start our inorder traversal
-    def inorder(self):
-        # If root is None we return that the tree is empty
-        if self.root is None:
-            return 'Tree is empty!'
-        else:
-            print('\n')
-        # We call the inner function with our root as the argument to complete traversal
-            self._inorder(self.root)
+    # The iter_ functions are generators: instead of printing they hand us one value at a time,
+    # using an explicit stack of nodes instead of recursive calls, so we can stream any number of values in
+    # memory proportional to the height of the tree
+    def iter_inorder(self):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            # We first go down the full height of the left nodes, stacking them up
+            if node is not None:
+                stack.append(node)
+                node = node.left
+            # Then their values are yielded based on the stack principle(!)
+            # Last in - first out, and we continue with the right subtree
+            else:
+                node = stack.pop()
+                yield node.value
+                node = node.right
 
-    def _inorder(self, root):
-        # This is our recursive base case, if we reach it we return the calls we have made
-        if root is None:
-            return
-        # We first traverse the height of all the left nodes recursively
-        self._inorder(root.left)
-        # Then their values are printed based on the recursive stack principle(!)
-        # Last in - first out
-        print(f'{root.value}', end=' ')
-        # Same for the right subtree
-        self._inorder(root.right)
-
-    # Preorder follows the same logic as inorder, however we print the value before the recursive call
-    def preorder(self):
-        if self.root is None:
-            return 'Tree is empty!'
-        else:
-            print('\n')
-            self._preorder(self.root)
+    def iter_preorder(self):
+        # Preorder yields the value before visiting the subtrees,
+        # we push the right child first so the left child comes off the stack first
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            yield node.value
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
 
-    def _preorder(self, root):
-        if root is None:
-            return
-        print(f'{root.value}', end=' ')
-        self._preorder(root.left)
-        self._preorder(root.right)
+    def iter_postorder(self):
+        # Postorder yields the value after both subtrees,
+        # we remember the last yielded node to know whether we are coming back from the right subtree
+        stack = []
+        node = self.root
+        last = None
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+            else:
+                top = stack[-1]
+                if top.right is not None and top.right is not last:
+                    node = top.right
+                else:
+                    yield top.value
+                    last = stack.pop()
 
-    # With postorder we print the value after both recursive calls
-    def postorder(self):
-        if self.root is None:
-            return 'Tree is empty!'
-        else:
-            print('\n')
-            self._postorder(self.root)
+    # The inorder, preorder and postorder functions return the values of the traversal in a list,
+    # Representation.print_traversal prints them
+    def inorder(self):
+        return list(self.iter_inorder())
 
-    def _postorder(self, root):
-        if root is None:
-            return
-        self._postorder(root.left)
-        self._postorder(root.right)
-        print(f'{root.value}', end=' ')
+    def preorder(self):
+        return list(self.iter_preorder())
 
+    def postorder(self):
+        return list(self.iter_postorder())
 
 if __name__ == '__main__':
+    from Representation import print_traversal
+
     # We take a random list of integers
     keys = [20, 10, 30, 15, 35, 25, 9, 32, 7]
     # We initialize our Binary Search Tree class
@@ -200,13 +441,12 @@ if __name__ == '__main__':
     for key in keys:
         bst.insert(key)
     # We test that our values are inserted and inorder prints correctly
-    bst.inorder()
+    print_traversal(bst)
     # We test our delete function
-    bst.delete(30)
-    bst.inorder()
+    print(bst.delete(30), bst.delete(30))
+    print_traversal(bst)
     # We test our find function
-    bst.find(33)
-    bst.find(9)
+    print(bst.find(33), bst.find(9), 9 in bst, len(bst), bst[0], bst[-1])
     # We test our traversals
-    bst.preorder()
-    bst.postorder()
+    print_traversal(bst, 'preorder')
+    print_traversal(bst, 'postorder')
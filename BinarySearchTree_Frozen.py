@@ -0,0 +1,125 @@
+# !Python 3.10
+# -------------
+# This is an implementation of a frozen, read-only view of a binary search tree of integers backed by NumPy,
+# with the following functionality for whole arrays of queries at once:
+# - Find many (membership)
+# - Rank many
+# - Range count
+# The tree is flattened into one array, either in sorted order or in Eytzinger (breadth first) order,
+# so a batch of queries is answered by a few vectorized passes instead of a Python loop per query
+# ------------------------------- Frozen tree implementation ------------------------------------ #
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the frozen view needs it
+    np = None
+
+LAYOUTS = ('sorted', 'eytzinger')
+
+
+class FrozenTree:
+    """
+    We construct the frozen view from the inorder traversal of a tree, which hands us the values already sorted.
+
+    - The sorted layout keeps them in a sorted array and searches it with np.searchsorted.
+    - The Eytzinger layout stores the implicit balanced tree breadth first: the root at index 1 and the children of
+      index k at 2k and 2k + 1. All queries walk down it together, one level per vectorized step, and the first levels
+      that every query touches sit next to each other in memory. rank_of maps every position back to its sorted index.
+
+    The view is a copy, later writes to the tree do not show up in it; BinarySearchTree.freeze builds a new one after a write.
+    """
+    def __init__(self, values, layout='sorted'):
+        if np is None:
+            raise ImportError('the frozen tree view needs NumPy')
+        if layout not in LAYOUTS:
+            raise ValueError(f'layout must be one of {LAYOUTS}')
+        values = np.array(list(values))
+        if values.size and values.dtype.kind not in 'iu':
+            raise TypeError('the frozen tree view only holds integer values')
+        self.layout = layout
+        self.count = len(values)
+        if not values.size:
+            values = values.astype(np.int64)
+        self.values = values
+        if layout == 'eytzinger':
+            self._build_eytzinger()
+
+    def _build_eytzinger(self):
+        # An inorder walk over the implicit tree visits the positions in sorted order, so it tells us where every
+        # sorted value goes. We walk it with a stack instead of recursion. Index 0 is unused padding
+        count = self.count
+        order = np.zeros(count + 1, dtype=np.int64)
+        stack = []
+        position = 1
+        index = 0
+        while stack or position <= count:
+            if position <= count:
+                stack.append(position)
+                position *= 2
+            else:
+                position = stack.pop()
+                order[position] = index
+                index += 1
+                position = 2 * position + 1
+        # Position 0 stands for "past the end": no value is big enough
+        order[0] = count
+        self.rank_of = order
+        self.tree = np.zeros(count + 1, dtype=self.values.dtype)
+        self.tree[1:] = self.values[order[1:]]
+        self._depth = count.bit_length()
+
+    def __len__(self):
+        return self.count
+
+    def _search(self, queries, side):
+        # We return for every query the number of values smaller than it (side 'left'),
+        # or smaller than or equal to it (side 'right'), just like np.searchsorted
+        if self.layout == 'sorted':
+            return np.searchsorted(self.values, queries, side=side)
+        tree = self.tree
+        count = self.count
+        position = np.ones(queries.shape, dtype=np.int64)
+        for _ in range(self._depth):
+            inside = position <= count
+            current = tree[np.where(inside, position, 0)]
+            go_right = current <= queries if side == 'right' else current < queries
+            position = np.where(inside, 2 * position + go_right, position)
+        # Every walk ended below a leaf. The answer is the last node where we went left:
+        # we drop the trailing right turns (ones) and the left turn before them
+        lowest_zero = ~position & (position + 1)
+        position //= 2 * lowest_zero
+        return self.rank_of[position]
+
+    def rank_many(self, queries):
+        # The number of values smaller than every query, as an index array
+        queries = np.asarray(queries)
+        return self._search(queries, 'left')
+
+    def find_many(self, queries):
+        # A boolean array telling for every query whether it is in the tree (a boolean for a single number).
+        # We compare every query with the value at its rank, clipped into the array, so a 0-d query works too
+        queries = np.asarray(queries)
+        if self.count == 0:
+            return np.zeros(queries.shape, dtype=bool)[()]
+        ranks = self._search(queries, 'left')
+        found = ranks < self.count
+        return found & (self.values[np.minimum(ranks, self.count - 1)] == queries)
+
+    def range_count(self, lo, hi):
+        # The number of values between lo and hi (both included), lo and hi can be numbers or arrays of them
+        lo = np.asarray(lo)
+        hi = np.asarray(hi)
+        counts = self._search(hi, 'right') - self._search(lo, 'left')
+        return np.maximum(counts, 0)
+
+
+if __name__ == '__main__':
+    from BinarySearchTree import BinarySearchTree
+
+    keys = [20, 10, 30, 15, 35, 25, 9, 32, 7]
+    bst = BinarySearchTree.from_iterable(keys)
+    for layout in LAYOUTS:
+        frozen = bst.freeze(layout)
+        print(layout, frozen.find_many([9, 33, 35]), frozen.rank_many([9, 33, 35]), frozen.range_count([0, 10], [100, 30]))
+    # A write invalidates the frozen view, the next batch query freezes the tree again
+    bst.insert(33)
+    print(bst.find_many([9, 33, 35]))
@@ -0,0 +1,155 @@
+# !Python 3.10
+# -------------
+# This is an implementation of a persistent (functional) AVL tree in Python with the following functionality:
+# - Insert / Delete by path copying: a write never changes a node, it copies the O(log n) nodes on its path
+# - Snapshot: an O(1) read-only handle on the current version, sharing all its nodes with the live tree
+# - Everything else of the AVL tree: Find, Traverse, Order statistics, Frozen views, Dump
+# Readers can keep working on a snapshot while writers go on with the live tree, and the nodes only an old version
+# still uses are freed as soon as the last snapshot of that version is dropped
+# Note: Tree does not handle duplicate values
+# ------------------------------- Persistent tree implementation ------------------------------------ #
+from AVLTree import AVLNode, AVLTree
+
+
+class PersistentTree(AVLTree):
+    # Once a node is part of a version it is never written to again. An insert or delete builds new nodes for the path
+    # from the root down to the change, rebalancing them on the way back up, and links them to the untouched subtrees
+    # of the old version, so the old root still describes the old tree completely. The new root becomes our root.
+    # The walk is recursive: the tree stays balanced, so even 10 million values are less than 35 levels deep.
+    # Every write that changed the tree bumps version, a snapshot remembers the version it was taken at
+    def __init__(self):
+        super().__init__()
+        self.version = 0
+        self.read_only = False
+
+    def _node(self, value, left, right):
+        # A fresh node with the given children, its height and size computed from theirs
+        node = AVLNode(value)
+        node.left = left
+        node.right = right
+        self._update(node)
+        return node
+
+    def _balance(self, value, left, right):
+        # We build the node for value over left and right, and when their heights differ by two we build the
+        # rotated subtree instead (see the rotations of the AVL tree), out of fresh nodes only
+        left_height = self._height(left)
+        right_height = self._height(right)
+        if left_height > right_height + 1:
+            if self._height(left.left) >= self._height(left.right):
+                return self._node(left.value, left.left, self._node(value, left.right, right))
+            pivot = left.right
+            return self._node(pivot.value, self._node(left.value, left.left, pivot.left),
+                              self._node(value, pivot.right, right))
+        if right_height > left_height + 1:
+            if self._height(right.right) >= self._height(right.left):
+                return self._node(right.value, self._node(value, left, right.left), right.right)
+            pivot = right.left
+            return self._node(pivot.value, self._node(value, left, pivot.left),
+                              self._node(right.value, pivot.right, right.right))
+        return self._node(value, left, right)
+
+    def _check_writable(self):
+        if self.read_only:
+            raise TypeError('a snapshot is read-only')
+        self._frozen = None
+
+# ------------------- Insert ------------------- #
+    # The insert function returns whether the value is new, like for the binary search tree
+    def insert(self, value):
+        self._check_writable()
+        root = self._insert(self.root, value)
+        if root is self.root:
+            return False
+        self.root = root
+        self.version += 1
+        return True
+
+    def _insert(self, node, value):
+        # We return the root of the new version of this subtree, or the very same node when value was already there
+        if node is None:
+            return AVLNode(value)
+        if value < node.value:
+            left = self._insert(node.left, value)
+            if left is node.left:
+                return node
+            return self._balance(node.value, left, node.right)
+        if value > node.value:
+            right = self._insert(node.right, value)
+            if right is node.right:
+                return node
+            return self._balance(node.value, node.left, right)
+        return node
+
+# ------------------- Delete ------------------- #
+    # The delete function returns whether the value was in the tree
+    def delete(self, value):
+        self._check_writable()
+        root = self._delete(self.root, value)
+        if root is self.root:
+            return False
+        self.root = root
+        self.version += 1
+        return True
+
+    def _delete(self, node, value):
+        # We return the root of the new version of this subtree, or the very same node when value was not in it
+        if node is None:
+            return None
+        if value < node.value:
+            left = self._delete(node.left, value)
+            if left is node.left:
+                return node
+            return self._balance(node.value, left, node.right)
+        if value > node.value:
+            right = self._delete(node.right, value)
+            if right is node.right:
+                return node
+            return self._balance(node.value, node.left, right)
+        # A node with at most one child is replaced by that child, which is shared as it is
+        if node.left is None:
+            return node.right
+        if node.right is None:
+            return node.left
+        # Otherwise the successor takes the place of the node, and we remove it from a copy of the right subtree
+        right, successor = self._delete_min(node.right)
+        return self._balance(successor, node.left, right)
+
+    def _delete_min(self, node):
+        # We return the new version of this subtree without its smallest value, and that value
+        if node.left is None:
+            return node.right, node.value
+        left, minimum = self._delete_min(node.left)
+        return self._balance(node.value, left, node.right), minimum
+
+# ------------------- Snapshot ------------------- #
+    # The snapshot function returns a read-only tree sharing our current root, in O(1): no node is copied.
+    # Our later writes build new nodes and never touch the ones the snapshot can see, so it keeps showing
+    # the tree as it was, and every function that only reads works on it as usual
+    def snapshot(self):
+        snapshot = type(self)()
+        snapshot.root = self.root
+        snapshot.version = self.version
+        snapshot.read_only = True
+        # A frozen NumPy view of the same version is just as valid for the snapshot
+        snapshot._frozen = self._frozen
+        return snapshot
+
+
+if __name__ == '__main__':
+    keys = [20, 10, 30, 15, 35, 25, 9, 32, 7]
+    tree = PersistentTree()
+    for key in keys:
+        tree.insert(key)
+    # A reader takes a snapshot, then the writer goes on
+    before = tree.snapshot()
+    tree.delete(30)
+    tree.insert(33)
+    print(before.inorder(), before.version)
+    print(tree.inorder(), tree.version)
+    # Both versions share every node the writes did not touch
+    print(tree.root.left is before.root.left)
+    try:
+        before.insert(1)
+    except TypeError as error:
+        print(error)
@@ -0,0 +1,255 @@
+# !Python 3.10
+# -------------
+# This is an implementation of a bounded in-process cache built from our linked list and hash map,
+# with the following functionality:
+# - Get
+# - Put
+# - Delete
+# - LRU (least recently used) or LFU (least frequently used) eviction
+# - Capacity limits by number of entries and/or estimated bytes
+# - Optional time to live per entry
+# - Hit, miss, eviction and expiration statistics
+# ------------------------------- Cache implementation ------------------------------------ #
+import sys
+import time
+
+from HashMap_LinkedList import HashMap
+from LinkedList import LinkedList
+
+
+def estimate_size(key, value):
+    # We estimate the bytes of an entry as the shallow size of its key and value
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class CacheEntry:
+    # Every cached value is wrapped in an entry which sits as the value of a node in one of our linked lists
+    __slots__ = ('key', 'value', 'size', 'expires', 'bucket')
+
+    def __init__(self, key, value, size, expires):
+        self.key = key
+        self.value = value
+        self.size = size
+        self.expires = expires
+        # LFU only: the node of the frequency bucket the entry is in
+        self.bucket = None
+
+
+class FrequencyBucket:
+    # LFU only: all entries that have been used the same number of times, most recently used at the head
+    __slots__ = ('frequency', 'entries')
+
+    def __init__(self, frequency):
+        self.frequency = frequency
+        self.entries = LinkedList()
+
+
+class Cache:
+    """
+    The hash map takes us from a key to the linked list node holding its entry, so every operation is O(1):
+
+    - LRU keeps one linked list with the most recently used entry at the head.
+      A hit moves the node to the front, and we evict from the tail.
+    - LFU keeps a linked list of frequency buckets in ascending order of use count, each with a linked list of entries.
+      A hit moves the node into the bucket for one more use (creating it right behind the current one if needed),
+      and we evict the least recently used entry of the first bucket.
+
+    capacity limits the number of entries, max_bytes the estimated size of all entries (see sizeof), at least one is needed.
+    Entries put with a ttl (or the default ttl of the cache) expire that many seconds later;
+    expired entries are dropped when they are next looked up, or all at once with expire().
+    """
+    def __init__(self, capacity=None, max_bytes=None, policy='lru', ttl=None, sizeof=estimate_size):
+        if capacity is None and max_bytes is None:
+            raise ValueError('a cache needs a capacity, a max_bytes limit or both')
+        if policy not in ('lru', 'lfu'):
+            raise ValueError("policy must be 'lru' or 'lfu'")
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.count = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # Every key maps to the linked list node holding its entry
+        self._nodes = HashMap()
+        if policy == 'lru':
+            self._order = LinkedList()
+        else:
+            self._frequencies = LinkedList()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        # A membership test neither counts as a hit or miss nor changes the order of eviction
+        node = self._nodes.get(key)
+        return node is not None and not self._expired(node.value, time.monotonic())
+
+    @staticmethod
+    def _expired(entry, now):
+        return entry.expires is not None and entry.expires <= now
+
+    def get(self, key, default=None):
+        node = self._nodes.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        entry = node.value
+        if self._expired(entry, time.monotonic()):
+            self._remove(node)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(node)
+        return entry.value
+
+    def put(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        size = self.sizeof(key, value) if self.max_bytes is not None else 0
+        # An entry that can never fit is not cached at all, and an older value of the key is dropped too
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.delete(key)
+            return
+        node = self._nodes.get(key)
+        # A key that is already cached gets its entry updated in place and counts as a use
+        if node is not None:
+            entry = node.value
+            self.bytes += size - entry.size
+            entry.value = value
+            entry.size = size
+            entry.expires = expires
+            self._touch(node)
+        else:
+            # We make room before adding a new entry, so it can never be its own victim
+            while self.count and self._over_limit(1, size):
+                self._evict()
+            entry = CacheEntry(key, value, size, expires)
+            self._nodes.insert(key, self._add(entry))
+            self.count += 1
+            self.bytes += size
+        # An updated entry can have grown past our limits
+        while self._over_limit(0, 0):
+            self._evict()
+
+    def delete(self, key):
+        # We return whether the key was cached
+        node = self._nodes.get(key)
+        if node is None:
+            return False
+        self._remove(node)
+        return True
+
+    def expire(self):
+        # We drop every expired entry at once and return how many there were
+        now = time.monotonic()
+        if self.policy == 'lru':
+            lists = [self._order]
+        else:
+            lists = [bucket_node.value.entries for bucket_node in self._frequencies.iter_nodes()]
+        expired = [node for entries in lists for node in entries.iter_nodes() if self._expired(node.value, now)]
+        for node in expired:
+            self._remove(node)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def _over_limit(self, extra_count, extra_bytes):
+        # Whether we would be over our limits with extra_count more entries of extra_bytes more bytes
+        return ((self.capacity is not None and self.count + extra_count > self.capacity) or
+                (self.max_bytes is not None and self.bytes + extra_bytes > self.max_bytes))
+
+    def _evict(self):
+        self._remove(self._victim())
+        self.evictions += 1
+
+# ------------------- Eviction policies ------------------- #
+    # _add links a new entry in and returns its node, _touch records a use of a node,
+    # _victim picks the node to evict and _unlink takes a node out of the policy's lists
+
+    def _add(self, entry):
+        if self.policy == 'lru':
+            return self._order.prepend(entry)
+        # A new entry has been used once, so it goes to the bucket for frequency 1, which is always the first bucket
+        first = self._frequencies.head
+        if first is None or first.value.frequency != 1:
+            first = self._frequencies.prepend(FrequencyBucket(1))
+        entry.bucket = first
+        return first.value.entries.prepend(entry)
+
+    def _touch(self, node):
+        if self.policy == 'lru':
+            self._order.move_to_front(node)
+            return
+        entry = node.value
+        bucket_node = entry.bucket
+        bucket = bucket_node.value
+        # The bucket for one more use is either right behind the current one or we create it there
+        following = bucket_node.next
+        if following is None or following.value.frequency != bucket.frequency + 1:
+            following = self._frequencies.insert_after(bucket_node, FrequencyBucket(bucket.frequency + 1))
+        bucket.entries.remove_node(node)
+        following.value.entries.prepend_node(node)
+        entry.bucket = following
+        if bucket.entries.head is None:
+            self._frequencies.remove_node(bucket_node)
+
+    def _victim(self):
+        if self.policy == 'lru':
+            return self._order.tail
+        return self._frequencies.head.value.entries.tail
+
+    def _unlink(self, node):
+        if self.policy == 'lru':
+            self._order.remove_node(node)
+            return
+        bucket_node = node.value.bucket
+        bucket_node.value.entries.remove_node(node)
+        if bucket_node.value.entries.head is None:
+            self._frequencies.remove_node(bucket_node)
+
+    def _remove(self, node):
+        entry = node.value
+        self._unlink(node)
+        self._nodes.delete(entry.key)
+        self.count -= 1
+        self.bytes -= entry.size
+
+    def stats(self):
+        # A snapshot of the counters, ready to be exported as metrics
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'entries': self.count,
+            'bytes': self.bytes,
+        }
+
+
+if __name__ == '__main__':
+    # An LRU cache with room for two entries
+    lru = Cache(capacity=2)
+    lru.put('Bob', '550-889')
+    lru.put('John', '510-819')
+    # Using Bob makes John the least recently used entry, so John is evicted when Jill comes in
+    print(lru.get('Bob'))
+    lru.put('Jill', '110-119')
+    print(lru.get('John'))
+    print(lru.stats())
+    # An LFU cache keeps the entry that is used most often
+    lfu = Cache(capacity=2, policy='lfu')
+    lfu.put('Bob', '550-889')
+    lfu.put('John', '510-819')
+    lfu.get('John')
+    lfu.get('John')
+    lfu.get('Bob')
+    lfu.put('Jill', '110-119')
+    print('Bob' in lfu, 'John' in lfu, 'Jill' in lfu)
+    print(lfu.stats())
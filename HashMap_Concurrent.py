@@ -0,0 +1,195 @@
+# !Python 3.10
+# -------------
+# This is an implementation of a thread-safe hash map with lock striping in Python with the following functionality:
+# - Insert
+# - Get (also h[key], key in h, len and iteration)
+# - Delete
+# - Batch insert/find/delete
+# The keys are spread over a fixed number of stripes, each of them a hash map - linked list with its own lock,
+# so writers only wait for writers of the same stripe and readers normally take no lock at all
+# ------------------------------- Concurrent hash map implementation ------------------------------------ #
+import threading
+
+from HashMap_LinkedList import FIBONACCI_MULTIPLIER, HASH_MASK, HashMap
+
+_MISSING = object()
+
+
+class Stripe:
+    """
+    A stripe is a hash map with a lock for its writers and a version counter for its readers.
+    Writers bump the version before and after every change, so an odd version means a write is in progress
+    and a reader seeing the same even version before and after its lookup knows nothing changed in between.
+    """
+    __slots__ = ('map', 'lock', 'version')
+
+    def __init__(self, hash_map):
+        self.map = hash_map
+        self.lock = threading.Lock()
+        self.version = 0
+
+
+class ConcurrentHashMap:
+    """
+    We construct the map from a power of two number of stripes, every one of them an independent HashMap.
+    A key always belongs to the same stripe, picked from the top bits of its mixed hash, so the stripe choice does
+    not line up with the bucket choice inside the stripe (which uses the hash modulo the size of the stripe).
+
+    Writes take the lock of their stripe only. Each stripe resizes itself incrementally under that lock,
+    batches included (they move a bounded number of buckets per key), so a resize never blocks the other stripes
+    and never holds up the writers of its own stripe for a full copy of the table.
+
+    Reads are optimistic, like a seqlock: we note the version of the stripe, look the key up with HashMap.peek
+    (which never writes), and accept the result if the version is still the same and was not odd.
+    If a writer got in the way we simply look the key up again under the lock.
+    This works with the GIL as well as on free-threaded builds, where reading attributes and list items is thread-safe.
+
+    Any other HashMap option (size, load factors, hash_function...) is passed on to every stripe.
+    """
+    def __init__(self, stripes=16, **map_options):
+        if stripes < 1:
+            raise ValueError('stripes must be at least 1')
+        bits = 0
+        while 1 << bits < stripes:
+            bits += 1
+        self._shift = 64 - bits
+        self.hash_function = map_options.get('hash_function', hash)
+        self._stripes = [Stripe(HashMap(**map_options)) for _ in range(1 << bits)]
+
+    def _stripe_index(self, key):
+        if self._shift == 64:
+            return 0
+        return ((self.hash_function(key) * FIBONACCI_MULTIPLIER) & HASH_MASK) >> self._shift
+
+    def _stripe(self, key):
+        return self._stripes[self._stripe_index(key)]
+
+    @property
+    def count(self):
+        # The sum of the stripe counts, without locking this is a moment's estimate while writers are busy
+        return sum(stripe.map.count for stripe in self._stripes)
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, key, value):
+        # We return whether the key is new
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.version += 1
+            try:
+                return stripe.map.insert(key, value)
+            finally:
+                stripe.version += 1
+
+    def delete(self, key):
+        # We return whether the key was in the map
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.version += 1
+            try:
+                return stripe.map.delete(key)
+            finally:
+                stripe.version += 1
+
+    def get(self, key, default=None):
+        stripe = self._stripe(key)
+        version = stripe.version
+        if not version & 1:
+            try:
+                value = stripe.map.peek(key, _MISSING)
+            except Exception:
+                # A writer changed the map under our feet, the lookup under the lock below settles it
+                value = _MISSING
+                version = -1
+            if stripe.version == version:
+                return default if value is _MISSING else value
+        with stripe.lock:
+            return stripe.map.peek(key, default)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def items(self):
+        # We copy the pairs of one stripe at a time under its lock, so every stripe is seen in a consistent state
+        # even though writers keep going on the other stripes
+        for stripe in self._stripes:
+            with stripe.lock:
+                pairs = list(stripe.map.items())
+            yield from pairs
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+# ------------------- Batch operations ------------------- #
+    # The batch functions sort the keys by stripe first and take every stripe lock once per batch
+
+    def _group(self, keys):
+        # We return the stripes with the positions in keys of the keys that belong to them
+        groups = {}
+        for index, key in enumerate(keys):
+            groups.setdefault(self._stripe_index(key), []).append(index)
+        return [(self._stripes[stripe_index], indexes) for stripe_index, indexes in groups.items()]
+
+    def insert_many(self, pairs):
+        # We return the number of new keys
+        if hasattr(pairs, 'items'):
+            pairs = pairs.items()
+        pairs = list(pairs)
+        added = 0
+        for stripe, indexes in self._group([key for key, _ in pairs]):
+            with stripe.lock:
+                stripe.version += 1
+                try:
+                    added += stripe.map.insert_many([pairs[index] for index in indexes])
+                finally:
+                    stripe.version += 1
+        return added
+
+    def find_many(self, keys, default=None):
+        # Batched reads take the lock, the batch is big enough that one lock per stripe costs next to nothing
+        keys = list(keys)
+        results = [default] * len(keys)
+        for stripe, indexes in self._group(keys):
+            with stripe.lock:
+                values = [stripe.map.peek(keys[index], default) for index in indexes]
+            for index, value in zip(indexes, values):
+                results[index] = value
+        return results
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        results = [False] * len(keys)
+        for stripe, indexes in self._group(keys):
+            with stripe.lock:
+                stripe.version += 1
+                try:
+                    deleted = stripe.map.delete_many([keys[index] for index in indexes])
+                finally:
+                    stripe.version += 1
+            for index, was_deleted in zip(indexes, deleted):
+                results[index] = was_deleted
+        return results
+
+
+if __name__ == '__main__':
+    # Four threads insert their own keys into the same map at the same time
+    h = ConcurrentHashMap()
+
+    def worker(number):
+        for i in range(10_000):
+            h.insert(f'{number}-{i}', i)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(len(h), h.get('3-9999'), '2-5' in h, '5-5' in h)
@@ -5,16 +5,72 @@
 # - Insert
 # - Find
 # - Delete
-# - Print
+# - Batch insert/find/delete
+# - Iterate over items (also async, through AsyncStreaming.py)
+# - Async batch insert
+# - Dump to / load from a memory-mapped snapshot file
+# - Mapping protocol (h[key], key in h, len, iteration)
+# - Print (through Representation.py)
 # ------------------------------- Hash map - linked list implementation ------------------------------------ #
+def legacy_hash(key):
+    """
+    This is the original hash of this map, kept around so the benchmarks can compare against it.
+    We iterate over each character in the key and add together the index and length of our key,
+    then raise their sum to the power of the unicode key of our current character.
+    The numbers get huge very quickly (10 ** 122 for a lowercase 'z'), which makes it very slow, and it only works for strings.
+    """
+    key_hash = 0
+    for i, v in enumerate(key):
+        key_hash += (i + len(key)) ** ord(v)
+    return key_hash
+
+
+_MISSING = object()
+FNV_OFFSET_BASIS = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+HASH_MASK = 0xffffffffffffffff
+# Fibonacci hashing multiplier (2 ** 64 divided by the golden ratio). The maps built from several hash maps
+# (HashMap_Concurrent, HashMap_Sharded) mix a hash with it and pick the stripe or shard from the top bits,
+# so their choice does not line up with the bucket choice inside the map, which uses the low bits
+FIBONACCI_MULTIPLIER = 0x9e3779b97f4a7c15
+
+
+def fnv1a_hash(key):
+    """
+    64 bit FNV-1a: for every byte we xor it into the hash and multiply by the FNV prime.
+    Strings are encoded as utf-8 first, integers hash their two's complement bytes.
+
+    Unlike the built-in hash() the result does not change between Python processes (see PYTHONHASHSEED),
+    which matters whenever a hash leaves the process. It runs in Python byte by byte, so it is slower than hash().
+    """
+    if isinstance(key, str):
+        data = key.encode('utf-8')
+    elif isinstance(key, (bytes, bytearray, memoryview)):
+        data = bytes(key)
+    elif isinstance(key, int):
+        data = key.to_bytes(key.bit_length() // 8 + 1, 'little', signed=True)
+    else:
+        raise TypeError(f'fnv1a_hash does not support keys of type {type(key).__name__}')
+    key_hash = FNV_OFFSET_BASIS
+    for byte in data:
+        key_hash = ((key_hash ^ byte) * FNV_PRIME) & HASH_MASK
+    return key_hash
+
+
 class Node:
     """
     We construct the Node class with a key-value pair as well as a next parameter.
     The next parameter is by default set to None, and we can in case of a collision configure as a pointer.
+    The full hash of the key is cached on the node, so resizing and chain comparisons never have to hash the key again
+    (it stays None when the map was created with cache_hashes=False).
+    The attributes live in __slots__ instead of a per-node __dict__, which makes every entry a lot smaller.
     """
-    def __init__(self, key, value):
+    __slots__ = ('key', 'value', 'hash', 'next')
+
+    def __init__(self, key, value, key_hash=None):
         self.key = key
         self.value = value
+        self.hash = key_hash
         self.next = None
 
     def __repr__(self):
@@ -22,135 +78,555 @@ class Node:
 
 class HashMap:
     """
-    We construct our HashTable class with a predefined size and a list of buckets.
+    We construct our HashTable class with a starting size and a list of buckets.
     The list of buckets is multiplied by the size which we will then use to store our values.
+
+    The table grows and shrinks with the number of stored pairs. Once count / size goes above max_load_factor
+    we double the bucket list, once it drops below min_load_factor we shrink it to the smallest doubling of the
+    starting size that keeps the pairs under max_load_factor.
+    Like Redis we do not copy the whole table at once: the new list of buckets is kept next to the old one
+    and every following insert, find or delete moves a few old buckets over (rehash_step), so no single
+    call has to pay for the full copy.
+
+    Keys are hashed with hash_function, the built-in hash() by default, so any hashable key works.
+    Pass fnv1a_hash when the bucket layout has to be the same in every process, or any other callable returning an int.
     """
-    def __init__(self):
-        self.size = 12
+    def __init__(self, size=12, max_load_factor=0.75, min_load_factor=0.1, rehash_step=1,
+                 hash_function=hash, cache_hashes=True):
+        if size < 1:
+            raise ValueError('size must be at least 1')
+        if not 0 <= min_load_factor < max_load_factor:
+            raise ValueError('min_load_factor must be smaller than max_load_factor')
+        if rehash_step < 1:
+            raise ValueError('rehash_step must be at least 1')
+        self.size = size
         self.buckets = [None] * self.size
+        self.count = 0
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self.rehash_step = rehash_step
+        self.hash_function = hash_function
+        self.cache_hashes = cache_hashes
+        self._min_size = size
+        # While a resize is in progress the new list of buckets lives here, _rehash_index is the
+        # next old bucket that still has to be moved over
+        self._new_buckets = None
+        self._new_size = 0
+        self._rehash_index = 0
+        # The number of pairs reserve was asked to make room for while a resize was still in progress
+        self._reserved = 0
 
-    def _get_hash(self, key):
+    def options(self):
+        # The constructor arguments that make a map like this one (see Snapshot.py)
+        return {
+            'size': self._min_size,
+            'max_load_factor': self.max_load_factor,
+            'min_load_factor': self.min_load_factor,
+            'rehash_step': self.rehash_step,
+            'hash_function': self.hash_function,
+            'cache_hashes': self.cache_hashes,
+        }
+
+    @property
+    def rehashing(self):
+        return self._new_buckets is not None
+
+    def load_factor(self):
+        return self.count / (self._new_size if self.rehashing else self.size)
+
+    def _start_rehash(self, new_size):
+        """
+        We allocate the new list of buckets and start moving old buckets over from position 0.
+        Nothing is copied here, the actual work is done by _rehash_step.
         """
-        We pass our key as an argument to the _get_hash function which then iterates over each character in the key.
-        Upon each iteration we add together the index, length of our key and then multiply their sum to the
-        power of the unicode key to our current character, giving us a unique number for each character.
+        self._new_size = new_size
+        self._new_buckets = [None] * new_size
+        self._rehash_index = 0
 
-        We sum each unique number into the key_hash variable which we then modulate by our previously defined -
-        list size, so we can use that for accessing our key-value pair in the list.
+    def _rehash_step(self, steps=None):
         """
-        key_hash = 0
+        We move up to rehash_step non-empty buckets from the old list into the new one.
+        Like Redis we also stop after visiting ten times as many empty buckets, so a sparse table
+        does not turn a single call into a full scan.
 
-        for i, v in enumerate(key):
-            key_hash += (i + len(key)) ** ord(v)
-        key_hash = key_hash % self.size
+        Every node of a moved chain is placed again for the new size, using its cached hash when there is one,
+        and pushed to the front of its new bucket.
+        Once the last old bucket is moved, the new list of buckets becomes our list of buckets.
+        """
+        if steps is None:
+            steps = self.rehash_step
+        empty_visits = steps * 10
+        buckets = self.buckets
+        new_buckets = self._new_buckets
+        new_size = self._new_size
+        hash_function = self.hash_function
 
-        return key_hash
+        while steps > 0 and self._rehash_index < self.size:
+            node = buckets[self._rehash_index]
+            if node is None:
+                self._rehash_index += 1
+                empty_visits -= 1
+                if empty_visits == 0:
+                    break
+                continue
+            while node is not None:
+                next_node = node.next
+                key_hash = node.hash
+                if key_hash is None:
+                    key_hash = hash_function(node.key)
+                position = key_hash % new_size
+                node.next = new_buckets[position]
+                new_buckets[position] = node
+                node = next_node
+            buckets[self._rehash_index] = None
+            self._rehash_index += 1
+            steps -= 1
 
-    def insert(self, key, value):
+        if self._rehash_index >= self.size:
+            self.buckets = new_buckets
+            self.size = new_size
+            self._new_buckets = None
+            self._new_size = 0
+            self._rehash_index = 0
+            # The pairs added or removed while we were moving buckets may already ask for the next resize
+            self._resize_if_needed()
+
+    def _resize_if_needed(self):
         """
-        The insert function will first generate the hash for our key and store it as position since it's a valid index.
-        We store our node as the location for where we can store our key-value pair.
+        We only start a new resize once the previous one has finished, and check again when it does (see _rehash_step).
+        Growing doubles the list of buckets. Shrinking goes straight to the smallest doubling of the starting size
+        that holds count at max_load_factor, so a map emptied by deletes gets small again in one resize.
+        """
+        if self.rehashing:
+            return
+        if self._reserved > self.size * self.max_load_factor:
+            self.reserve(self._reserved)
+            return
+        self._reserved = 0
+        load = self.count / self.size
+        if load > self.max_load_factor:
+            self._start_rehash(self.size * 2)
+        elif load < self.min_load_factor and self.size > self._min_size:
+            size = self._min_size
+            while self.count > size * self.max_load_factor:
+                size *= 2
+            if size < self.size:
+                self._start_rehash(size)
 
-        If our node location points to None, we replace it with a Node object constructed with our key-value pair.
+    def reserve(self, count):
+        """
+        We make room for count key-value pairs: if count pairs would push us over max_load_factor, we start a resize
+        to the smallest doubling of the size that holds them. Like any other resize it is carried out a few buckets
+        per call, so reserve itself never copies the table. When a resize is already in progress we remember count
+        and start the bigger one as soon as the current one has finished.
+        """
+        if self.rehashing:
+            self._reserved = max(self._reserved, count)
+            return
+        self._reserved = 0
+        size = self.size
+        while count > size * self.max_load_factor:
+            size *= 2
+        if size != self.size:
+            self._start_rehash(size)
 
-        If the node location points to a value, we are dealing with a collision and can make use of our linked list.
-        The prev is set to node, so we can save our starting position and keep track of the current position.
-        We then loop through the linked list (or more specifically our next pointers) until either:
-        A) Our next pointer points to None, in which case we set our next pointer to a Node object containing our key-value pair
-        B) Our current nodes key matches the key we wish to insert, in which case we update the value of the key and return
+    def _locate(self, key):
         """
-        position = self._get_hash(key)
-        node = self.buckets[position]
+        We hash our key once and look for it in the list of buckets and, while a resize is in progress,
+        in the new list of buckets too. Old buckets below _rehash_index are already moved and empty,
+        so we skip straight to the new list for those.
 
-        if node is None:
-            self.buckets[position] = Node(key, value)
-            return
+        We return the hash, the list of buckets and position the key belongs to, together with the node holding the key
+        (or None) and the node in front of it in the chain (or None when it is the first node of its bucket).
+        When the key is missing during a resize, the returned position is the one in the new list of buckets,
+        which is where new keys go.
+        """
+        key_hash = self.hash_function(key)
+        node_hash = key_hash if self.cache_hashes else None
+        position = key_hash % self.size
+        if self._new_buckets is None or position >= self._rehash_index:
+            prev, node = self._walk_chain(self.buckets, position, key, node_hash)
+            if node is not None or self._new_buckets is None:
+                return key_hash, self.buckets, position, prev, node
+
+        position = key_hash % self._new_size
+        prev, node = self._walk_chain(self._new_buckets, position, key, node_hash)
+        return key_hash, self._new_buckets, position, prev, node
 
-        prev = node
-        while node is not None:
-            if node.key == key:
-                node.value = value
-                print(f'Key: {key} value updated to {value}')
-                return
+    @staticmethod
+    def _walk_chain(buckets, position, key, node_hash):
+        """
+        We follow the chain of the bucket until we reach our key or the end of the chain.
+        When hashes are cached we compare them before the keys, so most nodes of a chain are skipped with an int comparison.
+        Without cached hashes every node holds None, and node_hash is None as well.
+        """
+        prev = None
+        node = buckets[position]
+        while node is not None and (node.hash != node_hash or node.key != key):
             prev = node
             node = node.next
-        prev.next = Node(key, value)
+        return prev, node
 
-    def find(self, key):
+    def insert(self, key, value):
         """
-        See the insert function for an elaboration on position and node
+        The insert function will first locate the bucket our key belongs to (see _locate).
+
+        If the key is already stored somewhere in its chain, we update the value of the key and return.
 
-        We go to our hashed position in the constructed list and attempt a while loop which reveals to us
-        whether the positioned node or any of its next pointers contain our key
+        Otherwise we link a Node object constructed with our key-value pair in front of the chain.
+        While a resize is in progress new keys always go into the new list of buckets, so the old list only ever shrinks.
+        Afterwards we check whether the load factor asks for a resize.
 
-        If the next pointer points to None and the hashed position did not contain our key, we print 'not in list'.
-        Otherwise, we print that the key was located together with its value.
+        Returns whether the key is new.
         """
-        position = self._get_hash(key)
-        node = self.buckets[position]
+        if self.rehashing:
+            self._rehash_step()
 
-        while node is not None and node.key != key:
-            node = node.next
+        key_hash, buckets, position, prev, node = self._locate(key)
+        if node is not None:
+            node.value = value
+            return False
 
-        if node is None:
-            print(f'Key: {key} not in list')
-            return
-        else:
-            print(f'Key: {key} in list with value {node.value}')
-            return
+        new_node = Node(key, value, key_hash if self.cache_hashes else None)
+        new_node.next = buckets[position]
+        buckets[position] = new_node
+        self.count += 1
+        self._resize_if_needed()
+        return True
 
-    def delete(self, key):
+    def get(self, key, default=None):
+        """
+        We return the value of the key, or default if the key is not in the map.
         """
-        See the insert function for an elaboration on position and node
+        if self.rehashing:
+            self._rehash_step()
 
-        We track our previous and current position with the variable prev, which starts as None.
-        We attempt a while loop similarly to the find function to determine whether our current node contains our key
-        or if not, whether its next pointer contains any key-value pairs we can check.
+        node = self._locate(key)[4]
+        return default if node is None else node.value
+
+    def peek(self, key, default=None):
+        """
+        Like get, but a resize in progress is not advanced, so looking a key up never writes to the map.
+        Every attribute is read once up front, which lets a reader run next to a writer (see HashMap_Concurrent):
+        if the writer changes the map halfway, the lookup may miss or fail, but it always ends.
+        """
+        buckets = self.buckets
+        size = self.size
+        new_buckets = self._new_buckets
+        new_size = self._new_size
+        rehash_index = self._rehash_index
+        key_hash = self.hash_function(key)
+        node_hash = key_hash if self.cache_hashes else None
 
-        If we exit the loop and our node is none, we did not find our key and print the statement accordingly.
+        position = key_hash % size
+        if new_buckets is None or position >= rehash_index:
+            node = self._walk_chain(buckets, position, key, node_hash)[1]
+            if node is not None:
+                return node.value
+            if new_buckets is None:
+                return default
+        node = self._walk_chain(new_buckets, key_hash % new_size, key, node_hash)[1]
+        return default if node is None else node.value
 
-        If our node key is a match, we check first if we went through a linked list loop by confirming whether prev is None.
-        If prev is none we simply set the position of our key-value pair to None.
-        Otherwise, we set the next pointer of prev to None.
+    def find(self, key):
         """
-        position = self._get_hash(key)
-        node = self.buckets[position]
-        prev = None
+        See the insert function for an elaboration on locating the node
 
-        while node is not None and node.key != key:
-            prev = node
-            node = node.next
+        We go to our hashed position in the constructed list and check
+        whether the positioned node or any of its next pointers contain our key.
+        We return the value of the key, or None if the key is not in the map (use get to tell a stored None apart).
+        """
+        return self.get(key)
+
+    def delete(self, key):
+        """
+        See the insert function for an elaboration on locating the node
+
+        If we did not find our key, we return False.
+
+        If our node key is a match, we check first if it was the first node of its chain by confirming whether prev is None.
+        If prev is None the bucket now starts at the next node of our key-value pair.
+        Otherwise, we set the next pointer of prev to the next node, so the rest of the chain stays linked.
+        Afterwards we check whether the load factor asks for a shrink, and return True.
+        """
+        if self.rehashing:
+            self._rehash_step()
+
+        key_hash, buckets, position, prev, node = self._locate(key)
 
         if node is None:
-            print(f'Key {key} not in list')
-            return
+            return False
+        if prev is None:
+            buckets[position] = node.next
         else:
+            prev.next = node.next
+        self.count -= 1
+        self._resize_if_needed()
+        return True
+
+# ------------------- Mapping protocol ------------------- #
+    # The map can be used like a dictionary: h[key], h[key] = value, del h[key], key in h, len(h) and iterating over the keys
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.peek(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+# ------------------- Batch operations ------------------- #
+    def insert_many(self, pairs):
+        """
+        The batch version of insert, for loading many key-value pairs at once (a mapping or an iterable of pairs).
+
+        We hash the whole batch first and reserve room for it, so the list of buckets is resized at most once
+        for the batch. Like the single key functions we move only a bounded number of old buckets per call:
+        rehash_step for every pair of the batch, in one go before the batch. Then we walk the chains right here
+        in one loop, looking in both lists of buckets while a resize is in progress (see _locate),
+        without the function calls a single insert pays for.
+        Existing keys get their value updated quietly, and later pairs in the batch win over earlier ones.
+
+        Returns the number of new keys.
+        """
+        if hasattr(pairs, 'items'):
+            pairs = pairs.items()
+        pairs = list(pairs)
+        if not pairs:
+            return 0
+        keys, values = zip(*pairs)
+        key_hashes = list(map(self.hash_function, keys))
+        if self.rehashing:
+            self._rehash_step(len(keys) * self.rehash_step)
+        self.reserve(self.count + len(keys))
+
+        buckets = self.buckets
+        size = self.size
+        new_buckets = self._new_buckets
+        new_size = self._new_size
+        rehash_index = self._rehash_index
+        cache_hashes = self.cache_hashes
+        added = 0
+        for key, value, key_hash in zip(keys, values, key_hashes):
+            node_hash = key_hash if cache_hashes else None
+            position = key_hash % size
+            if new_buckets is None or position >= rehash_index:
+                node = buckets[position]
+                while node is not None and (node.hash != node_hash or node.key != key):
+                    node = node.next
+                if node is not None:
+                    node.value = value
+                    continue
+            if new_buckets is not None:
+                # While a resize is in progress new keys go into the new list of buckets, like for insert
+                position = key_hash % new_size
+                node = new_buckets[position]
+                while node is not None and (node.hash != node_hash or node.key != key):
+                    node = node.next
+                if node is not None:
+                    node.value = value
+                    continue
+                node = Node(key, value, node_hash)
+                node.next = new_buckets[position]
+                new_buckets[position] = node
+            else:
+                node = Node(key, value, node_hash)
+                node.next = buckets[position]
+                buckets[position] = node
+            added += 1
+        self.count += added
+        self._resize_if_needed()
+        return added
+
+    def find_many(self, keys, default=None):
+        """
+        The batch version of find: we return a list with the value of every key, or default for keys that are missing.
+        A resize in progress moves rehash_step old buckets per key, all in one go before the batch,
+        and every key is looked up in both lists of buckets like _locate does.
+        """
+        keys = list(keys)
+        if self.rehashing:
+            self._rehash_step(len(keys) * self.rehash_step)
+        buckets = self.buckets
+        size = self.size
+        new_buckets = self._new_buckets
+        new_size = self._new_size
+        rehash_index = self._rehash_index
+        hash_function = self.hash_function
+        cache_hashes = self.cache_hashes
+        results = []
+        for key in keys:
+            key_hash = hash_function(key)
+            node_hash = key_hash if cache_hashes else None
+            position = key_hash % size
+            if new_buckets is None or position >= rehash_index:
+                node = buckets[position]
+                while node is not None and (node.hash != node_hash or node.key != key):
+                    node = node.next
+                if node is not None or new_buckets is None:
+                    results.append(default if node is None else node.value)
+                    continue
+            node = new_buckets[key_hash % new_size]
+            while node is not None and (node.hash != node_hash or node.key != key):
+                node = node.next
+            results.append(default if node is None else node.value)
+        return results
+
+    def delete_many(self, keys):
+        """
+        The batch version of delete: we return a list telling for every key whether it was deleted.
+        A resize in progress is advanced like for find_many, and the load factor is only checked once at the end.
+        """
+        keys = list(keys)
+        if self.rehashing:
+            self._rehash_step(len(keys) * self.rehash_step)
+        buckets = self.buckets
+        size = self.size
+        new_buckets = self._new_buckets
+        new_size = self._new_size
+        rehash_index = self._rehash_index
+        hash_function = self.hash_function
+        cache_hashes = self.cache_hashes
+        results = []
+        for key in keys:
+            key_hash = hash_function(key)
+            node_hash = key_hash if cache_hashes else None
+            table = buckets
+            position = key_hash % size
+            node = None
+            if new_buckets is None or position >= rehash_index:
+                prev = None
+                node = buckets[position]
+                while node is not None and (node.hash != node_hash or node.key != key):
+                    prev = node
+                    node = node.next
+            if node is None and new_buckets is not None:
+                table = new_buckets
+                position = key_hash % new_size
+                prev = None
+                node = new_buckets[position]
+                while node is not None and (node.hash != node_hash or node.key != key):
+                    prev = node
+                    node = node.next
+            if node is None:
+                results.append(False)
+                continue
             if prev is None:
-                self.buckets[position] = None
+                table[position] = node.next
             else:
-                prev.next = None
-            return
+                prev.next = node.next
+            results.append(True)
+        self.count -= results.count(True)
+        self._resize_if_needed()
+        return results
 
-    def print(self):
+    def items(self):
+        # A generator handing us every key-value pair, from both lists of buckets while a resize is in progress
+        for buckets in (self.buckets, self._new_buckets):
+            if buckets is None:
+                continue
+            for node in buckets:
+                while node is not None:
+                    yield node.key, node.value
+                    node = node.next
+
+    def ainsert_many(self, pairs, batch_size=1024):
+        """
+        The async version of insert_many, for pairs arriving from an async iterable (see AsyncStreaming.py):
+        await hash_map.ainsert_many(source) inserts one batch at a time and gives the event loop a turn after each.
+        Returns the number of pairs taken from the source.
+        """
+        from AsyncStreaming import aconsume
+        return aconsume(self, pairs, batch_size)
+
+    def aiter_items(self, every=1024):
+        """
+        An async iterator over the key-value pairs (async for key, value in hash_map.aiter_items()),
+        giving the event loop a turn after every `every` pairs. The map should not be written to during the scan.
         """
-        The print statement stores our position in the iteration through the length of the list starting from 0.
-        
-        At each iteration we set our node value to the position, check if node is not None, we print the value,
-        then check if the node points to another node, in which case we print the next nodes value and set it as our current node
-        to check for any further links.
-        
-        After each iteration we increment the position by 1, effectively going through the whole list.
-        """
-        position = 0
-        for i in range(0, len(self.buckets)):
-            node = self.buckets[position]
-            if node:
-                print(node, end='\n')
-                while node.next:
-                    print(node.next, end='\n')
+        from AsyncStreaming import aiterate
+        return aiterate(self.items(), every)
+
+    def dump(self, path):
+        """
+        We write a snapshot of the map to path, keys must be int, str, bytes or integral floats
+        and values anything pickle handles. The options of the map (see options) are stored with it.
+        See Snapshot.py for the format.
+        """
+        from Snapshot import dump_map
+        dump_map(self.items(), path, self.options())
+
+    @staticmethod
+    def load(path, **map_options):
+        """
+        We map the snapshot at path and return a MappedHashMap answering lookups straight from the file.
+        The first write (insert, delete, h[key] = value, del h[key]) turns it into a regular HashMap with the options
+        the map was dumped with, or the map_options given here.
+        """
+        from Snapshot import MappedHashMap
+        return MappedHashMap(path, **map_options)
+
+# ------------------- Instrumentation hooks ------------------- #
+    # Used by Instrumentation.py, nothing in the map itself calls them
+
+    def _probe_length(self, key):
+        # How many nodes a lookup of key compares, in both lists of buckets while a resize is in progress
+        key_hash = self.hash_function(key)
+        length = 0
+        for buckets, size in ((self.buckets, self.size), (self._new_buckets, self._new_size)):
+            if buckets is None:
+                continue
+            node = buckets[key_hash % size]
+            while node is not None:
+                length += 1
+                if node.key == key:
+                    return length
+                node = node.next
+        return length
+
+    def _gauges(self):
+        # The shape of the map right now: how full it is and how long its chains are
+        chain_lengths = {}
+        for buckets in (self.buckets, self._new_buckets):
+            if buckets is None:
+                continue
+            for node in buckets:
+                length = 0
+                while node is not None:
+                    length += 1
                     node = node.next
-            position += 1
-        print('# ----------- #')
+                chain_lengths[length] = chain_lengths.get(length, 0) + 1
+        return {
+            'count': self.count,
+            'buckets': self.size + (self._new_size if self.rehashing else 0),
+            'load_factor': self.load_factor(),
+            'rehashing': self.rehashing,
+            'longest_chain': max(chain_lengths, default=0),
+            'chain_lengths': dict(sorted(chain_lengths.items())),
+        }
+
+    def print(self):
+        """
+        We print every key-value pair (see Representation.py), going through every position in the list of buckets
+        and following the next pointers of every chain, and through the new list of buckets while a resize is in progress.
+        """
+        from Representation import print_map
+        print_map(self)
 
 if __name__ == '__main__':
     # Instantiate the class    
@@ -160,14 +636,11 @@ if __name__ == '__main__':
     h.insert('John', '510-819')
     h.insert('Jill', '110-119')
     h.insert('Damian', '919-127')
-    h.find('John')
-    h.find('Jill')
+    print(h.find('John'), h.find('Jill'))
     h.print()
     # Test the insert/update functionality
     h.insert('Jill', '121-119')
     h.print()
     # Test the find and delete functionality
-    h.find('Albert')
-    h.delete('Jill')
-    h.find('Jill')
+    print(h.find('Albert'), h.delete('Jill'), h.find('Jill'), 'Jill' in h, len(h))
     h.print()
@@ -0,0 +1,357 @@
+# !Python 3.10
+# -------------
+# This is an implementation of an open addressing hash map (Robin Hood hashing) in Python with the following functionality:
+# - Insert
+# - Find
+# - Delete
+# - Compact
+# - Batch insert/find/delete
+# - Mapping protocol (h[key], key in h, len, iteration)
+# - Print (through Representation.py)
+# It has the same interface as the hash map - linked list, but stores every entry in flat arrays instead of Node objects
+# ------------------------------- Hash map - Robin Hood implementation ------------------------------------ #
+from array import array
+
+from HashMap_LinkedList import HASH_MASK
+
+EMPTY = -1
+_MISSING = object()
+
+
+class RobinHoodHashMap:
+    """
+    We construct our hash map as four parallel arrays with one slot per position:
+    - hashes: the 64 bit hash of the key, unboxed in an array
+    - distances: how far the entry sits from the position its hash points to (EMPTY for a free slot)
+    - keys and values: plain lists holding the key-value pair
+
+    There are no Node objects and no next pointers, so an entry costs 28 bytes of slots plus the key and value themselves,
+    and a lookup walks neighbouring slots instead of chasing pointers around the heap.
+
+    Collisions are resolved with Robin Hood linear probing: while probing for a free slot, an entry that is further away
+    from its home position than the entry in the slot takes that slot, and the richer entry moves on.
+    This keeps probe lengths short and even, and lets a lookup stop as soon as it meets an entry closer to home than itself.
+
+    The capacity is always a power of two. It doubles when count / capacity goes above max_load_factor and
+    halves when it drops below min_load_factor (never below the starting capacity).
+    """
+    def __init__(self, size=16, max_load_factor=0.85, min_load_factor=0.1, hash_function=hash):
+        if size < 1:
+            raise ValueError('size must be at least 1')
+        if not 0 <= min_load_factor < max_load_factor < 1:
+            raise ValueError('load factors must satisfy 0 <= min_load_factor < max_load_factor < 1')
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self.hash_function = hash_function
+        self.count = 0
+        self._min_capacity = self._capacity_for(size)
+        self._allocate(self._min_capacity)
+
+    @staticmethod
+    def _capacity_for(size):
+        # We round up to the next power of two, so a position is a bitwise and instead of a modulo
+        capacity = 1
+        while capacity < size:
+            capacity *= 2
+        return capacity
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._hashes = array('Q', [0]) * capacity
+        self._distances = array('i', [EMPTY]) * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+
+    def load_factor(self):
+        return self.count / self.capacity
+
+    def _slot(self, key, key_hash):
+        """
+        We start probing at the home position of the hash and walk to the right.
+        We can stop at an empty slot, or at a slot whose entry is closer to its home than we are to ours:
+        had our key been inserted, it would have taken that slot.
+        Returns the slot of the key or EMPTY.
+        """
+        hashes = self._hashes
+        distances = self._distances
+        keys = self._keys
+        mask = self._mask
+        position = key_hash & mask
+        distance = 0
+        while True:
+            slot_distance = distances[position]
+            if slot_distance < distance:
+                return EMPTY
+            if hashes[position] == key_hash and keys[position] == key:
+                return position
+            position = (position + 1) & mask
+            distance += 1
+
+    def _place(self, key_hash, key, value):
+        """
+        We insert a key that is known not to be in the map.
+        Whenever the entry in a slot is richer (closer to home) than the one we are carrying,
+        we swap them and continue probing with the displaced entry, until we reach an empty slot.
+        """
+        hashes = self._hashes
+        distances = self._distances
+        keys = self._keys
+        values = self._values
+        mask = self._mask
+        position = key_hash & mask
+        distance = 0
+        while True:
+            slot_distance = distances[position]
+            if slot_distance == EMPTY:
+                hashes[position] = key_hash
+                distances[position] = distance
+                keys[position] = key
+                values[position] = value
+                return
+            if slot_distance < distance:
+                hashes[position], key_hash = key_hash, hashes[position]
+                distances[position], distance = distance, slot_distance
+                keys[position], key = key, keys[position]
+                values[position], value = value, values[position]
+            position = (position + 1) & mask
+            distance += 1
+
+    def _resize(self, capacity):
+        """
+        We allocate fresh arrays and place every entry again, using the stored hashes so no key is hashed twice.
+        """
+        hashes, distances, keys, values = self._hashes, self._distances, self._keys, self._values
+        self._allocate(capacity)
+        for position in range(len(distances)):
+            if distances[position] != EMPTY:
+                self._place(hashes[position], keys[position], values[position])
+
+    def compact(self):
+        """
+        We shrink the arrays to the smallest power of two capacity that keeps us under max_load_factor
+        (never below the starting capacity), which hands the memory of a map that used to be much bigger back.
+        """
+        capacity = max(self._capacity_for(int(self.count / self.max_load_factor) + 1), self._min_capacity)
+        if capacity < self.capacity:
+            self._resize(capacity)
+
+    def insert(self, key, value):
+        """
+        The insert function first checks whether the key is already stored, in which case we update its value and return False.
+        Otherwise we grow the arrays if the new entry would push us over max_load_factor, place the entry and return True.
+        """
+        key_hash = self.hash_function(key) & HASH_MASK
+        position = self._slot(key, key_hash)
+        if position != EMPTY:
+            self._values[position] = value
+            return False
+
+        if self.count + 1 > self.capacity * self.max_load_factor:
+            self._resize(self.capacity * 2)
+        self._place(key_hash, key, value)
+        self.count += 1
+        return True
+
+    def get(self, key, default=None):
+        """
+        We look up the slot of our key (see _slot) and return its value, or default if the key is not in the map.
+        """
+        position = self._slot(key, self.hash_function(key) & HASH_MASK)
+        return default if position == EMPTY else self._values[position]
+
+    def find(self, key):
+        """
+        We return the value of the key, or None if the key is not in the map (use get to tell a stored None apart).
+        """
+        return self.get(key)
+
+    def delete(self, key):
+        """
+        Instead of leaving a tombstone behind, we use backward shift deletion:
+        every following entry that is not in its home slot moves one slot to the left, until we meet an empty slot
+        or an entry that is already home. The arrays look exactly as if the key had never been inserted,
+        so lookups never have to skip over deleted slots and no tombstones pile up.
+        Afterwards we shrink the arrays if the map has become sparse. We return whether the key was in the map.
+        """
+        position = self._slot(key, self.hash_function(key) & HASH_MASK)
+
+        if position == EMPTY:
+            return False
+
+        self._remove_slot(position)
+        self._shrink_if_needed()
+        return True
+
+    def _remove_slot(self, position):
+        # Backward shift deletion of the entry in position, see delete
+        hashes = self._hashes
+        distances = self._distances
+        keys = self._keys
+        values = self._values
+        mask = self._mask
+        following = (position + 1) & mask
+        while distances[following] > 0:
+            hashes[position] = hashes[following]
+            distances[position] = distances[following] - 1
+            keys[position] = keys[following]
+            values[position] = values[following]
+            position = following
+            following = (following + 1) & mask
+        distances[position] = EMPTY
+        keys[position] = None
+        values[position] = None
+        self.count -= 1
+
+    def _shrink_if_needed(self):
+        if self.count < self.capacity * self.min_load_factor and self.capacity > self._min_capacity:
+            self._resize(max(self.capacity // 2, self._min_capacity))
+
+    def reserve(self, count):
+        """
+        We grow the arrays once so that count entries fit under max_load_factor.
+        """
+        capacity = self.capacity
+        while count > capacity * self.max_load_factor:
+            capacity *= 2
+        if capacity != self.capacity:
+            self._resize(capacity)
+
+    # The map can be used like a dictionary: h[key], h[key] = value, del h[key], key in h, len(h) and iterating over the keys
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self._slot(key, self.hash_function(key) & HASH_MASK) != EMPTY
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def items(self):
+        # A generator handing us every key-value pair in slot order
+        distances = self._distances
+        for position in range(self.capacity):
+            if distances[position] != EMPTY:
+                yield self._keys[position], self._values[position]
+
+    def insert_many(self, pairs):
+        """
+        The batch version of insert (a mapping or an iterable of pairs). We hash the whole batch and reserve room
+        for it first, so the arrays are resized at most once. Existing keys get their value updated quietly.
+        Returns the number of new keys.
+        """
+        if hasattr(pairs, 'items'):
+            pairs = pairs.items()
+        pairs = list(pairs)
+        if not pairs:
+            return 0
+        hash_function = self.hash_function
+        key_hashes = [hash_function(key) & HASH_MASK for key, _ in pairs]
+        self.reserve(self.count + len(pairs))
+
+        values = self._values
+        slot = self._slot
+        place = self._place
+        added = 0
+        for (key, value), key_hash in zip(pairs, key_hashes):
+            position = slot(key, key_hash)
+            if position != EMPTY:
+                values[position] = value
+            else:
+                place(key_hash, key, value)
+                added += 1
+        self.count += added
+        return added
+
+    def find_many(self, keys, default=None):
+        """
+        The batch version of find: we return a list with the value of every key, or default for keys that are missing.
+        """
+        hash_function = self.hash_function
+        values = self._values
+        slot = self._slot
+        results = []
+        for key in keys:
+            position = slot(key, hash_function(key) & HASH_MASK)
+            results.append(default if position == EMPTY else values[position])
+        return results
+
+    def delete_many(self, keys):
+        """
+        The batch version of delete: we return a list telling for every key whether it was deleted.
+        """
+        results = []
+        for key in keys:
+            position = self._slot(key, self.hash_function(key) & HASH_MASK)
+            if position != EMPTY:
+                self._remove_slot(position)
+            results.append(position != EMPTY)
+        self._shrink_if_needed()
+        return results
+
+    # The instrumentation hooks, used by Instrumentation.py only
+    def _probe_length(self, key):
+        # How many slots a lookup of key looks at, see _slot
+        key_hash = self.hash_function(key) & HASH_MASK
+        distances = self._distances
+        position = key_hash & self._mask
+        distance = 0
+        while distances[position] >= distance:
+            if self._hashes[position] == key_hash and self._keys[position] == key:
+                break
+            position = (position + 1) & self._mask
+            distance += 1
+        return distance + 1
+
+    def _gauges(self):
+        # How full the arrays are and how far the entries sit from their home slots
+        distances = {}
+        for distance in self._distances:
+            if distance != EMPTY:
+                distances[distance] = distances.get(distance, 0) + 1
+        return {
+            'count': self.count,
+            'capacity': self.capacity,
+            'load_factor': self.count / self.capacity,
+            'longest_probe': max(distances, default=-1) + 1,
+            'probe_distances': dict(sorted(distances.items())),
+        }
+
+    def print(self):
+        """
+        We go through every slot in order and print the key-value pairs of the occupied ones (see Representation.py).
+        """
+        from Representation import print_map
+        print_map(self)
+
+
+if __name__ == '__main__':
+    # Instantiate the class
+    h = RobinHoodHashMap()
+    # Test the insert, find and print functionality
+    h.insert('Bob', '550-889')
+    h.insert('John', '510-819')
+    h.insert('Jill', '110-119')
+    h.insert('Damian', '919-127')
+    print(h.find('John'), h.find('Jill'))
+    h.print()
+    # Test the insert/update functionality
+    h.insert('Jill', '121-119')
+    h.print()
+    # Test the find and delete functionality
+    print(h.find('Albert'), h.delete('Jill'), h.find('Jill'), 'Jill' in h, len(h))
+    h.print()
@@ -0,0 +1,274 @@
+# !Python 3.10
+# -------------
+# This is an implementation of a hash map sharded over worker processes in Python with the following functionality:
+# - Batch insert/find/delete
+# - Insert / Get / Delete of a single key
+# - Length and iteration over all shards
+# - Close (also as a context manager)
+# Every shard is a hash map - linked list living in a process of its own, so the shards work on as many cores
+# as there are processes instead of sharing the one core the GIL gives a single process
+# ------------------------------- Sharded hash map implementation ------------------------------------ #
+import multiprocessing
+import os
+
+from HashMap_LinkedList import FIBONACCI_MULTIPLIER, HASH_MASK, HashMap
+
+# How many pairs a worker sends back per message while we iterate over its shard
+ITEMS_CHUNK = 10_000
+_MISSING = object()
+
+
+def _serve(connection, map_options):
+    """
+    The loop of a worker process: we receive a request (a command and its arguments), run it against our shard
+    and send back ('ok', result) or ('error', exception). Every request carries a whole batch of keys,
+    so one round trip through the pipe pays for thousands of operations.
+    """
+    shard = HashMap(**map_options)
+    while True:
+        try:
+            command, arguments = connection.recv()
+        except EOFError:
+            return
+        if command == 'close':
+            connection.close()
+            return
+        try:
+            if command == 'items':
+                # Big shards are streamed in chunks, followed by an empty chunk, so no message gets huge.
+                # A failure halfway sends an error instead of the empty chunk, either one ends the stream
+                chunk = []
+                for pair in shard.items():
+                    chunk.append(pair)
+                    if len(chunk) == ITEMS_CHUNK:
+                        connection.send(('ok', chunk))
+                        chunk = []
+                if chunk:
+                    connection.send(('ok', chunk))
+                result = []
+            elif command == 'len':
+                result = shard.count
+            elif command == 'lookup_many':
+                # The default of the caller would come back as a copy, so we tell the caller which keys are missing
+                values = shard.find_many(arguments[0], _MISSING)
+                missing = [index for index, value in enumerate(values) if value is _MISSING]
+                for index in missing:
+                    values[index] = None
+                result = (values, missing)
+            else:
+                result = getattr(shard, command)(*arguments)
+        except Exception as error:
+            connection.send(('error', error))
+        else:
+            connection.send(('ok', result))
+
+
+class ShardedHashMap:
+    """
+    We construct the map from a number of shards (by default one per core), each one a HashMap in a worker process
+    that we talk to through a pipe. A key always belongs to the same shard, picked from the top bits of its mixed hash.
+
+    The batch functions are the fast way in: we sort a batch by shard, send every shard its part of the batch
+    before waiting for any answer, and only then collect the answers, so all shards work at the same time.
+    The single key functions cost a full round trip to a worker each and are only there for convenience.
+
+    Keys and values travel between the processes pickled. Only we pick the shard of a key, with hash_function in
+    this process, and every worker hashes the keys of its own shard only, so a hash does not have to be the same
+    in different processes: the built-in hash() works for any key, whatever the start method.
+    hash_function is also handed to every shard, so with the spawn or forkserver start method it has to be picklable
+    (a module level function, not a lambda). Any other HashMap option is passed on to every shard as well.
+    """
+    def __init__(self, shards=None, hash_function=hash, context=None, **map_options):
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError('shards must be at least 1')
+        self.hash_function = hash_function
+        map_options['hash_function'] = hash_function
+        context = multiprocessing.get_context(context)
+        self._connections = []
+        self._workers = []
+        for _ in range(shards):
+            parent, child = context.Pipe()
+            worker = context.Process(target=_serve, args=(child, map_options), daemon=True)
+            worker.start()
+            child.close()
+            self._connections.append(parent)
+            self._workers.append(worker)
+
+    @property
+    def shards(self):
+        return len(self._connections)
+
+    def _shard_index(self, key):
+        return ((self.hash_function(key) * FIBONACCI_MULTIPLIER) & HASH_MASK) * self.shards >> 64
+
+    def _group(self, keys):
+        # We return for every shard the positions in keys of the keys that belong to it
+        # This runs in the parent for every key, so we keep it to one comprehension and one loop without calls
+        groups = [[] for _ in self._connections]
+        if len(groups) == 1:
+            groups[0] = list(range(len(keys)))
+            return groups
+        hash_function = self.hash_function
+        shards = len(groups)
+        targets = [((hash_function(key) * FIBONACCI_MULTIPLIER) & HASH_MASK) * shards >> 64 for key in keys]
+        for index, target in enumerate(targets):
+            groups[target].append(index)
+        return groups
+
+    @staticmethod
+    def _receive(connection):
+        status, result = connection.recv()
+        if status == 'error':
+            raise result
+        return result
+
+    def _scatter(self, requests):
+        # We send every shard its request first and collect the answers afterwards, so the workers run in parallel.
+        # requests holds a (command, arguments) pair or None for every shard, we return the results in the same order
+        if not self._connections:
+            raise ValueError('the sharded map is closed')
+        for connection, request in zip(self._connections, requests):
+            if request is not None:
+                connection.send(request)
+        results = [None] * len(requests)
+        error = None
+        for shard, (connection, request) in enumerate(zip(self._connections, requests)):
+            if request is not None:
+                # We read every answer even after an error, so no answer is left behind in a pipe
+                try:
+                    results[shard] = self._receive(connection)
+                except Exception as exception:
+                    error = error or exception
+        if error is not None:
+            raise error
+        return results
+
+# ------------------- Batch operations ------------------- #
+    def insert_many(self, pairs):
+        # We return the number of new keys
+        if hasattr(pairs, 'items'):
+            pairs = pairs.items()
+        pairs = list(pairs)
+        groups = self._group([key for key, _ in pairs])
+        requests = [('insert_many', ([pairs[index] for index in indexes],)) if indexes else None for indexes in groups]
+        return sum(result for result in self._scatter(requests) if result)
+
+    def find_many(self, keys, default=None):
+        keys = list(keys)
+        groups = self._group(keys)
+        requests = [('lookup_many', ([keys[index] for index in indexes],)) if indexes else None for indexes in groups]
+        results = [default] * len(keys)
+        for indexes, answer in zip(groups, self._scatter(requests)):
+            if answer is None:
+                continue
+            values, missing = answer
+            for index, value in zip(indexes, values):
+                results[index] = value
+            for position in missing:
+                results[indexes[position]] = default
+        return results
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        groups = self._group(keys)
+        requests = [('delete_many', ([keys[index] for index in indexes],)) if indexes else None for indexes in groups]
+        results = [False] * len(keys)
+        for indexes, deleted in zip(groups, self._scatter(requests)):
+            for index, was_deleted in zip(indexes, deleted or ()):
+                results[index] = was_deleted
+        return results
+
+# ------------------- Single keys ------------------- #
+    def _request(self, key, command, *arguments):
+        shard = self._shard_index(key)
+        requests = [None] * self.shards
+        requests[shard] = (command, arguments)
+        return self._scatter(requests)[shard]
+
+    def insert(self, key, value):
+        # We return whether the key is new
+        return self._request(key, 'insert', key, value)
+
+    def get(self, key, default=None):
+        values, missing = self._request(key, 'lookup_many', [key])
+        return default if missing else values[0]
+
+    def delete(self, key):
+        # We return whether the key was in the map
+        return self._request(key, 'delete', key)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+# ------------------- Length / Iterate / Close ------------------- #
+    def __len__(self):
+        return sum(self._scatter([('len', ())] * self.shards))
+
+    def items(self):
+        # One shard after the other streams its pairs to us in chunks
+        for connection in self._connections:
+            connection.send(('items', ()))
+            finished = False
+            try:
+                while True:
+                    status, chunk = connection.recv()
+                    if status == 'error':
+                        # The worker sends nothing after an error, the stream is over
+                        finished = True
+                        raise chunk
+                    if not chunk:
+                        finished = True
+                        break
+                    yield from chunk
+            finally:
+                # If the caller stops early we still read the rest of the stream, the pipe has to be empty for the next request
+                while not finished:
+                    status, chunk = connection.recv()
+                    finished = status == 'error' or not chunk
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def close(self):
+        # We ask every worker to stop and wait for it, the map cannot be used afterwards
+        for connection in self._connections:
+            try:
+                connection.send(('close', ()))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for worker in self._workers:
+            worker.join()
+        self._connections = []
+        self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == '__main__':
+    with ShardedHashMap(shards=4) as h:
+        print(h.insert_many((f'key-{i}', i) for i in range(100_000)))
+        print(h.find_many(['key-1', 'key-99999', 'missing']))
+        print(h.delete_many(['key-1', 'key-1']), len(h))
+        h['Bob'] = '550-889'
+        print(h['Bob'], 'Bob' in h, sum(1 for _ in h))
@@ -0,0 +1,231 @@
+# !Python 3.10
+# -------------
+# This is an optional instrumentation layer for our data structures with the following functionality:
+# - Histograms of operation latencies
+# - Histograms of probe lengths: nodes compared in a hash map chain, slots probed in an open addressing map,
+#   nodes visited on the way down a tree or along a linked list
+# - Gauges of the shape of the structure: load factor and chain lengths, tree height and balance, length
+# - A snapshot dict of all of it, ready to be exported to a metrics pipeline
+# Nothing is measured until we call instrument(structure), which wraps the operations of that one object only.
+# The classes themselves carry no checks or counters, so a structure that is not instrumented pays nothing at all
+# ------------------------------- Instrumentation implementation ------------------------------------ #
+import time
+from bisect import bisect_left
+
+# The upper bounds of the histogram buckets: small probe lengths one by one, then doubling,
+# and latencies in doubling steps from 64 nanoseconds to about a second
+LENGTH_BOUNDS = (0, 1, 2, 3, 4, 5, 6, 8, 12, 16, 24, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+LATENCY_BOUNDS = tuple(2 ** power for power in range(6, 31))
+
+# The operations we wrap, and whether their first argument is the key we can measure the probe length of
+KEYED_OPERATIONS = ('find', 'get', 'insert', 'delete', 'delete_node')
+OTHER_OPERATIONS = ('append', 'prepend', 'insert_many', 'find_many', 'delete_many')
+
+
+class Histogram:
+    """
+    A histogram with fixed bucket bounds: a recorded value lands in the first bucket whose upper bound is at least
+    the value, values above the last bound in an overflow bucket. Recording is one bisect and a few additions,
+    and the percentiles are the upper bounds of the buckets they fall in.
+    """
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        if self.count == 0:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                # The overflow bucket has no upper bound, its best estimate is the biggest value we saw
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            # Only the buckets that were hit, as [upper bound, count] pairs (None for the overflow bucket)
+            'buckets': [[self.bounds[index] if index < len(self.bounds) else None, count]
+                        for index, count in enumerate(self.counts) if count],
+        }
+
+
+class OperationMetrics:
+    # The latency and probe length histograms of one operation
+    __slots__ = ('latency_ns', 'probe_length')
+
+    def __init__(self):
+        self.latency_ns = Histogram(LATENCY_BOUNDS)
+        self.probe_length = Histogram(LENGTH_BOUNDS)
+
+
+class Metrics:
+    """
+    The metrics of one instrumented structure. Every wrapped operation records its latency in nanoseconds,
+    and every sample_every-th call of a keyed operation also records its probe length.
+    Measuring the probe length walks the structure a second time, which is why it can be sampled.
+
+    snapshot() returns a plain dict: the histograms of every operation that was called
+    and the gauges of the structure, which are measured at the time of the snapshot.
+    Only the outermost call is recorded: HashMap.find calls get, which is wrapped as well, and counts as a find only.
+    """
+    def __init__(self, structure, sample_every=1):
+        if sample_every < 1:
+            raise ValueError('sample_every must be at least 1')
+        self.structure = structure
+        self.sample_every = sample_every
+        self.operations = {}
+        self.calls = 0
+        # How many wrapped operations are running right now, a wrapper called from inside another one records nothing
+        self.depth = 0
+
+    def operation(self, name):
+        metrics = self.operations.get(name)
+        if metrics is None:
+            metrics = self.operations[name] = OperationMetrics()
+        return metrics
+
+    def reset(self):
+        # The wrappers hold on to their histograms, so we empty them in place
+        for metrics in self.operations.values():
+            metrics.latency_ns.reset()
+            metrics.probe_length.reset()
+        self.calls = 0
+
+    def snapshot(self):
+        gauges = getattr(self.structure, '_gauges', None)
+        return {
+            'structure': type(self.structure).__name__,
+            'operations': {
+                name: {'latency_ns': metrics.latency_ns.snapshot(), 'probe_length': metrics.probe_length.snapshot()}
+                for name, metrics in self.operations.items() if metrics.latency_ns.count
+            },
+            'gauges': gauges() if gauges is not None else {},
+        }
+
+
+def _wrap_keyed(metrics, name, function, probe_length):
+    record = metrics.operation(name)
+    latency = record.latency_ns.record
+    probes = record.probe_length.record
+    clock = time.perf_counter_ns
+
+    def wrapper(key, *args, **kwargs):
+        if metrics.depth:
+            return function(key, *args, **kwargs)
+        metrics.calls += 1
+        # We measure the probe length before the call, so a delete is measured on the structure that still holds the key
+        if probe_length is not None and metrics.calls % metrics.sample_every == 0:
+            probes(probe_length(key))
+        metrics.depth += 1
+        start = clock()
+        try:
+            return function(key, *args, **kwargs)
+        finally:
+            latency(clock() - start)
+            metrics.depth -= 1
+    return wrapper
+
+
+def _wrap(metrics, name, function):
+    latency = metrics.operation(name).latency_ns.record
+    clock = time.perf_counter_ns
+
+    def wrapper(*args, **kwargs):
+        if metrics.depth:
+            return function(*args, **kwargs)
+        metrics.depth += 1
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            latency(clock() - start)
+            metrics.depth -= 1
+    return wrapper
+
+
+def instrument(structure, sample_every=1):
+    """
+    We install wrappers around the operations of this structure (on the instance, so other instances and the
+    class stay untouched) and return the Metrics they record into. Calling it again returns the same Metrics.
+    Operators like `in` and `[]` are looked up on the class by Python and are not measured.
+    """
+    metrics = structure.__dict__.get('_metrics')
+    if metrics is not None:
+        return metrics
+    metrics = Metrics(structure, sample_every)
+    probe_length = getattr(structure, '_probe_length', None)
+    wrapped = []
+    for name in KEYED_OPERATIONS + OTHER_OPERATIONS:
+        function = getattr(structure, name, None)
+        if function is None:
+            continue
+        if name in KEYED_OPERATIONS:
+            setattr(structure, name, _wrap_keyed(metrics, name, function, probe_length))
+        else:
+            setattr(structure, name, _wrap(metrics, name, function))
+        wrapped.append(name)
+    structure._metrics = metrics
+    structure._instrumented = wrapped
+    return metrics
+
+
+def uninstrument(structure):
+    # We remove the wrappers again, the class methods show through and the structure is back to zero overhead
+    for name in structure.__dict__.get('_instrumented', ()):
+        delattr(structure, name)
+    structure.__dict__.pop('_metrics', None)
+    structure.__dict__.pop('_instrumented', None)
+
+
+if __name__ == '__main__':
+    import json
+    import random
+
+    from BinarySearchTree import BinarySearchTree
+    from HashMap_LinkedList import HashMap
+
+    h = HashMap()
+    metrics = instrument(h)
+    for i in range(10_000):
+        h.insert(f'key-{i}', i)
+    for i in range(5_000):
+        h.get(f'key-{random.randrange(20_000)}')
+    print(json.dumps(metrics.snapshot()['gauges']))
+    print(json.dumps(metrics.snapshot()['operations']['get']['probe_length']))
+
+    # Sorted inserts make a plain binary search tree degenerate, which the height and balance gauges show right away
+    bst = BinarySearchTree()
+    metrics = instrument(bst, sample_every=10)
+    for key in range(500):
+        bst.insert(key)
+    snapshot = metrics.snapshot()
+    print(snapshot['gauges'], snapshot['operations']['insert']['probe_length']['p99'])
+    uninstrument(bst)
@@ -6,16 +6,30 @@
 # - Prepend
 # - Find
 # - Delete
-# - Print
+# - Remove, move and insert after a node by handle
+# - Optional value index for O(1) find/delete
+# - Length, iteration and indexing
+# - Async filling and scanning (through AsyncStreaming.py)
+# - Print (through Representation.py)
 #------------------------------- Linked List implementation in Python ------------------------------------
 
+# The place of a node that is linked at the tail, see _add_to_index
+_TAIL = object()
+
+
 class ListNode:
     # We construct the node class, by default our next and prev pointers
     # are set to None
+    # owner is the list the node is linked into (None while it is in no list), so a list can refuse nodes of another
+    # __slots__ stores the four attributes in fixed places instead of a per-node __dict__,
+    # which makes every node a lot smaller and attribute access a bit faster
+    __slots__ = ('value', 'next', 'prev', 'owner')
+
     def __init__(self, value):
         self.value = value
         self.next = None
         self.prev = None
+        self.owner = None
 
     # We can use the __str__ method to return the string value of the node
     # which is useful for when we call a print function on the value
@@ -23,20 +37,73 @@ class ListNode:
         return str(self.value)
 
 class LinkedList:
-    # We construct the linked list class which takes no parameters
-    # and by default has a head and tail parameters set to None
-    def __init__(self):
+    # We construct the linked list class which by default has a head and tail parameters set to None.
+    # With index=True we also keep a dictionary from every value to the nodes holding it,
+    # which turns find and delete_node into O(1) operations (the values then have to be hashable).
+    # The duplicates parameter decides what happens when a value that is already in an indexed list is added again:
+    # - 'allow': the value is added, find and delete_node use the node holding it nearest to the head,
+    #   just like in a list without index
+    # - 'reject': a ValueError is raised
+    def __init__(self, index=False, duplicates='allow'):
+        if duplicates not in ('allow', 'reject'):
+            raise ValueError("duplicates must be 'allow' or 'reject'")
         self.head = None
         self.tail = None
+        self.length = 0
+        self.duplicates = duplicates
+        # Every value maps to a dictionary used as an ordered set of its nodes, in the order they have in the list
+        self._index = {} if index else None
 
-    # See ListNode __str__
+    # When the list is indexed we register every new node under its value, before it is linked.
+    # The nodes of a value are kept in list order, so find can hand out the first one like the loop over the list does.
+    # previous is the node the item is linked behind: _TAIL when it becomes the tail, None when it becomes the head.
+    # Only a duplicate value placed anywhere but at the tail costs more than O(1): we rebuild the dictionary of the value,
+    # and for a place in the middle we first walk out from it to the nearest node holding the same value
+    def _add_to_index(self, item, previous=_TAIL):
+        nodes = self._index.get(item.value)
+        if nodes is None:
+            self._index[item.value] = {item: None}
+            return
+        if self.duplicates == 'reject':
+            raise ValueError(f'Item {item.value} is already in the list')
+        if previous is _TAIL or previous is self.tail:
+            nodes[item] = None
+            return
+        # before ends up as the node of the value right in front of the item, after as the one right behind it
+        before, after = None, None
+        if previous is not None:
+            back, ahead = previous, previous.next
+            while before is None and after is None and (back is not None or ahead is not None):
+                if back is not None:
+                    if back in nodes:
+                        before = back
+                    back = back.prev
+                if ahead is not None and before is None:
+                    if ahead in nodes:
+                        after = ahead
+                    ahead = ahead.next
+        ordered = {item: None} if before is None and after is None else {}
+        for node in nodes:
+            if node is after:
+                ordered[item] = None
+            ordered[node] = None
+            if node is before:
+                ordered[item] = None
+        self._index[item.value] = ordered
+
+    # The string of the list is the neat looking list of print_list
     def __str__(self):
-        return str(self)
+        from Representation import format_list
+        return format_list(self)
 
     # The append function is where we start out our linked list construction
     def append(self, value):
         # We bind the passed value argument as a node object to a new variable called item
         item = ListNode(value)
+        if self._index is not None:
+            self._add_to_index(item)
+        self.length += 1
+        item.owner = self
         # If our head is None, this means our list is empty
         # in this case we set the value we passed as the head
         if self.head is None:
@@ -44,8 +111,9 @@ class LinkedList:
             self.tail = item
             return item
         # Otherwise we call an inner append function with our item variable as the argument
+        # Either way we hand the node back, so callers can keep it as a handle for remove_node
         else:
-            self._append(item)
+            return self._append(item)
 
     # The inner append function takes the value we wish to insert as an argument
     def _append(self, value):
@@ -64,6 +132,10 @@ class LinkedList:
     def prepend(self, value):
         # We begin with creating a ListNode object with our value bound to the variable item
         item = ListNode(value)
+        if self._index is not None:
+            self._add_to_index(item, None)
+        self.length += 1
+        item.owner = self
         # We check to see if our head is None, in which case we know the list is empty
         # So we set head and tail to the same value
         if self.head is None:
@@ -72,7 +144,7 @@ class LinkedList:
             return item
         # If we have our head node set, we call the inner prepend function
         else:
-            self._prepend(item)
+            return self._prepend(item)
 
     def _prepend(self, value):
         # We will position ourselves at the head node
@@ -85,69 +157,180 @@ class LinkedList:
         self.head = value
         return value
 
-    # The find function will loop over the list until we either find the value
-    # that we pass as an argument or the next pointer is pointing to none
-    def find(self, value):
+    # The insert_after function adds a value right behind a node we already hold and returns the new node
+    def insert_after(self, node, value):
+        if node.owner is not self:
+            raise ValueError(f'Node {node.value} is not in the list')
+        if node is self.tail:
+            return self.append(value)
+        item = ListNode(value)
+        if self._index is not None:
+            self._add_to_index(item, node)
+        self.length += 1
+        item.owner = self
+        item.prev = node
+        item.next = node.next
+        node.next.prev = item
+        node.next = item
+        return item
+
+    # The prepend_node function links a node that is in no list (for example one taken out with remove_node)
+    # at the front, so a node can move between lists without allocating a new one
+    def prepend_node(self, node):
+        if node.owner is not None:
+            raise ValueError(f'Node {node.value} is already in a list')
+        if self._index is not None:
+            self._add_to_index(node, None)
+        self.length += 1
+        node.owner = self
         if self.head is None:
-            return 'This list is empty'
-        else:
-            # Iteration starts from the head node
-            current = self.head
-            # Iteration runs until we find the value or next pointer points to None
-            while current.value != value:
-                if current.next is None:
-                    print(f'Item {value} is not in the list')
-                    return # Once the iteration ends we return
-                current = current.next # In order to continue iterating we set the variable current to the next node
-            print(f'Item {value} is in the list')
+            self.head = node
+            self.tail = node
+            return node
+        return self._prepend(node)
+
+    # The move_to_front function makes a node of this list its head in O(1)
+    def move_to_front(self, node):
+        if node is not self.head:
+            self.remove_node(node)
+            self.prepend_node(node)
+        return node
+
+    # The _find_node function returns the first node holding our value, or None if there is none.
+    # An indexed list answers straight from the index, otherwise we loop over the list
+    # until we either find the value or the next pointer is pointing to none
+    def _find_node(self, value):
+        if self._index is not None:
+            nodes = self._index.get(value)
+            return next(iter(nodes)) if nodes else None
+        # Iteration starts from the head node
+        current = self.head
+        # Iteration runs until we find the value or we run out of nodes
+        while current is not None and current.value != value:
+            current = current.next # In order to continue iterating we set the variable current to the next node
+        return current
+
+    # The in operator tells us whether a value is in the list, in O(1) for an indexed list
+    def __contains__(self, value):
+        return self._find_node(value) is not None
+
+    # The find function returns the first node holding the value that we pass as an argument, or None if it is not in the list
+    def find(self, value):
+        return self._find_node(value)
 
     # The delete_node function will look for the requested value in the linked list
-    # and delete it if it is found, otherwise it will tell us that the item is not in the list
+    # and delete it if it is found. We return whether it was found
     def delete_node(self, value):
-        # Iteration starts from the head node
+        current = self._find_node(value)
+        if current is None:
+            return False
+        self.remove_node(current)
+        return True
+
+    # The remove_node function unlinks a node we already hold (as returned by append or prepend) in O(1)
+    # A node of another list, or one that is in no list (it was removed already), is refused before we touch any link:
+    # unlinking it would cut off our head and tail, or the other list's nodes
+    def remove_node(self, node):
+        if node.owner is not self:
+            raise ValueError(f'Node {node.value} is not in the list')
+        # We set the next value of the previous node to the next of the current node
+        # and vice versa, thus deleting or "unlinking" our value.
+        # If there is no previous or next node, the node was our head or tail and its neighbour takes that place
+        if node.prev is not None:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+        node.prev = None
+        node.next = None
+        node.owner = None
+        self.length -= 1
+        if self._index is not None:
+            nodes = self._index[node.value]
+            del nodes[node]
+            if not nodes:
+                del self._index[node.value]
+        return node.value
+
+    # The iter_nodes function is a generator handing us every node from head to tail.
+    # We fetch the next node before handing out the current one, so the caller may remove the node it was given
+    def iter_nodes(self):
         current = self.head
-        # Iteration runs until we find the value or next pointer points to None
-        while current.value != value:
-            if current.next is None:
-                print(f'Item {value} is not in the list')
-                return
+        while current is not None:
+            following = current.next
+            yield current
+            current = following
+
+    def __len__(self):
+        return self.length
+
+    # The instrumentation hooks, used by Instrumentation.py only.
+    # _probe_length counts the nodes a find of value looks at, one for an indexed list
+    def _probe_length(self, value):
+        if self._index is not None:
+            return 1
+        length = 0
+        current = self.head
+        while current is not None:
+            length += 1
+            if current.value == value:
+                break
             current = current.next
-        # We know we have found our value if we break out of the while loop
-        # We then set the next value of the previous node to the next of the current node
-        # and vice versa, thus deleting or "unlinking" our value
-        current.prev.next = current.next
-        current.next.prev = current.prev
+        return length
 
-    # This function prints a neat looking list with pointers showing
-    # which value points to which
-    def print_list(self):
-        if self.head is None:
-            return 'This is an empty list'
-        else:
+    def _gauges(self):
+        return {'length': self.length, 'indexed': self._index is not None}
+
+    # Iterating over the list hands us the values from head to tail
+    def __iter__(self):
+        current = self.head
+        while current is not None:
+            yield current.value
+            current = current.next
+
+    # Indexing walks from the closest end of the list, so it costs O(n) like for any linked list.
+    # Negative indexes count from the tail
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('list index out of range')
+        if index < self.length // 2:
             current = self.head
-            print('None <->', end=' ')
-            while current.next is not None:
-                print(f'{current.value}', end=' <-> ')
+            for _ in range(index):
                 current = current.next
-            print(f'{current.value} <->', end=' ')
-            print('None')
+        else:
+            current = self.tail
+            for _ in range(self.length - 1 - index):
+                current = current.prev
+        return current.value
+
+    # The async versions of filling and scanning the list, for values arriving from an async source
+    # and consumers that stream the values out (see AsyncStreaming.py). Both give the event loop a turn every batch:
+    # await linked_list.aextend(source) appends everything source yields and returns how many values that were
+    def aextend(self, values, batch_size=1024):
+        from AsyncStreaming import aconsume
+        return aconsume(self, values, batch_size)
+
+    # async for value in linked_list.aiter_values(): ...
+    def aiter_values(self, every=1024):
+        from AsyncStreaming import aiterate
+        return aiterate(self, every)
+
+    # This function prints a neat looking list with pointers showing
+    # which value points to which (see Representation.py)
+    def print_list(self):
+        from Representation import print_list
+        print_list(self)
 
     # This function is a more detailed view that prints all the pointer values
     # of every single node which can be useful to make sure that our pointers are set correctly
     def print_detail(self):
-        if self.head is None:
-            return 'This is an empty list'
-        else:
-            current = self.head
-            while current.next is not None:
-                print(f'Current node is {current.value}', end=' ')
-                print(f'The previous node is {current.prev}', end=' ')
-                print(f'The next node is {current.next}', end='\n')
-                current = current.next
-            print(f'Current node is {current.value}', end=' ')
-            print(f'The previous node is {current.prev}', end=' ')
-            print(f'The next node is None')
-
+        from Representation import print_detail
+        print_detail(self)
 
 if __name__ == '__main__':
     # We construct our Linked List class under the linkedl variable
@@ -161,9 +344,9 @@ if __name__ == '__main__':
     linkedl.prepend(5)
     # We test the print list functionality
     linkedl.print_list()
-    # We test the find functionality
-    linkedl.find(60)
-    linkedl.find(22)
+    # We test the find functionality, which hands us the node or None
+    print(linkedl.find(60), linkedl.find(22))
     # We test the delete functionality
-    linkedl.delete_node(14)
+    print(linkedl.delete_node(14), linkedl.delete_node(14))
     linkedl.print_list()
+    print(len(linkedl), linkedl[0], linkedl[-1], 22 in linkedl)
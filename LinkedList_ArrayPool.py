@@ -0,0 +1,178 @@
+# !Python 3.10
+# -------------
+# This is an implementation of a doubly linked list backed by a pool of array slots in Python with the following functionality:
+# - Append
+# - Prepend
+# - Find
+# - Delete
+# - Remove a node by handle
+# - Length, iteration and indexing
+# - Print (through Representation.py)
+# Instead of a ListNode object per value, a node is just a slot number: its value, next and prev pointers live in
+# three flat arrays, and removed slots are kept on a free list to be reused by the next append or prepend
+#------------------------------- Array pool linked list implementation in Python ------------------------------------
+from array import array
+
+# The slot number we use as our None pointer
+NIL = -1
+# The prev pointer of a slot that is on the free list
+FREE = -2
+
+
+class PooledLinkedList:
+    # We construct the linked list with empty arrays, by default head and tail point to NIL.
+    # values is a plain list of the stored values, next and prev are arrays of 4 byte slot numbers,
+    # so a node costs 16 bytes plus its value, against a ListNode object per value in the linked list
+    def __init__(self):
+        self.head = NIL
+        self.tail = NIL
+        self.length = 0
+        self._values = []
+        self._next = array('i')
+        self._prev = array('i')
+        # The free list is chained through the next array of the removed slots, their prev pointers are FREE
+        self._free = NIL
+
+    # We take a slot from the free list if there is one, otherwise we grow the arrays by one slot
+    def _allocate(self, value):
+        self.length += 1
+        slot = self._free
+        if slot != NIL:
+            self._free = self._next[slot]
+            self._values[slot] = value
+        else:
+            slot = len(self._values)
+            self._values.append(value)
+            self._next.append(NIL)
+            self._prev.append(NIL)
+        return slot
+
+    # The append function links a new slot after our tail and returns it as the handle of the node
+    def append(self, value):
+        slot = self._allocate(value)
+        self._next[slot] = NIL
+        self._prev[slot] = self.tail
+        # If our list is empty the new slot is also our head
+        if self.tail == NIL:
+            self.head = slot
+        else:
+            self._next[self.tail] = slot
+        self.tail = slot
+        return slot
+
+    # The prepend function is the mirror image of append
+    def prepend(self, value):
+        slot = self._allocate(value)
+        self._prev[slot] = NIL
+        self._next[slot] = self.head
+        if self.head == NIL:
+            self.tail = slot
+        else:
+            self._prev[self.head] = slot
+        self.head = slot
+        return slot
+
+    # The value function returns the value of a handle
+    def value(self, slot):
+        return self._values[slot]
+
+    # The _find_node function loops over the list from the head and returns the first slot holding our value, or NIL
+    def _find_node(self, value):
+        values = self._values
+        following = self._next
+        current = self.head
+        while current != NIL and values[current] != value:
+            current = following[current]
+        return current
+
+    def __contains__(self, value):
+        return self._find_node(value) != NIL
+
+    # The find function returns the slot of the first node holding the value that we pass as an argument,
+    # or None if it is not in the list
+    def find(self, value):
+        slot = self._find_node(value)
+        return slot if slot != NIL else None
+
+    # The delete_node function will look for the requested value in the linked list
+    # and delete it if it is found. We return whether it was found
+    def delete_node(self, value):
+        slot = self._find_node(value)
+        if slot == NIL:
+            return False
+        self.remove_node(slot)
+        return True
+
+    # The remove_node function unlinks a slot we already hold in O(1) and puts it on the free list.
+    # A slot that is already free would land on the free list twice and be handed out twice, so we refuse it
+    def remove_node(self, slot):
+        if not 0 <= slot < len(self._values) or self._prev[slot] == FREE:
+            raise ValueError(f'Slot {slot} is not in the list')
+        following = self._next[slot]
+        previous = self._prev[slot]
+        if previous != NIL:
+            self._next[previous] = following
+        else:
+            self.head = following
+        if following != NIL:
+            self._prev[following] = previous
+        else:
+            self.tail = previous
+        value = self._values[slot]
+        # We drop our reference to the value, so it can be freed while the slot waits to be reused
+        self._values[slot] = None
+        self._next[slot] = self._free
+        self._prev[slot] = FREE
+        self._free = slot
+        self.length -= 1
+        return value
+
+    # The iter_values function is a generator handing us every value from head to tail
+    def iter_values(self):
+        values = self._values
+        following = self._next
+        current = self.head
+        while current != NIL:
+            yield values[current]
+            current = following[current]
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return self.iter_values()
+
+    # Indexing walks the links from the head, so it costs O(n) like for any linked list.
+    # Negative indexes count from the tail
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('list index out of range')
+        following = self._next
+        current = self.head
+        for _ in range(index):
+            current = following[current]
+        return self._values[current]
+
+    # This function prints a neat looking list with pointers showing
+    # which value points to which (see Representation.py)
+    def print_list(self):
+        from Representation import print_list
+        print_list(self)
+
+if __name__ == '__main__':
+    # We run the same demo as for the linked list
+    linkedl = PooledLinkedList()
+    keys = [20, 10, 12, 13, 14, 30, 22, 21, 32, 33, 35]
+    for key in keys:
+        linkedl.append(key)
+    linkedl.prepend(5)
+    linkedl.print_list()
+    print(linkedl.find(60), linkedl.find(22))
+    print(linkedl.delete_node(14), linkedl.delete_node(14))
+    linkedl.print_list()
+    # The slot 14 was stored in is reused by the next append
+    linkedl.append(40)
+    linkedl.print_list()
+    print(len(linkedl), linkedl[0], linkedl[-1], 22 in linkedl)
@@ -0,0 +1,222 @@
+# !Python 3.10
+# -------------
+# This is an implementation of an unrolled doubly linked list in Python with the following functionality:
+# - Append / Prepend
+# - Extend (batch append)
+# - Pop / Popleft
+# - Find
+# - Delete
+# - Iterate, len and indexing
+# - Print (through Representation.py)
+# Every node holds a block of up to block_size values instead of a single value, so appending mostly writes into
+# an existing block and iterating follows one pointer per block, which makes it a good fit for work queues
+#------------------------------- Unrolled linked list implementation in Python ------------------------------------
+from itertools import islice
+
+
+class ListBlock:
+    # A block is a node of the list holding a Python list of values, by default our next and prev pointers
+    # are set to None
+    __slots__ = ('items', 'next', 'prev')
+
+    def __init__(self, items):
+        self.items = items
+        self.next = None
+        self.prev = None
+
+
+class UnrolledLinkedList:
+    # We construct the list with head and tail set to None and block_size as the most values a block can hold
+    def __init__(self, block_size=64):
+        if block_size < 2:
+            raise ValueError('block_size must be at least 2')
+        self.block_size = block_size
+        self.head = None
+        self.tail = None
+        self.length = 0
+
+    # We link a new block holding items after our tail
+    def _append_block(self, items):
+        block = ListBlock(items)
+        if self.tail is None:
+            self.head = block
+        else:
+            self.tail.next = block
+            block.prev = self.tail
+        self.tail = block
+        return block
+
+    # We link a new block holding items before our head
+    def _prepend_block(self, items):
+        block = ListBlock(items)
+        if self.head is None:
+            self.tail = block
+        else:
+            self.head.prev = block
+            block.next = self.head
+        self.head = block
+        return block
+
+    # We unlink a block that has become empty
+    def _remove_block(self, block):
+        if block.prev is not None:
+            block.prev.next = block.next
+        else:
+            self.head = block.next
+        if block.next is not None:
+            block.next.prev = block.prev
+        else:
+            self.tail = block.prev
+
+# ------------------- Append / Prepend ------------------- #
+    # The append function adds the value to the last block, only a full last block makes us allocate a new one
+    def append(self, value):
+        tail = self.tail
+        if tail is not None and len(tail.items) < self.block_size:
+            tail.items.append(value)
+        else:
+            self._append_block([value])
+        self.length += 1
+
+    # The prepend function is the mirror image of append, working on the first block
+    def prepend(self, value):
+        head = self.head
+        if head is not None and len(head.items) < self.block_size:
+            head.items.insert(0, value)
+        else:
+            self._prepend_block([value])
+        self.length += 1
+
+    # The extend function appends many values at once: we top up the last block and cut the rest into full blocks
+    def extend(self, values):
+        values = iter(values)
+        tail = self.tail
+        if tail is not None and len(tail.items) < self.block_size:
+            room = self.block_size - len(tail.items)
+            before = len(tail.items)
+            tail.items.extend(islice(values, room))
+            self.length += len(tail.items) - before
+        while True:
+            items = list(islice(values, self.block_size))
+            if not items:
+                return
+            self._append_block(items)
+            self.length += len(items)
+
+# ------------------- Pop ------------------- #
+    # The pop function removes and returns the last value, an emptied block is unlinked right away
+    def pop(self):
+        tail = self.tail
+        if tail is None:
+            raise IndexError('pop from an empty list')
+        value = tail.items.pop()
+        if not tail.items:
+            self._remove_block(tail)
+        self.length -= 1
+        return value
+
+    # The popleft function removes and returns the first value
+    def popleft(self):
+        head = self.head
+        if head is None:
+            raise IndexError('pop from an empty list')
+        value = head.items.pop(0)
+        if not head.items:
+            self._remove_block(head)
+        self.length -= 1
+        return value
+
+# ------------------- Find / Delete ------------------- #
+    # The _find_block function returns the block holding the first occurrence of our value and its index in the block,
+    # comparing a whole block at a time with the in operator, which runs in C
+    def _find_block(self, value):
+        block = self.head
+        while block is not None:
+            if value in block.items:
+                return block, block.items.index(value)
+            block = block.next
+        return None, -1
+
+    def __contains__(self, value):
+        return self._find_block(value)[0] is not None
+
+    # The find function returns the first value in the list equal to the value we pass as an argument, or None.
+    # The values of an unrolled list have no nodes of their own we could hand out
+    def find(self, value):
+        block, index = self._find_block(value)
+        return block.items[index] if block is not None else None
+
+    # The delete_node function deletes the first occurrence of the value and returns whether there was one.
+    # A block that drops below half full is merged with the next block when both fit in one block,
+    # so deletes cannot leave a long chain of nearly empty blocks behind
+    def delete_node(self, value):
+        block, index = self._find_block(value)
+        if block is None:
+            return False
+        del block.items[index]
+        self.length -= 1
+        if not block.items:
+            self._remove_block(block)
+            return True
+        following = block.next
+        if (len(block.items) < self.block_size // 2 and following is not None
+                and len(block.items) + len(following.items) <= self.block_size):
+            block.items.extend(following.items)
+            self._remove_block(following)
+        return True
+
+# ------------------- Iterate / Print ------------------- #
+    # The iter_values function is a generator handing us every value from head to tail, a block at a time
+    def iter_values(self):
+        block = self.head
+        while block is not None:
+            yield from block.items
+            block = block.next
+
+    # The iter_blocks function hands us the list of values of every block
+    def iter_blocks(self):
+        block = self.head
+        while block is not None:
+            yield block.items
+            block = block.next
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return self.iter_values()
+
+    # Indexing skips whole blocks until it reaches the one holding the index, negative indexes count from the tail
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('list index out of range')
+        block = self.head
+        while index >= len(block.items):
+            index -= len(block.items)
+            block = block.next
+        return block.items[index]
+
+    # This function prints a neat looking list with pointers showing
+    # which value points to which, and bars between the blocks (see Representation.py)
+    def print_list(self):
+        from Representation import print_list
+        print_list(self)
+
+if __name__ == '__main__':
+    # We run the same demo as for the linked list, with tiny blocks so we can see them
+    linkedl = UnrolledLinkedList(block_size=4)
+    keys = [20, 10, 12, 13, 14, 30, 22, 21, 32, 33, 35]
+    for key in keys:
+        linkedl.append(key)
+    linkedl.prepend(5)
+    linkedl.print_list()
+    print(linkedl.find(60), linkedl.find(22))
+    print(linkedl.delete_node(14), linkedl.delete_node(14))
+    linkedl.print_list()
+    # We test the batch and pop functionality
+    linkedl.extend([40, 41, 42, 43, 44])
+    print(linkedl.popleft(), linkedl.pop())
+    linkedl.print_list()
+    print(len(linkedl), linkedl[4], linkedl[-1], 22 in linkedl)
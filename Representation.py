@@ -0,0 +1,83 @@
+# !Python 3.10
+# -------------
+# This is the opt-in representation layer of our data structures with the following functionality:
+# - Format / print a linked list (also in blocks or with every pointer)
+# - Format / print the key-value pairs of a hash map
+# - Format / print a tree traversal
+# - Print the result of a lookup
+# The structures themselves never print: their find, insert and delete functions return their results,
+# and only the print functions below (and the print methods of the structures that call them) write to stdout
+# ------------------------------- Representation implementation ------------------------------------ #
+EMPTY_LIST = 'This is an empty list'
+EMPTY_TREE = 'Tree is empty!'
+_MISSING = object()
+
+
+# ------------------- Linked lists ------------------- #
+# A neat looking list with pointers showing which value points to which
+def format_list(values):
+    values = [str(value) for value in values]
+    if not values:
+        return EMPTY_LIST
+    return ' <-> '.join(['None', *values, 'None'])
+
+
+# The same for a list stored in blocks, with bars between the blocks
+def format_blocks(blocks):
+    blocks = [' <-> '.join(str(value) for value in block) for block in blocks if block]
+    if not blocks:
+        return EMPTY_LIST
+    return f"None <-> {' | '.join(blocks)} <-> None"
+
+
+# A more detailed view with all the pointer values of every single node,
+# which can be useful to make sure that our pointers are set correctly
+def format_detail(nodes):
+    lines = [f'Current node is {node.value} The previous node is {node.prev} The next node is {node.next}'
+             for node in nodes]
+    return '\n'.join(lines) if lines else EMPTY_LIST
+
+
+def print_list(linked_list):
+    blocks = getattr(linked_list, 'iter_blocks', None)
+    print(format_blocks(blocks()) if blocks is not None else format_list(linked_list))
+
+
+def print_detail(linked_list):
+    print(format_detail(linked_list.iter_nodes()))
+
+
+# ------------------- Hash maps ------------------- #
+# Every key-value pair on a line of its own, closed by a separator line
+def format_items(items):
+    return '\n'.join([*(str((key, value)) for key, value in items), '# ----------- #'])
+
+
+def print_map(hash_map):
+    print(format_items(hash_map.items()))
+
+
+# ------------------- Trees ------------------- #
+def format_traversal(values):
+    values = [str(value) for value in values]
+    return ' '.join(values) if values else EMPTY_TREE
+
+
+# order is one of inorder, preorder or postorder, which the tree hands us as a generator
+def print_traversal(tree, order='inorder'):
+    print(format_traversal(getattr(tree, f'iter_{order}')()))
+
+
+# ------------------- Lookups ------------------- #
+# What the find functions used to print: whether the key is in the structure, and its value for a map
+def print_lookup(structure, key):
+    name = type(structure).__name__
+    if hasattr(structure, 'get'):
+        value = structure.get(key, _MISSING)
+        if value is not _MISSING:
+            print(f'{key} is in the {name} with value {value}')
+            return
+    elif key in structure:
+        print(f'{key} is in the {name}')
+        return
+    print(f'{key} is not in the {name}')
@@ -0,0 +1,525 @@
+# !Python 3.10
+# -------------
+# This is an implementation of binary snapshot files for our hash map and binary search tree with the following functionality:
+# - Dump a structure to a file
+# - Load a file as a memory-mapped, read-only view that answers lookups straight from the file
+# - Copy on write: the first insert or delete builds the real structure from the file and carries on with that
+# Several processes can map the same snapshot, the operating system then keeps a single copy of it in memory
+# ------------------------------- Snapshot implementation ------------------------------------ #
+import bisect
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from hashlib import blake2b
+
+from BinarySearchTree import BinarySearchTree
+from HashMap_LinkedList import HashMap
+
+MAP_MAGIC = b'HMSNAP02'
+TREE_MAGIC = b'BTSNAP01'
+# magic, number of slots, number of entries, length of the pickled map options that follow the header
+MAP_HEADER = struct.Struct('<8sQQQ')
+# magic, number of values
+TREE_HEADER = struct.Struct('<8sQ')
+# hash, record offset (0 for an empty slot)
+SLOT = struct.Struct('<QQ')
+# key length, value length, and whether the value holds the original key too (see dump_map)
+MAP_RECORD = struct.Struct('<IIB')
+OFFSET = struct.Struct('<Q')
+LENGTH = struct.Struct('<I')
+_MISSING = object()
+
+
+# ------------------- Encoding ------------------- #
+# Keys are stored in a canonical encoding, a type tag followed by the bytes of the key, so equal keys always have
+# equal bytes and we can compare keys in the file without decoding them. That limits keys to int, str and bytes,
+# plus the keys a hash map treats as one of those ints: booleans and floats with an integral value (True, 1.0 and 1
+# are the same key, and the record remembers which one was stored). Any other key raises a TypeError,
+# when we dump it as well as when we look it up.
+# Values (and the values of a tree, which we do decode to compare) can be anything pickle handles
+
+def encode_key(key):
+    if isinstance(key, str):
+        return b's' + key.encode('utf-8')
+    if isinstance(key, (bytes, bytearray)):
+        return b'b' + bytes(key)
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    if isinstance(key, int):
+        # Booleans are stored as the ints they are equal to, just like they share their dict slot with 0 and 1
+        return b'i' + int(key).to_bytes(key.bit_length() // 8 + 1, 'big', signed=True)
+    raise TypeError(f'snapshot keys must be int, str, bytes or an integral float, not {type(key).__name__}')
+
+
+def encode_value(value):
+    # Only values that decode back to the same type get the key encoding, a bool or a float stays what it was
+    if type(value) in (int, str, bytes):
+        return encode_key(value)
+    return b'p' + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode(data):
+    tag = data[:1]
+    if tag == b's':
+        return data[1:].decode('utf-8')
+    if tag == b'i':
+        return int.from_bytes(data[1:], 'big', signed=True)
+    if tag == b'b':
+        return bytes(data[1:])
+    return pickle.loads(data[1:])
+
+
+def key_hash(encoded):
+    # A hash that is the same in every process (unlike hash() on str), computed in C
+    return int.from_bytes(blake2b(encoded, digest_size=8).digest(), 'little')
+
+
+def _map_file(path):
+    with open(path, 'rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# ------------------- Hash map ------------------- #
+def _pickle_options(options):
+    # The options of the map (see HashMap.options) are pickled into the file. A hash function pickle cannot store
+    # (a lambda, a local function) is left out and marked as missing, load then has to be given one
+    try:
+        return pickle.dumps(options, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        options = dict(options, hash_function=None, hash_function_missing=True)
+        return pickle.dumps(options, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def dump_map(items, path, options=None):
+    """
+    The file holds a header, the pickled options of the map, an open addressing table of slots and the records
+    the slots point to: every slot has the hash of its key and the file offset of a record with the encoded key
+    and the pickled value. A key the canonical encoding would change the type of (a bool, a float, a bytearray)
+    is pickled together with the value, so iterating over the snapshot hands it back as it was.
+    The table is a power of two at most half full, probed linearly, so a lookup reads one or two slots on average.
+    """
+    records = []
+    for key, value in items:
+        encoded = encode_key(key)
+        original = type(key) not in (int, str, bytes)
+        data = pickle.dumps((key, value) if original else value, protocol=pickle.HIGHEST_PROTOCOL)
+        records.append((key_hash(encoded), encoded, original, data))
+    pickled_options = _pickle_options(options or {})
+    slot_count = 1
+    while slot_count < 2 * len(records):
+        slot_count *= 2
+
+    slots = array('Q', [0]) * (2 * slot_count)
+    table = MAP_HEADER.size + len(pickled_options)
+    offset = table + SLOT.size * slot_count
+    mask = slot_count - 1
+    for hashed, encoded, _, value in records:
+        position = hashed & mask
+        while slots[2 * position + 1] != 0:
+            position = (position + 1) & mask
+        slots[2 * position] = hashed
+        slots[2 * position + 1] = offset
+        offset += MAP_RECORD.size + len(encoded) + len(value)
+
+    with open(path, 'wb') as file:
+        file.write(MAP_HEADER.pack(MAP_MAGIC, slot_count, len(records), len(pickled_options)))
+        file.write(pickled_options)
+        file.write(_little_endian(slots))
+        for _, encoded, original, value in records:
+            file.write(MAP_RECORD.pack(len(encoded), len(value), original))
+            file.write(encoded)
+            file.write(value)
+
+
+def _little_endian(numbers):
+    # The file is little endian on every machine, so a snapshot can be copied between them
+    if sys.byteorder == 'big':
+        numbers = array(numbers.typecode, numbers)
+        numbers.byteswap()
+    return numbers.tobytes()
+
+
+class MappedHashMap:
+    """
+    A read-only view of a hash map snapshot, see dump_map for the layout of the file.
+    Lookups hash the encoded key, probe the slots in the mapped file and compare the encoded key bytes,
+    only the value that is found gets unpickled. No Node objects are built.
+    Keys are int, str or bytes (see encode_key): a bool or an integral float finds the equal int key like it does
+    in the HashMap, and a lookup with any other key type raises a TypeError.
+
+    The first write (insert, delete, h[key] = value, del h[key]) copies the snapshot into a HashMap (copy on write),
+    releases the file and from then on every call goes to that HashMap. The HashMap gets the options the map
+    was dumped with (hash function, load factors...), any map_options given here take their place.
+    """
+    def __init__(self, path, **map_options):
+        self._file = _map_file(path)
+        magic, self._slot_count, self._count, options_length = MAP_HEADER.unpack_from(self._file, 0)
+        if magic != MAP_MAGIC:
+            self._file.close()
+            raise ValueError(f'{path} is not a hash map snapshot')
+        self._table = MAP_HEADER.size + options_length
+        self.options = pickle.loads(self._file[MAP_HEADER.size:self._table])
+        self.options.update(map_options)
+        if map_options.get('hash_function') is not None:
+            self.options.pop('hash_function_missing', None)
+        self._map = None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _record(self, offset):
+        # We return the encoded key, the pickled value and whether the original key is pickled with the value
+        key_length, value_length, original = MAP_RECORD.unpack_from(self._file, offset)
+        start = offset + MAP_RECORD.size
+        return (self._file[start:start + key_length], self._file[start + key_length:start + key_length + value_length],
+                original)
+
+    def _load_value(self, data, original):
+        value = pickle.loads(data)
+        return value[1] if original else value
+
+    def _lookup(self, key):
+        # We return the pickled value of key and whether the original key is pickled with it,
+        # or None if the key is not in the snapshot.
+        # A key type the snapshot cannot hold raises a TypeError instead of passing for a miss
+        encoded = encode_key(key)
+        hashed = key_hash(encoded)
+        mask = self._slot_count - 1
+        position = hashed & mask
+        while True:
+            slot_hash, offset = SLOT.unpack_from(self._file, self._table + SLOT.size * position)
+            if offset == 0:
+                return None
+            if slot_hash == hashed:
+                record_key, value, original = self._record(offset)
+                if record_key == encoded:
+                    return value, original
+            position = (position + 1) & mask
+
+    def get(self, key, default=None):
+        if self._map is not None:
+            return self._map.get(key, default)
+        found = self._lookup(key)
+        return default if found is None else self._load_value(*found)
+
+    def find(self, key):
+        return self.get(key)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return self._map.count if self._map is not None else self._count
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def find_many(self, keys, default=None):
+        return [self.get(key, default) for key in keys]
+
+    def items(self):
+        if self._map is not None:
+            yield from self._map.items()
+            return
+        for position in range(self._slot_count):
+            offset = SLOT.unpack_from(self._file, self._table + SLOT.size * position)[1]
+            if offset != 0:
+                key, value, original = self._record(offset)
+                yield pickle.loads(value) if original else (decode(key), pickle.loads(value))
+
+    def _materialize(self):
+        # Copy on write: we build the HashMap with the options of the snapshot, fill it in one go with the batch insert
+        # and let go of the file
+        if self._map is None:
+            options = dict(self.options)
+            if options.pop('hash_function_missing', False):
+                raise ValueError('the hash function of this snapshot could not be stored, pass hash_function to load')
+            hash_map = HashMap(**options)
+            hash_map.insert_many(list(self.items()))
+            self._map = hash_map
+            self.close()
+        return self._map
+
+    def insert(self, key, value):
+        return self._materialize().insert(key, value)
+
+    def delete(self, key):
+        return self._materialize().delete(key)
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def dump(self, path):
+        options = self._map.options() if self._map is not None else self.options
+        dump_map(self.items(), path, options)
+
+
+# ------------------- Binary search tree ------------------- #
+def dump_tree(values, path):
+    """
+    The file holds a header, the file offsets of all values in sorted order, and the encoded values themselves.
+    Because the offsets are sorted by value, the i-th offset is the i-th smallest value,
+    so lookups are binary searches and all order statistics are simple index calculations.
+    """
+    encoded = [encode_value(value) for value in values]
+    offsets = array('Q', [0]) * len(encoded)
+    offset = TREE_HEADER.size + OFFSET.size * len(encoded)
+    for index, data in enumerate(encoded):
+        offsets[index] = offset
+        offset += LENGTH.size + len(data)
+
+    with open(path, 'wb') as file:
+        file.write(TREE_HEADER.pack(TREE_MAGIC, len(encoded)))
+        file.write(_little_endian(offsets))
+        for data in encoded:
+            file.write(LENGTH.pack(len(data)))
+            file.write(data)
+
+
+class _SortedValues:
+    # Lets bisect search the mapped file as if it were a sorted list, decoding only the values it looks at
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    def __len__(self):
+        return self._snapshot._count
+
+    def __getitem__(self, index):
+        return self._snapshot._value(index)
+
+
+class MappedBinarySearchTree:
+    """
+    A read-only view of a binary search tree snapshot, see dump_tree for the layout of the file.
+    It answers find, the order statistics, the traversals, the frozen batch queries and height from the mapped file,
+    without building any BinaryNode, so it can stand in for the tree it was dumped from.
+    A snapshot only keeps the sorted values, not the shape of the tree: preorder, postorder and height describe
+    the balanced tree the snapshot is rebuilt into (see from_sorted), the same tree a write turns it into.
+
+    The first insert or delete builds a tree of tree_class from the sorted values in O(n) (copy on write),
+    releases the file and from then on every call goes to that tree.
+    """
+    def __init__(self, path, tree_class=BinarySearchTree):
+        self._file = _map_file(path)
+        magic, self._count = TREE_HEADER.unpack_from(self._file, 0)
+        if magic != TREE_MAGIC:
+            self._file.close()
+            raise ValueError(f'{path} is not a binary search tree snapshot')
+        self._tree_class = tree_class
+        self._tree = None
+        self._values = _SortedValues(self)
+        self._frozen = None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _value(self, index):
+        offset = OFFSET.unpack_from(self._file, TREE_HEADER.size + OFFSET.size * index)[0]
+        length = LENGTH.unpack_from(self._file, offset)[0]
+        start = offset + LENGTH.size
+        return decode(self._file[start:start + length])
+
+    def __len__(self):
+        if self._tree is not None:
+            return self._tree._size(self._tree.root)
+        return self._count
+
+    def __contains__(self, value):
+        if self._tree is not None:
+            return value in self._tree
+        index = bisect.bisect_left(self._values, value)
+        return index < self._count and self._value(index) == value
+
+    def find(self, value):
+        # Like BinarySearchTree.find we return the value stored in the tree, or None
+        if self._tree is not None:
+            return self._tree.find(value)
+        index = bisect.bisect_left(self._values, value)
+        if index < self._count:
+            stored = self._value(index)
+            if stored == value:
+                return stored
+        return None
+
+    def __iter__(self):
+        return self.iter_inorder()
+
+    def __getitem__(self, k):
+        return self.select(k + len(self) if k < 0 else k)
+
+    def iter_inorder(self):
+        if self._tree is not None:
+            yield from self._tree.iter_inorder()
+            return
+        for index in range(self._count):
+            yield self._value(index)
+
+    def iter_preorder(self):
+        # The balanced tree puts values[middle] of every range at the root of its subtree, so we walk the ranges
+        if self._tree is not None:
+            yield from self._tree.iter_preorder()
+            return
+        stack = [(0, self._count)]
+        while stack:
+            lo, hi = stack.pop()
+            if lo < hi:
+                middle = (lo + hi) // 2
+                yield self._value(middle)
+                stack.append((middle + 1, hi))
+                stack.append((lo, middle))
+
+    def iter_postorder(self):
+        # Like iter_preorder, a range is stacked a second time (marked done) to yield its middle after both halves
+        if self._tree is not None:
+            yield from self._tree.iter_postorder()
+            return
+        stack = [(0, self._count, False)]
+        while stack:
+            lo, hi, done = stack.pop()
+            if lo >= hi:
+                continue
+            middle = (lo + hi) // 2
+            if done:
+                yield self._value(middle)
+            else:
+                stack.append((lo, hi, True))
+                stack.append((middle + 1, hi, False))
+                stack.append((lo, middle, False))
+
+    def inorder(self):
+        return list(self.iter_inorder())
+
+    def preorder(self):
+        return list(self.iter_preorder())
+
+    def postorder(self):
+        return list(self.iter_postorder())
+
+    def aiter_inorder(self, every=1024):
+        from AsyncStreaming import aiterate
+        return aiterate(self.iter_inorder(), every)
+
+    def height(self):
+        # The balanced tree of n values is as high as n has bits
+        if self._tree is not None:
+            return self._tree.height()
+        return self._count.bit_length()
+
+    def freeze(self, layout='sorted'):
+        # The frozen NumPy view is built straight from the sorted values in the file (see BinarySearchTree_Frozen.py)
+        if self._tree is not None:
+            return self._tree.freeze(layout)
+        if self._frozen is None or self._frozen.layout != layout:
+            from BinarySearchTree_Frozen import FrozenTree
+            self._frozen = FrozenTree(self.iter_inorder(), layout)
+        return self._frozen
+
+    def find_many(self, values, layout='sorted'):
+        return self.freeze(layout).find_many(values)
+
+    def rank_many(self, values, layout='sorted'):
+        return self.freeze(layout).rank_many(values)
+
+    def range_count(self, lo, hi, layout='sorted'):
+        return self.freeze(layout).range_count(lo, hi)
+
+    def range(self, lo, hi):
+        if self._tree is not None:
+            return self._tree.range(lo, hi)
+        start = bisect.bisect_left(self._values, lo)
+        end = bisect.bisect_right(self._values, hi)
+        return [self._value(index) for index in range(start, end)]
+
+    def select(self, k):
+        if self._tree is not None:
+            return self._tree.select(k)
+        if not 0 <= k < self._count:
+            raise IndexError('select index out of range')
+        return self._value(k)
+
+    def rank(self, value):
+        if self._tree is not None:
+            return self._tree.rank(value)
+        return bisect.bisect_left(self._values, value)
+
+    def floor(self, value):
+        if self._tree is not None:
+            return self._tree.floor(value)
+        index = bisect.bisect_right(self._values, value)
+        return self._value(index - 1) if index > 0 else None
+
+    def ceiling(self, value):
+        if self._tree is not None:
+            return self._tree.ceiling(value)
+        index = bisect.bisect_left(self._values, value)
+        return self._value(index) if index < self._count else None
+
+    def _materialize(self):
+        # Copy on write: the values are already sorted, so the bulk build makes a balanced tree in O(n)
+        if self._tree is None:
+            self._tree = self._tree_class.from_sorted(self.iter_inorder())
+            self.close()
+        return self._tree
+
+    def insert(self, value):
+        return self._materialize().insert(value)
+
+    def delete(self, value):
+        return self._materialize().delete(value)
+
+    def dump(self, path):
+        dump_tree(self.iter_inorder(), path)
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+
+    # We dump a small hash map and load it back as a mapped view
+    h = HashMap()
+    h.insert('Bob', '550-889')
+    h.insert('John', '510-819')
+    h.insert('Jill', '110-119')
+    folder = tempfile.mkdtemp()
+    h.dump(os.path.join(folder, 'phone_book.snapshot'))
+    mapped = HashMap.load(os.path.join(folder, 'phone_book.snapshot'))
+    print(len(mapped), mapped.get('John'), 'Albert' in mapped)
+    # The first write copies the snapshot into a real HashMap
+    mapped.insert('Albert', '120-222')
+    print(len(mapped), mapped.get('Albert'))
+
+    # The same for a binary search tree
+    bst = BinarySearchTree.from_iterable([20, 10, 30, 15, 35, 25, 9, 32, 7])
+    bst.dump(os.path.join(folder, 'keys.snapshot'))
+    mapped_tree = BinarySearchTree.load(os.path.join(folder, 'keys.snapshot'))
+    print(len(mapped_tree), 25 in mapped_tree, mapped_tree.range(10, 30), mapped_tree.select(0), mapped_tree.rank(20))
+    mapped_tree.close()
@@ -0,0 +1,41 @@
+# Per item cost of the batch functions against a loop of single calls, for both hash map engines.
+# Run from the repository root: python -m benchmarks.batch [count]
+import sys
+
+from HashMap_LinkedList import HashMap
+from HashMap_RobinHood import RobinHoodHashMap
+from benchmarks.common import best_of, random_keys, report
+
+
+def single_inserts(engine, pairs):
+    def run():
+        hash_map = engine()
+        for key, value in pairs:
+            hash_map.insert(key, value)
+    return run
+
+
+def batch_insert(engine, pairs):
+    def run():
+        engine().insert_many(pairs)
+    return run
+
+
+def batch_find(hash_map, keys):
+    def run():
+        hash_map.find_many(keys)
+    return run
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    keys = random_keys(count)
+    pairs = [(key, index) for index, key in enumerate(keys)]
+    print(f'{count:,} pairs')
+    for engine in (HashMap, RobinHoodHashMap):
+        name = engine.__name__
+        report(f'{name} insert loop', count, best_of(single_inserts(engine, pairs)))
+        report(f'{name} insert_many', count, best_of(batch_insert(engine, pairs)))
+        hash_map = engine()
+        hash_map.insert_many(pairs)
+        report(f'{name} find_many', count, best_of(batch_find(hash_map, keys)))
@@ -0,0 +1,49 @@
+# Lookup latency and memory per key of the binary search trees against the B+ tree.
+# Run from the repository root: python -m benchmarks.btree [count]
+import random
+import sys
+import time
+import tracemalloc
+
+from AVLTree import AVLTree
+from BTree import BTree
+from BinarySearchTree import BinarySearchTree
+
+
+def build(factory, keys):
+    # We measure the memory the tree holds once it is built, the keys themselves are shared by all trees
+    tracemalloc.start()
+    tree = factory()
+    for key in keys:
+        tree.insert(key)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return tree, memory
+
+
+def lookup_latency(tree, queries):
+    # floor walks a single path down the tree without printing, which makes it our lookup in every engine
+    floor = tree.floor
+    start = time.perf_counter()
+    for query in queries:
+        floor(query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(0)
+    # The plain binary search tree gets shuffled keys, sorted keys would turn it into a linked list
+    keys = list(range(count))
+    rng.shuffle(keys)
+    queries = [rng.randrange(count) for _ in range(100_000)]
+    print(f'{count:,} keys')
+    for label, factory in (
+            ('BinarySearchTree', BinarySearchTree),
+            ('AVLTree', AVLTree),
+            ('BTree order 32', lambda: BTree(order=32)),
+            ('BTree order 64', lambda: BTree(order=64)),
+            ('BTree order 128', lambda: BTree(order=128))):
+        tree, memory = build(factory, keys)
+        latency = lookup_latency(tree, queries)
+        print(f'{label:<20} {latency * 1e9:>8.0f} ns/lookup {memory / count:>8.1f} bytes/key')
@@ -0,0 +1,26 @@
+# Shared helpers for the benchmark scripts in this folder.
+# Every benchmark is run from the repository root, e.g. python -m benchmarks.hashing
+import random
+import string
+import time
+
+
+def random_keys(count, length=12, seed=0):
+    # We build reproducible random string keys, so every run times the exact same work
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits
+    return [''.join(rng.choices(alphabet, k=length)) for _ in range(count)]
+
+
+def best_of(function, repeat=3):
+    # We time the function a few times and keep the fastest run, which is the least disturbed by the rest of the system
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label, items, seconds):
+    print(f'{label:<40} {items / seconds:>14,.0f} items/s')
@@ -0,0 +1,74 @@
+# Multi-threaded stress test and throughput of the concurrent hash map against a HashMap behind one global lock.
+# Every worker inserts, reads and deletes its own keys while reading the keys of the others,
+# and at the end we check that no update was lost.
+# Run from the repository root: python -m benchmarks.concurrent [operations per worker] [max workers]
+import sys
+import threading
+import time
+
+from HashMap_Concurrent import ConcurrentHashMap
+from HashMap_LinkedList import HashMap
+
+
+class GlobalLockHashMap:
+    # The baseline: one lock around a plain HashMap, so every operation waits for every other one
+    def __init__(self):
+        self.map = HashMap()
+        self.lock = threading.Lock()
+
+    def insert(self, key, value):
+        with self.lock:
+            return self.map.insert(key, value)
+
+    def get(self, key, default=None):
+        with self.lock:
+            return self.map.get(key, default)
+
+    def delete(self, key):
+        with self.lock:
+            return self.map.delete(key)
+
+    def __len__(self):
+        return self.map.count
+
+
+def worker(hash_map, number, operations, workers, barrier):
+    barrier.wait()
+    for i in range(operations):
+        hash_map.insert((number, i), i)
+        hash_map.get(((number + 1) % workers, i))
+        # Every fourth key is deleted again, so resizes happen in both directions
+        if i % 4 == 3:
+            hash_map.delete((number, i - 1))
+
+
+def run(factory, workers, operations):
+    hash_map = factory()
+    barrier = threading.Barrier(workers + 1)
+    threads = [threading.Thread(target=worker, args=(hash_map, number, operations, workers, barrier))
+               for number in range(workers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    # Stress check: every key that was not deleted must be there with its value
+    for number in range(workers):
+        for i in range(operations):
+            expected = None if i % 4 == 2 and i + 1 < operations else i
+            assert hash_map.get((number, i)) == expected, f'lost update for {(number, i)}'
+    assert len(hash_map) == workers * (operations - operations // 4)
+    return workers * operations * 2.5 / elapsed
+
+
+if __name__ == '__main__':
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    workers = 1
+    while workers <= max_workers:
+        for label, factory in (('GlobalLockHashMap', GlobalLockHashMap), ('ConcurrentHashMap', ConcurrentHashMap)):
+            throughput = run(factory, workers, operations)
+            print(f'{label:<20} {workers:>2} workers {throughput:>14,.0f} ops/s')
+        workers *= 2
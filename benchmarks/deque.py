@@ -0,0 +1,58 @@
+# Work queue throughput of the linked list, the unrolled linked list and collections.deque:
+# append at the tail, consume at the head, an occasional prepend, and a full iteration.
+# Run from the repository root: python -m benchmarks.deque [count]
+import sys
+from collections import deque
+
+from LinkedList import LinkedList
+from LinkedList_Unrolled import UnrolledLinkedList
+from benchmarks.common import best_of, report
+
+
+def linked_list_queue(count):
+    queue = LinkedList()
+    for value in range(count):
+        queue.append(value)
+        if value % 100 == 0:
+            queue.prepend(value)
+    for _ in queue.iter_nodes():
+        pass
+    # Consuming at the head means unlinking the head node
+    while queue.head is not None:
+        queue.remove_node(queue.head)
+
+
+def unrolled_queue(count, batch):
+    queue = UnrolledLinkedList()
+    if batch:
+        queue.extend(range(count))
+    else:
+        for value in range(count):
+            queue.append(value)
+            if value % 100 == 0:
+                queue.prepend(value)
+    for _ in queue.iter_values():
+        pass
+    while queue.length:
+        queue.popleft()
+
+
+def builtin_deque(count):
+    queue = deque()
+    for value in range(count):
+        queue.append(value)
+        if value % 100 == 0:
+            queue.appendleft(value)
+    for _ in queue:
+        pass
+    while queue:
+        queue.popleft()
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    print(f'{count:,} values through each queue')
+    report('LinkedList', count, best_of(lambda: linked_list_queue(count)))
+    report('UnrolledLinkedList', count, best_of(lambda: unrolled_queue(count, False)))
+    report('UnrolledLinkedList with extend', count, best_of(lambda: unrolled_queue(count, True)))
+    report('collections.deque', count, best_of(lambda: builtin_deque(count)))
@@ -0,0 +1,31 @@
+# Keys per second of HashMap with the original exponential hash against the pluggable hash functions.
+# Run from the repository root: python -m benchmarks.hashing [count] [key length]
+import sys
+
+from HashMap_LinkedList import HashMap, fnv1a_hash, legacy_hash
+from benchmarks.common import best_of, random_keys, report
+
+
+def fill_and_read(keys, **options):
+    def run():
+        hash_map = HashMap(**options)
+        for key in keys:
+            hash_map.insert(key, key)
+        get = hash_map.get
+        for key in keys:
+            get(key)
+    return run
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    keys = random_keys(count, length)
+    print(f'{count:,} keys of length {length}, insert + lookup')
+    # Lookups go through the public get, like any caller of the map would
+    for label, options in (
+            ('legacy_hash (before)', {'hash_function': legacy_hash}),
+            ('fnv1a_hash', {'hash_function': fnv1a_hash}),
+            ('hash(), no cached hashes', {'cache_hashes': False}),
+            ('hash() (default)', {})):
+        report(label, 2 * count, best_of(fill_and_read(keys, **options)))
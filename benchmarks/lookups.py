@@ -0,0 +1,61 @@
+# Lookup throughput of the quiet query API (in, get, find returning their result) against printing every result,
+# which is what find used to do. The printed output goes to os.devnull, a terminal or a pipe only makes it slower.
+# Run from the repository root: python -m benchmarks.lookups [count]
+import contextlib
+import os
+import random
+import sys
+
+from BinarySearchTree import BinarySearchTree
+from HashMap_LinkedList import HashMap
+from LinkedList import LinkedList
+from Representation import print_lookup
+from benchmarks.common import best_of, random_keys, report
+
+
+def quiet(structure, keys):
+    def run():
+        for key in keys:
+            key in structure
+    return run
+
+
+def quiet_get(hash_map, keys):
+    def run():
+        get = hash_map.get
+        for key in keys:
+            get(key)
+    return run
+
+
+def printed(structure, keys):
+    def run():
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+            for key in keys:
+                print_lookup(structure, key)
+    return run
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    keys = random_keys(count)
+    # Half of the lookups hit and half of them miss
+    queries = keys[::2] + random_keys(count // 2, seed=1)
+
+    hash_map = HashMap()
+    hash_map.insert_many((key, index) for index, key in enumerate(keys))
+    tree = BinarySearchTree.from_iterable(keys)
+    # A linked list lookup is a linear scan, so it gets a much smaller list
+    linked_list = LinkedList()
+    for key in keys[:1_000]:
+        linked_list.append(key)
+    list_queries = random.Random(0).sample(keys[:2_000], 1_000)
+
+    print(f'{count:,} lookups')
+    report('HashMap key in map', len(queries), best_of(quiet(hash_map, queries)))
+    report('HashMap get', len(queries), best_of(quiet_get(hash_map, queries)))
+    report('HashMap printed lookup', len(queries), best_of(printed(hash_map, queries)))
+    report('BinarySearchTree value in tree', len(queries), best_of(quiet(tree, queries)))
+    report('BinarySearchTree printed lookup', len(queries), best_of(printed(tree, queries)))
+    report('LinkedList value in list', len(list_queries), best_of(quiet(linked_list, list_queries)))
+    report('LinkedList printed lookup', len(list_queries), best_of(printed(linked_list, list_queries)))
@@ -0,0 +1,71 @@
+# Bytes per element of every structure, measured with tracemalloc.
+# Run from the repository root: python -m benchmarks.memory [count ...]   (default: 1,000,000 and 10,000,000)
+# The values are created before measuring, so only the memory of the structure itself is counted.
+# The script exits with status 1 when a structure needs more bytes per element than its budget, to catch regressions.
+import sys
+import tracemalloc
+
+from AVLTree import AVLTree
+from BTree import BTree
+from BinarySearchTree import BinarySearchTree
+from HashMap_LinkedList import HashMap
+from HashMap_RobinHood import RobinHoodHashMap
+from LinkedList import LinkedList
+from LinkedList_ArrayPool import PooledLinkedList
+
+
+def fill_list(structure, values):
+    append = structure.append
+    for value in values:
+        append(value)
+    return structure
+
+
+def fill_map(structure, values):
+    structure.insert_many(zip(values, values))
+    return structure
+
+
+def fill_btree(structure, values):
+    insert = structure.insert
+    for value in values:
+        insert(value)
+    return structure
+
+
+# name: (build function, budget in bytes per element)
+# The budgets leave room for the power of two growth of the hash maps, which makes their usage jump between sizes
+STRUCTURES = {
+    'LinkedList': (lambda values: fill_list(LinkedList(), values), 64),
+    'PooledLinkedList': (lambda values: fill_list(PooledLinkedList(), values), 24),
+    'HashMap': (lambda values: fill_map(HashMap(), values), 120),
+    'RobinHoodHashMap': (lambda values: fill_map(RobinHoodHashMap(), values), 64),
+    'BinarySearchTree': (lambda values: BinarySearchTree.from_sorted(values), 72),
+    'AVLTree': (lambda values: AVLTree.from_sorted(values), 80),
+    'BTree': (lambda values: fill_btree(BTree(), values), 20),
+}
+
+
+def bytes_per_element(build, values):
+    tracemalloc.start()
+    structure = build(values)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return used / len(values)
+
+
+if __name__ == '__main__':
+    counts = [int(count) for count in sys.argv[1:]] or [1_000_000, 10_000_000]
+    over_budget = []
+    for count in counts:
+        values = list(range(count))
+        print(f'{count:,} elements')
+        for name, (build, budget) in STRUCTURES.items():
+            used = bytes_per_element(build, values)
+            flag = '' if used <= budget else f'  over budget of {budget}'
+            print(f'  {name:<20} {used:>8.1f} bytes/element{flag}')
+            if flag:
+                over_budget.append((name, count))
+        del values
+    sys.exit(1 if over_budget else 0)
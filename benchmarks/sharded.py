@@ -0,0 +1,45 @@
+# Bulk insert and lookup throughput of the process sharded hash map for 1, 2, 4... shards, against a single HashMap.
+# Run from the repository root: python -m benchmarks.sharded [count] [max shards]   (default max: the number of cores)
+# The batches are sent in chunks, like a nightly job streaming its keys would. Throughput can only grow with the shards
+# up to the number of cores, and the parent process still hashes and routes every key, which caps the speedup.
+import os
+import sys
+import time
+
+from HashMap_LinkedList import HashMap
+from HashMap_Sharded import ShardedHashMap
+
+CHUNK = 100_000
+
+
+def chunks(values):
+    for start in range(0, len(values), CHUNK):
+        yield values[start:start + CHUNK]
+
+
+def timed(function, values):
+    start = time.perf_counter()
+    for chunk in chunks(values):
+        function(chunk)
+    return len(values) / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    max_shards = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    keys = list(range(count))
+    pairs = [(key, key) for key in keys]
+    print(f'{count:,} keys, {os.cpu_count()} cores')
+
+    single = HashMap()
+    inserts = timed(single.insert_many, pairs)
+    lookups = timed(single.find_many, keys)
+    print(f"{'HashMap':<24} insert_many {inserts:>12,.0f}/s  find_many {lookups:>12,.0f}/s")
+    shards = 1
+    while shards <= max_shards:
+        with ShardedHashMap(shards=shards) as sharded:
+            inserts = timed(sharded.insert_many, pairs)
+            lookups = timed(sharded.find_many, keys)
+            assert len(sharded) == count
+        print(f"{f'ShardedHashMap {shards} shards':<24} insert_many {inserts:>12,.0f}/s  find_many {lookups:>12,.0f}/s")
+        shards *= 2
@@ -0,0 +1,321 @@
+# The benchmark suite: every structure against every workload at every size, with machine-readable results.
+# Run from the repository root:
+#   python -m benchmarks.suite                                   (sizes 1k, 10k and 100k)
+#   python -m benchmarks.suite --sizes 1000,10000000 --output results.json
+#   python -m benchmarks.suite --baseline results.json           (exits with status 1 on a regression)
+# For every structure, workload and size we measure:
+# - build: values inserted per second while building the structure from the workload's keys
+# - operations: operations per second over the workload's operation mix, and their p50/p99 latency
+# - peak memory: the peak bytes allocated while building, measured with tracemalloc in a separate build
+# All random data comes from fixed seeds, so two runs time exactly the same work.
+import argparse
+import bisect
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from BinarySearchTree import BinarySearchTree
+from HashMap_LinkedList import HashMap
+from LinkedList import LinkedList
+
+SEED = 0
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+# Throughput has to drop, or latency and memory grow, by more than this fraction to count as a regression
+DEFAULT_TOLERANCE = 0.2
+HIGHER_IS_BETTER = ('build_per_s', 'ops_per_s')
+LOWER_IS_BETTER = ('p50_ns', 'p99_ns', 'peak_bytes')
+
+
+# ------------------- Workloads ------------------- #
+# A workload hands us the keys to build the structure from, in the order they are inserted,
+# and a list of operations: ('read', key), ('insert', key) or ('delete', key)
+
+def distinct_keys(count, rng):
+    # count different integers spread over a range ten times as big, in random order
+    return rng.sample(range(10 * count), count)
+
+
+def zipf_sampler(population, exponent, rng):
+    # The i-th value of population is drawn with a weight of 1 / i ** exponent, a few hot keys take most of the draws
+    cumulative = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, len(population) + 1)))
+    total = cumulative[-1]
+    return lambda: population[bisect.bisect_left(cumulative, rng.random() * total)]
+
+
+def reads(keys, count, rng):
+    # Half of the reads look for a key we stored, the other half most likely miss
+    return [('read', rng.choice(keys) if rng.random() < 0.5 else rng.randrange(10 * len(keys))) for _ in range(count)]
+
+
+def uniform(size, operations, rng):
+    keys = distinct_keys(size, rng)
+    return keys, reads(keys, operations, rng)
+
+
+def zipfian(size, operations, rng):
+    keys = distinct_keys(size, rng)
+    draw = zipf_sampler(keys, 1.1, rng)
+    return keys, [('read', draw()) for _ in range(operations)]
+
+
+def adversarial(size, operations, rng):
+    # Keys inserted in ascending order: the worst case of an unbalanced binary search tree
+    keys = sorted(distinct_keys(size, rng))
+    return keys, reads(keys, operations, rng)
+
+
+def mixed(read_fraction):
+    # Reads of stored keys mixed with writes, which insert a new key or delete a stored one
+    def workload(size, operations, rng):
+        keys = distinct_keys(size, rng)
+        stored = list(keys)
+        used = set(keys)
+        ops = []
+        for _ in range(operations):
+            if rng.random() < read_fraction:
+                ops.append(('read', rng.choice(stored)))
+            elif rng.random() < 0.5 or len(stored) < 2:
+                # New keys are random too, ascending ones would unbalance the tree like the sorted workload
+                key = rng.randrange(20 * size)
+                while key in used:
+                    key = rng.randrange(20 * size)
+                used.add(key)
+                stored.append(key)
+                ops.append(('insert', key))
+            else:
+                index = rng.randrange(len(stored))
+                stored[index], stored[-1] = stored[-1], stored[index]
+                ops.append(('delete', stored.pop()))
+        return keys, ops
+    return workload
+
+
+WORKLOADS = {
+    'uniform': uniform,
+    'zipf': zipfian,
+    'sorted': adversarial,
+    'mixed-90-10': mixed(0.9),
+    'mixed-50-50': mixed(0.5),
+}
+
+
+# ------------------- Structures ------------------- #
+# Every structure gets a build function and the function for each kind of operation
+
+def build_list(keys):
+    linked_list = LinkedList()
+    append = linked_list.append
+    for key in keys:
+        append(key)
+    return linked_list
+
+
+def build_map(keys):
+    hash_map = HashMap()
+    insert = hash_map.insert
+    for key in keys:
+        insert(key, key)
+    return hash_map
+
+
+def build_tree(keys):
+    tree = BinarySearchTree()
+    insert = tree.insert
+    for key in keys:
+        insert(key)
+    return tree
+
+
+STRUCTURES = {
+    'LinkedList': {
+        'build': build_list,
+        'read': lambda structure: structure.__contains__,
+        'insert': lambda structure: structure.append,
+        'delete': lambda structure: structure.delete_node,
+    },
+    'HashMap': {
+        'build': build_map,
+        'read': lambda structure: structure.get,
+        'insert': lambda structure: lambda key: structure.insert(key, key),
+        'delete': lambda structure: structure.delete,
+    },
+    'BinarySearchTree': {
+        'build': build_tree,
+        'read': lambda structure: structure.__contains__,
+        'insert': lambda structure: structure.insert,
+        'delete': lambda structure: structure.delete,
+    },
+}
+
+# Combinations that take quadratic time are only run up to a size: every linked list lookup is a linear scan,
+# and sorted keys turn the binary search tree into one
+MAX_SIZES = {
+    ('LinkedList', None): 10_000,
+    ('BinarySearchTree', 'sorted'): 10_000,
+}
+
+
+def max_size(structure, workload):
+    return MAX_SIZES.get((structure, workload), MAX_SIZES.get((structure, None)))
+
+
+# ------------------- Measurements ------------------- #
+def bind(structure_name, built, ops):
+    # We turn every operation into a bound function and its argument up front, so the timed loops only make calls
+    adapters = STRUCTURES[structure_name]
+    functions = {kind: adapters[kind](built) for kind in ('read', 'insert', 'delete')}
+    return [(functions[kind], key) for kind, key in ops]
+
+
+def measure(structure_name, workload_name, size, operations, memory):
+    rng = random.Random(f'{SEED}-{workload_name}-{size}')
+    keys, ops = WORKLOADS[workload_name](size, operations, rng)
+    build = STRUCTURES[structure_name]['build']
+
+    start = time.perf_counter()
+    built = build(keys)
+    build_seconds = time.perf_counter() - start
+
+    # Throughput: the whole operation mix in one loop
+    calls = bind(structure_name, built, ops)
+    start = time.perf_counter()
+    for function, key in calls:
+        function(key)
+    ops_seconds = time.perf_counter() - start
+
+    # Latency: the same mix on a fresh structure, timing every operation on its own
+    calls = bind(structure_name, build(keys), ops)
+    clock = time.perf_counter_ns
+    latencies = []
+    for function, key in calls:
+        begin = clock()
+        function(key)
+        latencies.append(clock() - begin)
+    latencies.sort()
+
+    result = {
+        'structure': structure_name,
+        'workload': workload_name,
+        'size': size,
+        'operations': len(ops),
+        'build_per_s': size / build_seconds if build_seconds else None,
+        'ops_per_s': len(ops) / ops_seconds if ops_seconds else None,
+        'p50_ns': latencies[len(latencies) // 2] if latencies else None,
+        'p99_ns': latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] if latencies else None,
+        'peak_bytes': None,
+    }
+    if memory:
+        del built, calls
+        tracemalloc.start()
+        built = build(keys)
+        result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run(structures, workloads, sizes, operations, memory):
+    results = []
+    for size in sizes:
+        for workload in workloads:
+            for structure in structures:
+                limit = max_size(structure, workload)
+                if limit is not None and size > limit:
+                    results.append({'structure': structure, 'workload': workload, 'size': size,
+                                    'skipped': f'quadratic, only run up to {limit:,}'})
+                    continue
+                result = measure(structure, workload, size, min(operations, max(size, 1_000)), memory)
+                results.append(result)
+                print(f"{structure:<18} {workload:<12} {size:>10,} "
+                      f"build {result['build_per_s']:>12,.0f}/s  ops {result['ops_per_s']:>12,.0f}/s  "
+                      f"p50 {result['p50_ns']:>7,} ns  p99 {result['p99_ns']:>8,} ns"
+                      + (f"  peak {result['peak_bytes'] / size:>7.1f} B/elem" if memory else ''))
+    return results
+
+
+# ------------------- Baseline comparison ------------------- #
+def comparison_key(entry):
+    # Two results are only comparable when they timed the same work, so the operation count is part of the key
+    return entry['structure'], entry['workload'], entry['size'], entry.get('operations')
+
+
+def unmatched(results, baseline):
+    # The measured results the baseline has no counterpart for, e.g. because it was run with other --operations
+    previous = {comparison_key(entry) for entry in baseline['results']}
+    return [entry for entry in results if 'skipped' not in entry and comparison_key(entry) not in previous]
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    # We return a line for every metric that got worse than the baseline by more than tolerance
+    previous = {comparison_key(entry): entry for entry in baseline['results']}
+    regressions = []
+    for entry in results:
+        old = previous.get(comparison_key(entry))
+        if old is None or 'skipped' in entry or 'skipped' in old:
+            continue
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            now, before = entry.get(metric), old.get(metric)
+            if not now or not before:
+                continue
+            change = now / before - 1
+            if (metric in HIGHER_IS_BETTER and change < -tolerance) or (metric in LOWER_IS_BETTER and change > tolerance):
+                regressions.append(f"{entry['structure']} {entry['workload']} {entry['size']:,} {metric}: "
+                                   f"{before:,.0f} -> {now:,.0f} ({change:+.0%})")
+    return regressions
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+    }
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description='Benchmark every structure against every workload and size.')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma separated numbers of elements, e.g. 1000,10000000')
+    parser.add_argument('--structures', default=','.join(STRUCTURES), help='comma separated structure names')
+    parser.add_argument('--workloads', default=','.join(WORKLOADS), help='comma separated workload names')
+    parser.add_argument('--operations', type=int, default=100_000, help='operations per measurement (at most)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc build, which is slow')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare against the results in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='fraction a metric may get worse before it counts as a regression')
+    arguments = parser.parse_args(argv)
+    for name, known in (('structures', STRUCTURES), ('workloads', WORKLOADS)):
+        unknown = set(getattr(arguments, name).split(',')) - set(known)
+        if unknown:
+            parser.error(f"unknown {name}: {', '.join(sorted(unknown))}")
+    return arguments
+
+
+if __name__ == '__main__':
+    arguments = parse_arguments(sys.argv[1:])
+    results = run(arguments.structures.split(','), arguments.workloads.split(','),
+                  [int(size) for size in arguments.sizes.split(',')], arguments.operations, not arguments.no_memory)
+    report = {'environment': environment(), 'seed': SEED, 'results': results}
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, arguments.tolerance)
+        missing = unmatched(results, baseline)
+        measured = sum(1 for entry in results if 'skipped' not in entry)
+        if missing:
+            print(f'Not compared: {len(missing)} of {measured} results have no baseline result '
+                  f'with the same structure, workload, size and operations')
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+        if len(missing) < measured:
+            print('No regressions against the baseline')
@@ -0,0 +1,5 @@
+# The structures are top-level modules of the repository, we make them importable from the tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
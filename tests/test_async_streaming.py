@@ -0,0 +1,44 @@
+# Filling a structure from an async source must never hold the event loop for longer than one batch takes
+import asyncio
+import gc
+import statistics
+import time
+
+import pytest
+
+from HashMap_LinkedList import HashMap
+
+
+@pytest.fixture
+def no_gc():
+    # A full collection of the garbage collector can land in any batch, we time our own code only
+    gc.disable()
+    yield
+    gc.enable()
+
+
+def test_event_loop_turns_while_the_map_resizes(no_gc):
+    hash_map = HashMap()
+    hash_map.insert_many((key, key) for key in range(300_000))
+
+    async def source():
+        for key in range(300_000, 600_000):
+            yield key, key
+
+    async def main():
+        ticks = []
+        filling = asyncio.ensure_future(hash_map.ainsert_many(source()))
+        # Between two ticks the event loop ran whatever else was ready: at most one batch of the filling
+        while not filling.done():
+            ticks.append((time.perf_counter(), hash_map.rehashing))
+            await asyncio.sleep(0)
+        return await filling, ticks
+
+    count, ticks = asyncio.run(main())
+    assert count == 300_000 and len(hash_map) == 600_000
+    # The map doubled while we were filling it, and the resize was spread over many batches
+    resizing = [rehashing for _, rehashing in ticks]
+    assert sum(resizing) > 10
+    gaps = [later - earlier for (earlier, _), (later, _) in zip(ticks, ticks[1:])]
+    # Copying the whole table in one batch takes a few hundred batches worth of time at this size
+    assert max(gaps) < 25 * statistics.median(gaps)
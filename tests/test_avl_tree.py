@@ -0,0 +1,55 @@
+# Sorted input: the case that degenerates a plain binary search tree into a linked list
+import math
+
+from AVLTree import AVLTree
+
+COUNT = 4_097
+
+
+def check_invariants(tree):
+    # We walk the whole tree without recursion and check in every node the stored height and size against its
+    # children, the AVL balance (children heights differ by at most one) and the search order.
+    # We return the number of nodes we saw
+    seen = 0
+    stack = [(tree.root, None, None)]
+    while stack:
+        node, low, high = stack.pop()
+        if node is None:
+            continue
+        seen += 1
+        left_height = AVLTree._height(node.left)
+        right_height = AVLTree._height(node.right)
+        assert abs(left_height - right_height) <= 1, f'unbalanced at {node.value}'
+        assert node.height == 1 + max(left_height, right_height), f'wrong height at {node.value}'
+        assert node.size == 1 + AVLTree._size(node.left) + AVLTree._size(node.right), f'wrong size at {node.value}'
+        assert low is None or node.value > low
+        assert high is None or node.value < high
+        stack.append((node.left, low, node.value))
+        stack.append((node.right, node.value, high))
+    return seen
+
+
+def assert_logarithmic(tree, count):
+    # An AVL tree of n nodes is at most about 1.44 * log2(n + 2) levels high
+    assert tree.height() <= 1.4405 * math.log2(count + 2)
+
+
+def test_sorted_inserts_stay_balanced():
+    tree = AVLTree()
+    insert = tree.insert
+    for key in range(COUNT):
+        insert(key)
+    assert check_invariants(tree) == COUNT
+    assert len(tree) == COUNT
+    assert_logarithmic(tree, COUNT)
+
+    # Deleting every third key, again in sorted order, has to keep the tree just as balanced
+    deleted = range(0, COUNT, 3)
+    for key in deleted:
+        assert tree.delete(key)
+    remaining = COUNT - len(deleted)
+    assert check_invariants(tree) == remaining
+    assert len(tree) == remaining
+    assert_logarithmic(tree, remaining)
+    assert tree.find(3) is None and tree.find(4) == 4
+    assert tree.select(0) == 1 and tree.rank(COUNT - 1) == remaining - 1
@@ -0,0 +1,130 @@
+# Every eviction policy checked against a plain reference model, and the limits and expiry on their own
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import Cache as cache_module
+from Cache import Cache
+
+
+class ReferenceCache:
+    # The same rules as Cache, with a dict of (uses, last use) per key: LRU evicts the oldest last use,
+    # LFU the fewest uses and among those the oldest last use
+    def __init__(self, capacity, max_bytes, policy):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.entries = {}
+        self.clock = 0
+
+    def _use(self, key, uses):
+        self.clock += 1
+        self.entries[key][1:] = [uses, self.clock]
+
+    def _bytes(self):
+        return sum(size for size, _, _ in self.entries.values())
+
+    def _over(self, extra_count, extra_bytes):
+        return ((self.capacity is not None and len(self.entries) + extra_count > self.capacity) or
+                (self.max_bytes is not None and self._bytes() + extra_bytes > self.max_bytes))
+
+    def _evict(self):
+        if self.policy == 'lru':
+            victim = min(self.entries, key=lambda key: self.entries[key][2])
+        else:
+            victim = min(self.entries, key=lambda key: self.entries[key][1:])
+        del self.entries[victim]
+
+    def get(self, key):
+        if key not in self.entries:
+            return None
+        self._use(key, self.entries[key][1] + 1)
+        return key
+
+    def put(self, key, size):
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.entries.pop(key, None)
+            return
+        if key in self.entries:
+            self.entries[key][0] = size
+            self._use(key, self.entries[key][1] + 1)
+        else:
+            while self.entries and self._over(1, size):
+                self._evict()
+            self.entries[key] = [size, 0, 0]
+            self._use(key, 1)
+        while self._over(0, 0):
+            self._evict()
+
+
+@pytest.mark.parametrize('policy', ['lru', 'lfu'])
+@pytest.mark.parametrize('capacity, max_bytes', [(8, None), (None, 40), (6, 30)])
+def test_against_reference(policy, capacity, max_bytes):
+    rng = random.Random(f'{policy}-{capacity}-{max_bytes}')
+    # Values are their own size in bytes
+    cache = Cache(capacity=capacity, max_bytes=max_bytes, policy=policy, sizeof=lambda key, value: value)
+    reference = ReferenceCache(capacity, max_bytes, policy)
+    for _ in range(5_000):
+        key = rng.randrange(20)
+        choice = rng.random()
+        if choice < 0.5:
+            value = cache.get(key)
+            expected = reference.get(key)
+            assert (value is None) == (expected is None)
+        elif choice < 0.95:
+            size = rng.randrange(1, 12)
+            cache.put(key, size)
+            reference.put(key, size)
+        else:
+            assert cache.delete(key) == (reference.entries.pop(key, None) is not None)
+        assert {key for key in range(20) if key in cache} == set(reference.entries)
+        assert len(cache) == len(reference.entries)
+        if max_bytes is not None:
+            assert cache.bytes == reference._bytes()
+
+
+@pytest.mark.parametrize('policy', ['lru', 'lfu'])
+def test_capacity_zero_caches_nothing(policy):
+    cache = Cache(capacity=0, policy=policy)
+    cache.put('a', 1)
+    assert 'a' not in cache and len(cache) == 0
+    assert cache.get('a') is None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_limit():
+    cache = Cache(max_bytes=10, sizeof=lambda key, value: len(value))
+    cache.put('a', 'xxxx')
+    cache.put('b', 'xxxx')
+    # Growing an entry in place evicts the least recently used other entries
+    cache.put('b', 'xxxxxxxx')
+    assert 'a' not in cache and cache.bytes == 8
+    # An entry bigger than the whole limit is not cached, and its older value goes too
+    cache.put('b', 'x' * 11)
+    assert 'b' not in cache and cache.bytes == 0
+
+
+@pytest.mark.parametrize('policy', ['lru', 'lfu'])
+def test_time_to_live(monkeypatch, policy):
+    clock = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=lambda: clock.now))
+    cache = Cache(capacity=10, policy=policy, ttl=5)
+    cache.put('default', 1)
+    cache.put('short', 2, ttl=1)
+    cache.put('long', 3, ttl=60)
+    clock.now += 2
+    assert 'short' not in cache
+    assert cache.get('short') is None and cache.stats()['expirations'] == 1
+    assert cache.get('default') == 1
+    clock.now += 4
+    assert cache.expire() == 1
+    assert len(cache) == 1 and cache.get('long') == 3
+    assert cache.stats()['expirations'] == 2
+
+
+def test_limits_are_required():
+    with pytest.raises(ValueError):
+        Cache()
+    with pytest.raises(ValueError):
+        Cache(capacity=1, policy='fifo')
@@ -0,0 +1,97 @@
+# Writers and readers on threads at the same time, checked against what every writer did on its own
+import random
+import sys
+import threading
+
+import pytest
+
+from HashMap_Concurrent import ConcurrentHashMap
+
+WRITERS = 4
+READERS = 4
+KEYS_PER_WRITER = 2_000
+
+
+@pytest.fixture
+def fast_switching():
+    # We let the threads take turns far more often than usual, so operations interleave at many more places
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_mixed_writers_and_readers(fast_switching):
+    # A small starting size makes every stripe resize many times while the threads run
+    concurrent_map = ConcurrentHashMap(stripes=4, size=2)
+    references = [{} for _ in range(WRITERS)]
+    errors = []
+    done = threading.Event()
+
+    def writer(number):
+        # Every writer owns the keys (number, i), so its reference is exactly what the map must hold for them
+        rng = random.Random(number)
+        reference = references[number]
+        try:
+            for step in range(6_000):
+                key = (number, rng.randrange(KEYS_PER_WRITER))
+                choice = rng.random()
+                if choice < 0.5:
+                    assert concurrent_map.insert(key, (key, step)) == (key not in reference)
+                    reference[key] = (key, step)
+                elif choice < 0.7:
+                    assert concurrent_map.delete(key) == (reference.pop(key, None) is not None)
+                elif choice < 0.8:
+                    keys = [(number, rng.randrange(KEYS_PER_WRITER)) for _ in range(50)]
+                    batch = [(key, (key, step)) for key in keys]
+                    concurrent_map.insert_many(batch)
+                    reference.update(batch)
+                elif choice < 0.9:
+                    keys = [(number, rng.randrange(KEYS_PER_WRITER)) for _ in range(50)]
+                    deleted = concurrent_map.delete_many(keys)
+                    for key, was_deleted in zip(keys, deleted):
+                        # A key can appear twice in a batch, only its first delete finds it
+                        assert was_deleted == (reference.pop(key, None) is not None)
+                else:
+                    assert concurrent_map.get(key) == reference.get(key)
+        except Exception as error:
+            errors.append(error)
+
+    def reader(number):
+        # Readers only ever see a value a writer stored for that very key, or nothing
+        rng = random.Random(100 + number)
+        try:
+            while not done.is_set():
+                key = (rng.randrange(WRITERS), rng.randrange(KEYS_PER_WRITER))
+                for value in (concurrent_map.get(key), concurrent_map.find_many([key])[0]):
+                    assert value is None or value[0] == key
+        except Exception as error:
+            errors.append(error)
+
+    writers = [threading.Thread(target=writer, args=(number,)) for number in range(WRITERS)]
+    readers = [threading.Thread(target=reader, args=(number,)) for number in range(READERS)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    assert not errors, errors
+    expected = {key: value for reference in references for key, value in reference.items()}
+    assert dict(concurrent_map.items()) == expected
+    assert len(concurrent_map) == len(expected)
+
+
+def test_batch_insert_keeps_the_resize_incremental():
+    # A batch holds its stripe lock, so it has to move only a bounded number of buckets like a single insert
+    concurrent_map = ConcurrentHashMap(stripes=1)
+    stripe_map = concurrent_map._stripes[0].map
+    key = 0
+    while not (stripe_map.rehashing and stripe_map.count > 50_000):
+        concurrent_map.insert(key, key)
+        key += 1
+    concurrent_map.insert_many([(-1, -1), (-2, -2)])
+    assert stripe_map.rehashing
+    assert concurrent_map[-1] == -1 and concurrent_map.get(key - 1) == key - 1
@@ -0,0 +1,33 @@
+# Batch queries of the frozen view: single numbers have to work like they do for range_count
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from BinarySearchTree import BinarySearchTree
+from BinarySearchTree_Frozen import LAYOUTS, FrozenTree
+
+KEYS = [20, 10, 30, 15, 35, 25, 9, 32, 7]
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_scalar_queries(layout):
+    frozen = BinarySearchTree.from_iterable(KEYS).freeze(layout)
+    assert frozen.find_many(9)
+    assert not frozen.find_many(33)
+    assert not frozen.find_many(100)
+    assert frozen.rank_many(9) == 1
+    assert frozen.range_count(0, 100) == len(KEYS)
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_array_queries(layout):
+    frozen = BinarySearchTree.from_iterable(KEYS).freeze(layout)
+    queries = [9, 33, 35, 100, 0]
+    assert frozen.find_many(queries).tolist() == [query in KEYS for query in queries]
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_empty_tree(layout):
+    frozen = FrozenTree([], layout)
+    assert not frozen.find_many(3)
+    assert frozen.find_many([1, 2]).tolist() == [False, False]
@@ -0,0 +1,101 @@
+# The incremental resize: every operation has to give the right answer while buckets are still being moved
+import random
+
+from HashMap_LinkedList import HashMap
+
+
+def check_against(hash_map, reference):
+    assert len(hash_map) == len(reference)
+    assert dict(hash_map.items()) == reference
+
+
+def test_mixed_operations_during_grow_and_shrink():
+    rng = random.Random(1)
+    hash_map = HashMap()
+    reference = {}
+    seen_grow = seen_shrink = False
+    # First mostly inserts, so the map grows, then mostly deletes, so it shrinks
+    for phase, insert_share in (('grow', 0.8), ('shrink', 0.15)):
+        for _ in range(20_000):
+            size_before = hash_map._new_size if hash_map.rehashing else None
+            key = rng.randrange(5_000 if phase == 'shrink' else 50_000)
+            choice = rng.random()
+            if choice < insert_share:
+                assert hash_map.insert(key, -key) == (key not in reference)
+                reference[key] = -key
+            elif choice < insert_share + (1 - insert_share) / 2:
+                assert hash_map.delete(key) == (reference.pop(key, None) is not None)
+            else:
+                assert hash_map.get(key, 'missing') == reference.get(key, 'missing')
+                assert (key in hash_map) == (key in reference)
+            if size_before is not None:
+                seen_grow |= size_before > hash_map.size
+                seen_shrink |= size_before < hash_map.size
+        check_against(hash_map, reference)
+        # Clear most keys between the phases, so the deletes of the second phase take the map below min_load_factor
+        if phase == 'grow':
+            for key in list(reference)[:len(reference) - 500]:
+                assert hash_map.delete(key)
+                del reference[key]
+    assert seen_grow and seen_shrink
+    check_against(hash_map, reference)
+
+
+def test_batches_during_a_resize():
+    hash_map = HashMap(rehash_step=1)
+    reference = {}
+    for key in range(10_000):
+        hash_map.insert(key, key)
+        reference[key] = key
+        if hash_map.rehashing and key > 5_000:
+            break
+    assert hash_map.rehashing
+    keys = list(range(0, 12_000, 7))
+    assert hash_map.find_many(keys, 'missing') == [reference.get(key, 'missing') for key in keys]
+    deleted = hash_map.delete_many(keys)
+    assert deleted == [key in reference for key in keys]
+    for key in keys:
+        reference.pop(key, None)
+    hash_map.insert_many((key, str(key)) for key in range(9_000, 11_000))
+    reference.update((key, str(key)) for key in range(9_000, 11_000))
+    check_against(hash_map, reference)
+
+
+def test_deletes_shrink_all_the_way_down():
+    hash_map = HashMap()
+    for key in range(200_000):
+        hash_map.insert(key, key)
+    for key in range(200_000):
+        hash_map.delete(key)
+    # Reads alone carry the shrink to the end, every one of them visits up to ten empty old buckets
+    reads = 0
+    while hash_map.rehashing:
+        hash_map.get(0)
+        reads += 1
+    assert reads < 50_000
+    assert not hash_map.rehashing
+    assert hash_map.size == 12
+    hash_map.insert(1, 1)
+    assert hash_map[1] == 1 and len(hash_map) == 1
+
+
+def test_batches_and_reserve_advance_a_resize_incrementally():
+    hash_map = HashMap()
+    key = 0
+    while not (hash_map.rehashing and hash_map.count > 50_000):
+        hash_map.insert(key, key)
+        key += 1
+    left = hash_map.size - hash_map._rehash_index
+    # A batch of n keys moves at most n * rehash_step old buckets (passing up to ten empty ones each), like n single calls
+    assert hash_map.find_many([1]) == [1]
+    assert hash_map.delete_many([2]) == [True]
+    assert hash_map.rehashing and hash_map.size - hash_map._rehash_index >= left - 2 * 11
+    hash_map.insert_many([(-1, -1)])
+    assert hash_map.rehashing and hash_map[-1] == -1
+    # reserve during a resize only takes note, the bigger resize starts once the current one is done
+    hash_map.reserve(1_000_000)
+    assert hash_map.rehashing
+    while hash_map.rehashing and hash_map._new_size < 1_000_000:
+        hash_map.get(0)
+    assert hash_map._new_size * hash_map.max_load_factor >= 1_000_000
+    assert hash_map.find_many(range(key), 'missing') == [value if value != 2 else 'missing' for value in range(key)]
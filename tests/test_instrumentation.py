@@ -0,0 +1,36 @@
+# Every call is recorded once, under the operation the caller used
+import pytest
+
+from HashMap_LinkedList import HashMap
+from HashMap_RobinHood import RobinHoodHashMap
+from Instrumentation import instrument
+
+
+@pytest.mark.parametrize('map_class', [HashMap, RobinHoodHashMap])
+def test_nested_calls_are_recorded_once(map_class):
+    hash_map = map_class()
+    for key in range(20):
+        hash_map.insert(key, key)
+    # We count the probe length walks through the hook instrument picks up
+    probed = []
+    probe_length = hash_map._probe_length
+    hash_map._probe_length = lambda key: probed.append(key) or probe_length(key)
+    metrics = instrument(hash_map)
+    for key in range(10):
+        hash_map.find(key)
+    operations = metrics.snapshot()['operations']
+    assert operations['find']['latency_ns']['count'] == 10
+    assert operations['find']['probe_length']['count'] == 10
+    assert len(probed) == 10
+    # Operations that were never called are left out
+    assert set(operations) == {'find'}
+
+
+def test_reset_and_later_calls():
+    hash_map = HashMap()
+    metrics = instrument(hash_map)
+    hash_map.insert('a', 1)
+    metrics.reset()
+    assert metrics.snapshot()['operations'] == {}
+    hash_map.get('a')
+    assert set(metrics.snapshot()['operations']) == {'get'}
@@ -0,0 +1,99 @@
+# Removing by handle and the value index: the list has to behave the same with or without index
+import random
+
+import pytest
+
+from LinkedList import LinkedList
+
+
+@pytest.mark.parametrize('index', [False, True])
+def test_remove_same_node_twice(index):
+    linked_list = LinkedList(index=index)
+    first = linked_list.append(1)
+    linked_list.append(2)
+    assert linked_list.remove_node(first) == 1
+    with pytest.raises(ValueError):
+        linked_list.remove_node(first)
+    assert list(linked_list) == [2]
+    assert len(linked_list) == 1
+    assert linked_list.head is linked_list.tail
+    assert linked_list.find(2) is linked_list.head
+
+
+@pytest.mark.parametrize('index', [False, True])
+def test_remove_last_node_twice(index):
+    linked_list = LinkedList(index=index)
+    only = linked_list.append('a')
+    linked_list.remove_node(only)
+    with pytest.raises(ValueError):
+        linked_list.remove_node(only)
+    assert list(linked_list) == [] and len(linked_list) == 0
+    # The list is still usable afterwards
+    linked_list.append('b')
+    assert list(linked_list) == ['b'] and len(linked_list) == 1
+
+
+def test_indexed_and_plain_lists_find_the_same_duplicate():
+    lists = [LinkedList(), LinkedList(index=True)]
+    for linked_list in lists:
+        linked_list.append(1)
+        linked_list.append(2)
+        linked_list.prepend(2)
+        linked_list.delete_node(2)
+    assert [list(linked_list) for linked_list in lists] == [[1, 2], [1, 2]]
+
+
+def test_index_follows_list_order():
+    # A reference without index against an indexed list, through every way a node can be placed
+    rng = random.Random(7)
+    plain, indexed = LinkedList(), LinkedList(index=True)
+    plain_nodes, indexed_nodes = [], []
+    for _ in range(2_000):
+        choice = rng.random()
+        value = rng.randrange(4)
+        if choice < 0.25:
+            plain_nodes.append(plain.append(value))
+            indexed_nodes.append(indexed.append(value))
+        elif choice < 0.45:
+            plain_nodes.append(plain.prepend(value))
+            indexed_nodes.append(indexed.prepend(value))
+        elif choice < 0.6 and plain_nodes:
+            position = rng.randrange(len(plain_nodes))
+            plain_nodes.append(plain.insert_after(plain_nodes[position], value))
+            indexed_nodes.append(indexed.insert_after(indexed_nodes[position], value))
+        elif choice < 0.75 and plain_nodes:
+            position = rng.randrange(len(plain_nodes))
+            plain.move_to_front(plain_nodes[position])
+            indexed.move_to_front(indexed_nodes[position])
+        else:
+            plain_node, indexed_node = plain.find(value), indexed.find(value)
+            assert (plain_node is None) == (indexed_node is None)
+            if plain_node is not None:
+                position = plain_nodes.index(plain_node)
+                assert indexed_nodes[position] is indexed_node
+                plain.remove_node(plain_node)
+                indexed.remove_node(indexed_node)
+                del plain_nodes[position], indexed_nodes[position]
+        assert list(plain) == list(indexed)
+
+
+@pytest.mark.parametrize('index', [False, True])
+def test_nodes_of_another_list_are_refused(index):
+    first, second = LinkedList(index=index), LinkedList(index=index)
+    for value in (1, 2, 3):
+        first.append(value)
+    foreign = second.append(9)
+    with pytest.raises(ValueError):
+        first.remove_node(foreign)
+    with pytest.raises(ValueError):
+        first.insert_after(foreign, 4)
+    with pytest.raises(ValueError):
+        first.move_to_front(foreign)
+    with pytest.raises(ValueError):
+        first.prepend_node(foreign)
+    assert list(first) == [1, 2, 3] and len(first) == 3
+    assert list(second) == [9] and len(second) == 1
+    # Once it is taken out of its list, a node may move into another one
+    second.remove_node(foreign)
+    first.prepend_node(foreign)
+    assert list(first) == [9, 1, 2, 3] and len(second) == 0
@@ -0,0 +1,90 @@
+# Old versions of a persistent tree must never see the writes made after them
+import random
+
+import pytest
+
+from BinarySearchTree_Persistent import PersistentTree
+from test_avl_tree import assert_logarithmic, check_invariants
+
+COUNT = 2_000
+
+
+def test_snapshots_keep_their_version():
+    rng = random.Random(7)
+    tree = PersistentTree()
+    model = set()
+    versions = []
+    for _ in range(COUNT):
+        value = rng.randrange(COUNT)
+        # Mostly inserts, with enough deletes to hit the one-child, two-children and rebalancing cases
+        if rng.random() < 0.3:
+            assert tree.delete(value) == (value in model)
+            model.discard(value)
+        else:
+            assert tree.insert(value) == (value not in model)
+            model.add(value)
+        if rng.random() < 0.05:
+            versions.append((tree.snapshot(), sorted(model), tree.version))
+    for snapshot, values, version in versions:
+        assert snapshot.inorder() == values
+        assert len(snapshot) == len(values) and snapshot.version == version
+        assert check_invariants(snapshot) == len(values)
+    assert tree.inorder() == sorted(model)
+    assert check_invariants(tree) == len(model)
+
+
+def test_writes_that_change_nothing_keep_the_version():
+    tree = PersistentTree.from_sorted([1, 2, 3])
+    root = tree.root
+    assert not tree.insert(2) and not tree.delete(4)
+    assert tree.root is root and tree.version == 0
+
+
+def test_snapshot_is_read_only():
+    tree = PersistentTree.from_sorted(range(10))
+    snapshot = tree.snapshot()
+    with pytest.raises(TypeError):
+        snapshot.insert(10)
+    with pytest.raises(TypeError):
+        snapshot.delete(3)
+    assert snapshot.inorder() == list(range(10))
+    # The live tree stays writable, and the snapshot does not follow it
+    tree.delete(3)
+    assert 3 in snapshot.inorder() and 3 not in tree.inorder()
+
+
+def test_from_sorted_builds_a_balanced_persistent_tree():
+    values = list(range(0, 3 * COUNT, 3))
+    tree = PersistentTree.from_sorted(values)
+    assert isinstance(tree, PersistentTree) and not tree.read_only
+    assert tree.inorder() == values
+    assert check_invariants(tree) == len(values)
+    assert_logarithmic(tree, len(values))
+    # The built nodes belong to version 0: writing to the tree copies them instead of changing them
+    before = tree.snapshot()
+    for value in values[::2]:
+        tree.delete(value)
+    assert before.inorder() == values
+    assert tree.inorder() == values[1::2]
+    assert check_invariants(tree) == len(values[1::2])
+
+
+def test_merge_is_the_sorted_union_and_leaves_its_inputs_alone():
+    rng = random.Random(11)
+    left_values = sorted(rng.sample(range(3 * COUNT), COUNT))
+    right_values = sorted(rng.sample(range(3 * COUNT), COUNT))
+    left = PersistentTree.from_sorted(left_values)
+    right = PersistentTree.from_sorted(right_values)
+    merged = left.merge(right)
+    union = sorted(set(left_values) | set(right_values))
+    assert isinstance(merged, PersistentTree)
+    assert merged.inorder() == union
+    assert check_invariants(merged) == len(union)
+    assert_logarithmic(merged, len(union))
+    # Writes to the merged tree do not reach either input, nor the other way round
+    for value in union[::3]:
+        merged.delete(value)
+    left.insert(-1)
+    assert left.inorder() == [-1] + left_values
+    assert right.inorder() == right_values
+    assert merged.inorder() == [value for i, value in enumerate(union) if i % 3]
@@ -0,0 +1,26 @@
+# Removing by handle: a slot that is already free must never be put on the free list a second time
+import pytest
+
+from LinkedList_ArrayPool import PooledLinkedList
+
+
+def test_remove_same_slot_twice():
+    pooled = PooledLinkedList()
+    first = pooled.append(1)
+    pooled.append(2)
+    assert pooled.remove_node(first) == 1
+    with pytest.raises(ValueError):
+        pooled.remove_node(first)
+    # The next two appends get different slots and the list stays finite
+    assert pooled.append(3) != pooled.append(4)
+    assert list(pooled) == [2, 3, 4]
+    assert len(pooled) == 3
+
+
+@pytest.mark.parametrize('slot', [-1, 5])
+def test_remove_slot_out_of_range(slot):
+    pooled = PooledLinkedList()
+    pooled.append(1)
+    with pytest.raises(ValueError):
+        pooled.remove_node(slot)
+    assert list(pooled) == [1]
@@ -0,0 +1,48 @@
+# The sharded map talks to worker processes, a failing worker must never leave us waiting on its pipe
+import multiprocessing
+import os
+
+import pytest
+
+from HashMap_Sharded import ShardedHashMap
+
+fork = pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='needs forked workers')
+
+
+class Poison:
+    # Pickles fine in the process that made it, and fails to pickle in any other process,
+    # so a worker holding it fails while it streams its items back to us
+    def __init__(self, pid=None):
+        self.pid = os.getpid() if pid is None else pid
+
+    def __reduce__(self):
+        if os.getpid() != self.pid:
+            raise RuntimeError('poisoned value')
+        return Poison, (self.pid,)
+
+
+@pytest.mark.parametrize('shards', [0, -1])
+def test_shards_must_be_positive(shards):
+    with pytest.raises(ValueError):
+        ShardedHashMap(shards=shards)
+
+
+@fork
+def test_failure_while_streaming_items():
+    with ShardedHashMap(shards=1, context='fork') as sharded:
+        sharded.insert_many([(1, 'one'), (2, Poison())])
+        with pytest.raises(RuntimeError):
+            list(sharded.items())
+        # The pipe is empty again, the next request gets its own answer
+        assert len(sharded) == 2
+        assert sharded.get(1) == 'one'
+
+
+@fork
+def test_stopping_early_drains_the_stream():
+    with ShardedHashMap(shards=2, context='fork') as sharded:
+        sharded.insert_many((key, key) for key in range(1_000))
+        iterator = sharded.items()
+        next(iterator)
+        iterator.close()
+        assert len(sharded) == 1_000
@@ -0,0 +1,101 @@
+# A hash map snapshot has to answer every lookup the way the map it was taken from does
+import pytest
+
+from BinarySearchTree import BinarySearchTree
+from HashMap_LinkedList import HashMap, fnv1a_hash
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    hash_map = HashMap()
+    hash_map.insert_many([(1, 'one'), (0, 'zero'), ('a', 'A'), (b'b', 'B'), (2.0, 'two')])
+    path = tmp_path / 'map.snap'
+    hash_map.dump(path)
+    mapped = HashMap.load(path)
+    yield hash_map, mapped
+    mapped.close()
+
+
+def test_equal_keys_of_other_types(snapshot):
+    hash_map, mapped = snapshot
+    for key in (1, 1.0, True, 0, 0.0, False, 2, 2.0, 'a', b'b'):
+        assert mapped.get(key) == hash_map.get(key), key
+        assert (key in mapped) == (key in hash_map), key
+    assert mapped[1.0] == 'one' and mapped[False] == 'zero' and mapped[2] == 'two'
+
+
+@pytest.mark.parametrize('key', [1.5, float('nan'), None, (1, 2)])
+def test_unsupported_keys_raise(snapshot, key):
+    _, mapped = snapshot
+    with pytest.raises(TypeError):
+        mapped.get(key)
+
+
+def test_tree_values_keep_their_type(tmp_path):
+    tree = BinarySearchTree.from_iterable([2.0, 1.5, 3, 0.5])
+    path = tmp_path / 'tree.snap'
+    tree.dump(path)
+    mapped = BinarySearchTree.load(path)
+    assert [(value, type(value)) for value in mapped.iter_inorder()] == \
+        [(value, type(value)) for value in tree.iter_inorder()]
+
+
+def test_keys_come_back_with_their_type(snapshot):
+    hash_map, mapped = snapshot
+    assert sorted(mapped.items(), key=repr) == sorted(hash_map.items(), key=repr)
+    assert any(type(key) is float for key in mapped)
+
+
+def test_writes_through_the_mapping_protocol(snapshot):
+    hash_map, mapped = snapshot
+    mapped['new'] = 'value'
+    del mapped['a']
+    with pytest.raises(KeyError):
+        del mapped['a']
+    assert mapped['new'] == 'value' and 'a' not in mapped and len(mapped) == len(hash_map)
+
+
+def test_copy_on_write_keeps_the_map_options(tmp_path):
+    hash_map = HashMap(size=64, max_load_factor=2.0, rehash_step=4, hash_function=fnv1a_hash, cache_hashes=False)
+    hash_map.insert_many((f'key-{number}', number) for number in range(100))
+    path = tmp_path / 'options.snap'
+    hash_map.dump(path)
+    mapped = HashMap.load(path)
+    mapped.insert('one more', 100)
+    assert mapped._map.options() == hash_map.options()
+    assert mapped['key-7'] == 7 and mapped['one more'] == 100
+
+
+def test_a_hash_function_pickle_cannot_store_has_to_be_given(tmp_path):
+    hash_map = HashMap(hash_function=lambda key: len(key))
+    hash_map.insert('abc', 1)
+    path = tmp_path / 'lambda.snap'
+    hash_map.dump(path)
+    mapped = HashMap.load(path)
+    # Lookups in the file do not need it, writes do
+    assert mapped['abc'] == 1
+    with pytest.raises(ValueError):
+        mapped['def'] = 2
+    given = HashMap.load(path, hash_function=len)
+    given['def'] = 2
+    assert given._map.hash_function is len and given['abc'] == 1
+    mapped.close()
+
+
+@pytest.mark.parametrize('count', [0, 1, 2, 7, 8, 100])
+def test_tree_snapshot_stands_in_for_the_tree(tmp_path, count):
+    values = list(range(0, 3 * count, 3))
+    tree = BinarySearchTree.from_sorted(values)
+    path = tmp_path / 'tree.snap'
+    tree.dump(path)
+    mapped = BinarySearchTree.load(path)
+    # The snapshot describes the balanced tree it is rebuilt into, which from_sorted gives us too
+    for name in ('inorder', 'preorder', 'postorder', 'height'):
+        assert getattr(mapped, name)() == getattr(tree, name)(), name
+    if count:
+        pytest.importorskip('numpy')
+        queries = [0, 1, 3, 299]
+        assert mapped.find_many(queries).tolist() == tree.find_many(queries).tolist()
+        assert mapped.rank_many(queries).tolist() == tree.rank_many(queries).tolist()
+        assert mapped.range_count(2, 10) == tree.range_count(2, 10)
+    mapped.close()